@@ -0,0 +1,46 @@
+"""
+Exact against fast trigonometry (see fast_trig) for sin/cos and the batch conversions and rotations that use them.
+
+    python benchmarks/bench_fast_trig.py [n_values]
+"""
+import os
+import sys
+import timeit
+
+import numpy as np
+
+this_dir = os.path.abspath(os.path.dirname(__file__))
+module_dir = os.path.join(os.path.dirname(this_dir), "geometric_tools")
+if module_dir not in sys.path:
+    sys.path.append(module_dir)
+
+from fast_trig import EXACT, FAST, sin_cos
+from locations import ecef_to_sph_coords, geo_to_ecef, sph_coords_to_ecef
+from quaternion import quaternion_rotations, rotation_matrices
+
+
+def _best(func, repeat: int) -> float:
+    return min(timeit.repeat(func, number=1, repeat=repeat))
+
+
+def bench(n_values: int, repeat: int = 5):
+    rng = np.random.default_rng(0)
+    angles = rng.uniform(-np.pi, np.pi, n_values)
+    lat_lon_alt = np.column_stack((rng.uniform(-90, 90, n_values), rng.uniform(-180, 180, n_values),
+                                   rng.uniform(0, 1000, n_values)))
+    r_theta_phi = ecef_to_sph_coords(geo_to_ecef(lat_lon_alt))
+    axes, vecs = rng.normal(size=(n_values, 3)), rng.normal(size=(n_values, 3))
+    cases = [("sin_cos", lambda precision: sin_cos(angles, precision)),
+             ("sph_coords_to_ecef", lambda precision: sph_coords_to_ecef(r_theta_phi, precision)),
+             ("geo_to_ecef", lambda precision: geo_to_ecef(lat_lon_alt, precision)),
+             ("quaternion_rotations", lambda precision: quaternion_rotations(angles, axes, vecs, precision)),
+             ("rotation_matrices", lambda precision: rotation_matrices(angles, axes, precision))]
+    print("{:<24s} {:>12s} {:>12s} {:>9s}".format("n = {}".format(n_values), "exact ms", "fast ms", "speedup"))
+    for name, func in cases:
+        exact_s = _best(lambda: func(EXACT), repeat)
+        fast_s = _best(lambda: func(FAST), repeat)
+        print("{:<24s} {:>12.3f} {:>12.3f} {:>8.2f}x".format(name, 1e3 * exact_s, 1e3 * fast_s, exact_s / fast_s))
+
+
+if __name__ == "__main__":
+    bench(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
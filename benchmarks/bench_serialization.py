@@ -0,0 +1,50 @@
+"""
+Throughput of serialization.dumps/loads against pickling lists of objects.
+
+    python benchmarks/bench_serialization.py [n_values]
+"""
+import os
+import pickle
+import sys
+import timeit
+
+import numpy as np
+
+this_dir = os.path.abspath(os.path.dirname(__file__))
+module_dir = os.path.join(os.path.dirname(this_dir), "geometric_tools")
+if module_dir not in sys.path:
+    sys.path.append(module_dir)
+
+from locations import Geo
+from quaternion import Quaternion
+from serialization import dumps, dumps_array, loads, loads_array
+from vector_3d import Vector3D
+
+
+def _report(name: str, n_values: int, n_bytes: int, seconds: float):
+    print("{:<40s} {:>10.3f} ms {:>12.0f} values/s {:>12d} bytes".format(
+        name, 1e3 * seconds, n_values / seconds, n_bytes))
+
+
+def bench(n_values: int, repeat: int = 3):
+    rng = np.random.default_rng(0)
+    samples = {"Vector3D": [Vector3D(*row) for row in rng.normal(size=(n_values, 3))],
+               "Quaternion": [Quaternion(*row) for row in rng.normal(size=(n_values, 4))],
+               "Geo": [Geo(*row) for row in rng.uniform(-80, 80, size=(n_values, 3))]}
+    for name, values in samples.items():
+        pickled = pickle.dumps(values, protocol=pickle.HIGHEST_PROTOCOL)
+        packed = dumps(values)
+        cls, array = loads_array(packed)
+        timings = [("pickle.dumps", pickled, lambda: pickle.dumps(values, protocol=pickle.HIGHEST_PROTOCOL)),
+                   ("pickle.loads", pickled, lambda: pickle.loads(pickled)),
+                   ("dumps (objects)", packed, lambda: dumps(values)),
+                   ("dumps_array", packed, lambda: dumps_array(cls, array)),
+                   ("loads (objects)", packed, lambda: loads(packed)),
+                   ("loads_array (zero-copy)", packed, lambda: loads_array(packed))]
+        for label, payload, func in timings:
+            seconds = min(timeit.repeat(func, number=1, repeat=repeat))
+            _report(name + " " + label, n_values, len(payload), seconds)
+
+
+if __name__ == "__main__":
+    bench(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
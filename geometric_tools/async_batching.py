@@ -0,0 +1,261 @@
+"""
+Asyncio front end that coalesces individual conversion and rotation requests into vectorized batch calls.
+"""
+from __future__ import annotations
+import asyncio
+import time
+from typing import Callable
+
+import numpy as np
+
+from locations import (Location, ECEF, SphCoords, Geo, geo_to_ecef, sph_coords_to_ecef, ecef_to_geo,
+                       sph_coords_to_geo)
+from quaternion import quaternion_rotations
+from vector_3d import Vector3D
+from vector_alg import evaluate
+
+
+class BatchMetrics(object):
+    """
+    Running counts of requests and batches with request latency (submit to result) in seconds.
+    """
+
+    def __init__(self):
+        self.requests = 0
+        self.batches = 0
+        self.largest_batch = 0
+        self.total_latency_s = 0.
+        self.max_latency_s = 0.
+        self.first_submit = None
+        self.last_result = None
+
+    def record(self, submit_times: np.ndarray, done_time: float):
+        latencies = done_time - submit_times
+        self.requests += len(submit_times)
+        self.batches += 1
+        self.largest_batch = max(self.largest_batch, len(submit_times))
+        self.total_latency_s += float(latencies.sum())
+        self.max_latency_s = max(self.max_latency_s, float(latencies.max()))
+        if self.first_submit is None:
+            self.first_submit = float(submit_times.min())
+        self.last_result = done_time
+
+    def mean_batch_size(self) -> float:
+        return self.requests / self.batches if self.batches else 0.
+
+    def mean_latency_s(self) -> float:
+        return self.total_latency_s / self.requests if self.requests else 0.
+
+    def throughput(self) -> float:
+        """
+        Requests per second between the first submit and the latest result.
+        """
+        if not self.requests or self.last_result <= self.first_submit:
+            return 0.
+        return self.requests / (self.last_result - self.first_submit)
+
+
+class BatchCoalescer(object):
+    """
+    Queues single-row requests and evaluates them with one call of batch_func per micro-batch.
+
+    batch_func takes an (N, k) array of stacked request rows and returns N results.  Every row must hold row_width
+    numbers; when row_width is None the first row submitted sets it, and a row of another width only fails its own
+    caller.  A batch is sent once it holds max_batch_size rows or max_latency_s after its first row arrived,
+    whichever comes first.  At most max_pending requests wait in the queue; further submits wait for room, which
+    applies backpressure to callers.
+    """
+
+    def __init__(self, batch_func: Callable[[np.ndarray], np.ndarray], max_batch_size: int = 1024,
+                 max_latency_s: float = 0.001, max_pending: int = 65536, row_width: int = None):
+        if max_batch_size < 1 or max_pending < 1:
+            raise ValueError("max_batch_size and max_pending must be positive.")
+        if row_width is not None and row_width < 1:
+            raise ValueError("row_width must be positive.")
+        if max_latency_s < 0:
+            raise ValueError("max_latency_s cannot be negative.")
+        self.batch_func = batch_func
+        self.max_batch_size = max_batch_size
+        self.max_latency_s = max_latency_s
+        self.row_width = row_width
+        self.metrics = BatchMetrics()
+        self._queue = asyncio.Queue(maxsize=max_pending)
+        self._batch_ready = asyncio.Event()
+        self._collected = 0
+        self._worker = None
+        self._closed = False
+
+    async def __aenter__(self) -> BatchCoalescer:
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    async def submit(self, row):
+        """
+        Queues one request row and waits for its result.
+        """
+        if self._closed:
+            raise RuntimeError("Cannot submit to a closed BatchCoalescer.")
+        row = np.asarray(row, dtype=float)
+        if row.ndim != 1:
+            raise ValueError("A request row must be 1D.  Got shape {}.".format(row.shape))
+        if self.row_width is None:
+            self.row_width = len(row)
+        if len(row) != self.row_width:
+            raise ValueError("Request rows must hold {} numbers.  Got {}.".format(self.row_width, len(row)))
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.get_running_loop().create_task(self._run())
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((row, future, time.perf_counter()))
+        if self._closed:
+            # close ran while this caller waited for room, so the request is refused like any later submit.
+            future.set_exception(RuntimeError("The BatchCoalescer closed before the request was queued."))
+            if self._worker is None or self._worker.done():
+                self._fail_leftovers([])
+        elif self._queue.qsize() + self._collected >= self.max_batch_size:
+            self._batch_ready.set()
+        return await future
+
+    async def close(self):
+        """
+        Stops accepting requests, finishes the queued ones and stops the worker.  Callers still waiting for room in
+        the queue get a RuntimeError.
+        """
+        self._closed = True
+        if self._worker is None:
+            return
+        await self._queue.join()
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+        self._worker = None
+        # Draining wakes any blocked submitters, which then see the coalescer closed and fail their own requests.
+        self._fail_leftovers([])
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        batch = []
+        try:
+            while True:
+                batch = [await self._queue.get()]
+                deadline = loop.time() + self.max_latency_s
+                while True:
+                    while len(batch) < self.max_batch_size and not self._queue.empty():
+                        batch.append(self._queue.get_nowait())
+                    remaining = deadline - loop.time()
+                    if len(batch) >= self.max_batch_size or remaining <= 0:
+                        break
+                    self._collected = len(batch)
+                    self._batch_ready.clear()
+                    try:
+                        await asyncio.wait_for(self._batch_ready.wait(), remaining)
+                    except asyncio.TimeoutError:
+                        pass
+                self._collected = 0
+                processing, batch = batch, []
+                self._process(processing)
+        finally:
+            self._collected = 0
+            self._fail_leftovers(batch)
+
+    def _process(self, batch: list):
+        futures = [future for _, future, _ in batch]
+        try:
+            results = self.batch_func(np.array([row for row, _, _ in batch], dtype=float))
+            if len(results) != len(batch):
+                raise ValueError("batch_func returned {} results for {} rows.".format(len(results), len(batch)))
+            for future, result in zip(futures, results):
+                if not future.done():
+                    future.set_result(result)
+        except Exception as e:
+            for future in futures:
+                if not future.done():
+                    future.set_exception(e)
+        finally:
+            self.metrics.record(np.array([submit_time for _, _, submit_time in batch]), time.perf_counter())
+            for _ in batch:
+                self._queue.task_done()
+
+    def _fail_leftovers(self, batch: list):
+        """
+        Fails the requests the worker took but did not process, and any still queued, so no caller waits forever.
+        """
+        while not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+        for _, future, _ in batch:
+            if not future.done():
+                future.set_exception(RuntimeError("The BatchCoalescer worker stopped before processing the request."))
+            self._queue.task_done()
+
+
+def _rotate_rows(rows: np.ndarray) -> np.ndarray:
+    return quaternion_rotations(rows[:, 0], rows[:, 1:4], rows[:, 4:7])
+
+
+class AsyncLocationService(object):
+    """
+    Coalesces Location.ecef/Location.geo calls and quaternion_rotation calls from many coroutines.
+    Keyword arguments are passed to each underlying BatchCoalescer.
+    """
+
+    def __init__(self, **kwargs):
+        self.coalescers = {"geo_to_ecef": BatchCoalescer(geo_to_ecef, **kwargs),
+                           "sph_coords_to_ecef": BatchCoalescer(sph_coords_to_ecef, **kwargs),
+                           "ecef_to_geo": BatchCoalescer(ecef_to_geo, **kwargs),
+                           "sph_coords_to_geo": BatchCoalescer(sph_coords_to_geo, **kwargs),
+                           "rotation": BatchCoalescer(_rotate_rows, **kwargs)}
+
+    async def __aenter__(self) -> AsyncLocationService:
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def close(self):
+        await asyncio.gather(*[coalescer.close() for coalescer in self.coalescers.values()])
+
+    async def ecef(self, location: Location) -> ECEF:
+        """
+        Coalesced version of location.ecef().
+        """
+        if isinstance(location, ECEF):
+            return location
+        if isinstance(location, Geo):
+            row = await self.coalescers["geo_to_ecef"].submit((location.lat, location.lon, location.alt))
+        elif isinstance(location, SphCoords):
+            row = await self.coalescers["sph_coords_to_ecef"].submit((location.r, location.theta, location.phi))
+        else:
+            raise TypeError("Cannot convert objects of type {}.".format(location.__class__.__name__))
+        return ECEF(*row)
+
+    async def geo(self, location: Location) -> Geo:
+        """
+        Coalesced version of location.geo().
+        """
+        if isinstance(location, Geo):
+            return location
+        if isinstance(location, ECEF):
+            row = await self.coalescers["ecef_to_geo"].submit((location.x, location.y, location.z))
+        elif isinstance(location, SphCoords):
+            row = await self.coalescers["sph_coords_to_geo"].submit((location.r, location.theta, location.phi))
+        else:
+            raise TypeError("Cannot convert objects of type {}.".format(location.__class__.__name__))
+        return Geo(*row)
+
+    async def rotate(self, rot_angle, rot_axis: Vector3D, vec: Vector3D) -> Vector3D:
+        """
+        Coalesced version of quaternion_rotation.
+        """
+        rot_axis, vec = evaluate(rot_axis), evaluate(vec)
+        if not isinstance(rot_axis, Vector3D) or not isinstance(vec, Vector3D):
+            raise TypeError("The axis and vector arguments must be Vector3D objects.")
+        if rot_axis.mag() == 0:
+            raise ValueError("The 0 vector does not have a unit.")
+        row = await self.coalescers["rotation"].submit((rot_angle, *rot_axis.array, *vec.array))
+        return Vector3D(row)
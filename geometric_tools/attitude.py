@@ -0,0 +1,60 @@
+"""
+Attitude propagation: integrates body angular-rate histories into quaternion histories.
+
+An attitude q rotates body-frame vectors into the reference frame with q.rotate.  A body rate w held for dt turns
+the attitude by the increment dq = Quaternion.from_rotation_about_axis(|w| dt, w), giving dq * q as the next
+attitude (with the Quaternion.__mul__ convention of this package).
+"""
+from __future__ import annotations
+
+import numpy as np
+
+from quaternion import Quaternion, quaternion_products
+
+DEFAULT_BLOCK_SIZE = 4096  # steps composed per block; the running attitude is renormalized between blocks.
+
+
+def rate_increments(rates_rad_s, dt_s) -> np.ndarray:
+    """
+    (N, 4) exact exponential-map increments for (N, 3) body rates held constant over scalar or (N,) steps dt_s.
+    """
+    rates_rad_s = np.asarray(rates_rad_s, dtype=float).reshape(-1, 3)
+    dt_s = np.broadcast_to(np.asarray(dt_s, dtype=float), rates_rad_s.shape[:1])
+    rate_mags = np.linalg.norm(rates_rad_s, axis=1)
+    half_angles = 0.5 * rate_mags * dt_s
+    scale = np.divide(np.sin(half_angles), rate_mags, out=0.5 * dt_s.copy(), where=rate_mags > 0)
+    return np.column_stack((np.cos(half_angles), scale[:, None] * rates_rad_s))
+
+
+def cumulative_products(increments) -> np.ndarray:
+    """
+    Prefix products P_k = dq_k * ... * dq_1 * dq_0 of (N, 4) increments, with the newest factor on the left.
+    Uses the doubling (Hillis-Steele) scan: log2(N) vectorized passes instead of N scalar products.
+    """
+    products = np.array(increments, dtype=float).reshape(-1, 4)
+    shift = 1
+    while shift < len(products):
+        products[shift:] = quaternion_products(products[shift:], products[:-shift])
+        shift *= 2
+    return products
+
+
+def propagate_attitude(q_start: Quaternion, rates_rad_s, dt_s, block_size: int = DEFAULT_BLOCK_SIZE) -> np.ndarray:
+    """
+    (N + 1, 4) attitude history starting at q_start for (N, 3) body rates (rad/s) and scalar or (N,) steps (s).
+    Each block of steps is composed with a parallel prefix product and applied to the running attitude, which is
+    renormalized at every block boundary to control drift.
+    """
+    if not isinstance(q_start, Quaternion):
+        raise TypeError("The starting attitude must be a Quaternion.")
+    if block_size < 1:
+        raise ValueError("block_size must be positive.")
+    increments = rate_increments(rates_rad_s, dt_s)
+    history = np.empty((len(increments) + 1, 4))
+    carry = q_start.array / np.linalg.norm(q_start.array)
+    history[0] = carry
+    for start in range(0, len(increments), block_size):
+        block = quaternion_products(cumulative_products(increments[start:start + block_size]), carry)
+        history[start + 1:start + 1 + len(block)] = block
+        carry = block[-1] / np.linalg.norm(block[-1])
+    return history
@@ -0,0 +1,50 @@
+"""
+Input handling and chunking shared by the batch functions: casting batch input to rows of 3 components and splitting
+many-to-many computations into chunks of bounded size.
+"""
+from __future__ import annotations
+from typing import Iterator
+
+import numpy as np
+
+from vector_alg import Vector, evaluate
+
+DEFAULT_MAX_PAIRS = 1 << 20  # pairs evaluated per chunk by the many-to-many batch functions.
+
+
+def as_triples(values) -> np.ndarray:
+    """
+    Casts batch input to a float array whose last axis holds the 3 components of each point.
+    """
+    array = np.asarray(values, dtype=float)
+    if array.ndim == 0 or array.shape[-1] != 3:
+        raise ValueError("Batch input must have shape (..., 3).  Got {}.".format(array.shape))
+    return array
+
+
+def vector_rows(vectors) -> np.ndarray:
+    """
+    (N, 3) array of the components of a Vector, a sequence of Vectors or batch input as for as_triples.
+    """
+    vectors = evaluate(vectors)
+    if isinstance(vectors, Vector):
+        vectors = [vectors]
+    if isinstance(vectors, (list, tuple)) and vectors and isinstance(evaluate(vectors[0]), Vector):
+        vectors = [evaluate(vector) for vector in vectors]
+        for vector in vectors:
+            if not isinstance(vector, Vector) or vector.size() != 3:
+                raise ValueError("Vectors must have 3 components.  Got {}.".format(vector))
+        return np.array([vector.array for vector in vectors], dtype=float).reshape(-1, 3)
+    return as_triples(vectors).reshape(-1, 3)
+
+
+def pair_chunks(n_rows: int, n_columns: int, max_pairs: int) -> Iterator[slice]:
+    """
+    Slices of the rows of an n_rows by n_columns all-pairs computation, each covering at most max_pairs pairs
+    (or a single row when a row alone holds more).
+    """
+    if max_pairs < 1:
+        raise ValueError("max_pairs must be positive.  Got {}.".format(max_pairs))
+    step = max(1, max_pairs // max(1, n_columns))
+    for start in range(0, n_rows, step):
+        yield slice(start, min(start + step, n_rows))
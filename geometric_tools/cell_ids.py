@@ -0,0 +1,227 @@
+"""
+Hierarchical 64-bit cell IDs for points on the sphere.
+
+At level L the latitude range [-90, 90] and longitude range [-180, 180) are each split into 2**L equal intervals,
+giving a quadtree of cells.  An ID holds the 2L interleaved (Morton order) row/column bits followed by a single 1 bit,
+shifted so that every level shares the same 61 bit layout.  Consequently IDs sort in quadtree order, a cell's
+descendants at all finer levels form the contiguous ID range given by descendant_range, and parents are found by
+masking bits.
+"""
+from __future__ import annotations
+from typing import Tuple
+
+import numpy as np
+
+from batch_helpers import as_triples
+from geofence import SphericalCap
+from locations import SphCoords, sph_coords_to_geo
+
+MAX_LEVEL = 30
+
+_spread_masks = [(16, 0x0000FFFF0000FFFF), (8, 0x00FF00FF00FF00FF), (4, 0x0F0F0F0F0F0F0F0F), (2, 0x3333333333333333),
+                 (1, 0x5555555555555555)]
+_compact_masks = [(1, 0x3333333333333333), (2, 0x0F0F0F0F0F0F0F0F), (4, 0x00FF00FF00FF00FF), (8, 0x0000FFFF0000FFFF),
+                  (16, 0x00000000FFFFFFFF)]
+
+
+def _spread_bits(values: np.ndarray) -> np.ndarray:
+    """
+    Moves bit k of each 32 bit value to bit 2k.
+    """
+    values = values.astype(np.uint64) & np.uint64(0xFFFFFFFF)
+    for shift, mask in _spread_masks:
+        values = (values | (values << np.uint64(shift))) & np.uint64(mask)
+    return values
+
+
+def _compact_bits(values: np.ndarray) -> np.ndarray:
+    """
+    Inverse of _spread_bits: moves bit 2k to bit k.
+    """
+    values = values.astype(np.uint64) & np.uint64(0x5555555555555555)
+    for shift, mask in _compact_masks:
+        values = (values | (values >> np.uint64(shift))) & np.uint64(mask)
+    return values
+
+
+def _check_level(level: int):
+    if not 0 <= level <= MAX_LEVEL:
+        raise ValueError("Levels run from 0 to {}.  Got {}.".format(MAX_LEVEL, level))
+
+
+def _from_ij(i: np.ndarray, j: np.ndarray, levels) -> np.ndarray:
+    """
+    IDs of the cells in latitude row i and longitude column j at the given levels.
+    """
+    shift = (2 * (MAX_LEVEL - np.asarray(levels, dtype=np.int64))).astype(np.uint64)
+    position = (_spread_bits(j) << np.uint64(1)) | _spread_bits(i)
+    return (((position << np.uint64(1)) | np.uint64(1)) << shift).astype(np.int64)
+
+
+def _lsb(ids: np.ndarray) -> np.ndarray:
+    ids = np.asarray(ids, dtype=np.int64)
+    return ids & -ids
+
+
+def cell_levels(ids) -> np.ndarray:
+    """
+    The level of each cell ID.
+    """
+    return MAX_LEVEL - np.log2(_lsb(ids)).astype(np.int64) // 2
+
+
+def _to_ij(ids) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    ids = np.asarray(ids, dtype=np.int64)
+    levels = cell_levels(ids)
+    position = ids.astype(np.uint64) >> (2 * (MAX_LEVEL - levels) + 1).astype(np.uint64)
+    return _compact_bits(position).astype(np.int64), _compact_bits(position >> np.uint64(1)).astype(np.int64), levels
+
+
+def _lat_lon_rows(points) -> np.ndarray:
+    if isinstance(points, np.ndarray):
+        return as_triples(points).reshape(-1, 3)
+    return np.array([[point.lat, point.lon, point.alt] for point in points], dtype=float).reshape(-1, 3)
+
+
+def geo_cell_ids(points, level: int) -> np.ndarray:
+    """
+    Cell IDs at level of Geo points given as a sequence of Geo or an (N, 3) latitude, longitude, altitude array.
+    """
+    _check_level(level)
+    lat_lon_alt = _lat_lon_rows(points)
+    n_cells = 1 << level
+    i = np.clip(np.floor((lat_lon_alt[:, 0] + 90.) / 180. * n_cells), 0, n_cells - 1).astype(np.int64)
+    j = np.clip(np.floor(((lat_lon_alt[:, 1] + 180.) % 360.) / 360. * n_cells), 0, n_cells - 1).astype(np.int64)
+    return _from_ij(i, j, level)
+
+
+def sph_coords_cell_ids(points, level: int) -> np.ndarray:
+    """
+    Cell IDs at level of spherical coordinates given as a sequence of SphCoords or an (N, 3) r, theta, phi array.
+    """
+    if not isinstance(points, np.ndarray):
+        if not all(isinstance(point, SphCoords) for point in points):
+            raise TypeError("Points must be SphCoords or an (N, 3) array.")
+        points = np.array([[point.r, point.theta, point.phi] for point in points], dtype=float).reshape(-1, 3)
+    return geo_cell_ids(sph_coords_to_geo(points), level)
+
+
+def cell_bounds(ids) -> np.ndarray:
+    """
+    (N, 4) latitude minimum, latitude maximum, longitude minimum, longitude maximum (deg) of each cell.
+    """
+    i, j, levels = _to_ij(ids)
+    lat_size = 180. / np.exp2(levels)
+    lon_size = 360. / np.exp2(levels)
+    lat_min = -90. + i * lat_size
+    lon_min = -180. + j * lon_size
+    return np.column_stack((lat_min, lat_min + lat_size, lon_min, lon_min + lon_size))
+
+
+def cell_centers(ids) -> np.ndarray:
+    """
+    (N, 3) latitude, longitude, altitude (0) of the center of each cell.
+    """
+    bounds = cell_bounds(ids)
+    return np.column_stack((bounds[:, :2].mean(axis=1), bounds[:, 2:].mean(axis=1), np.zeros(len(bounds))))
+
+
+def parents(ids, level: int = None) -> np.ndarray:
+    """
+    The ancestor of each cell at level (by default one level up).
+    """
+    ids = np.asarray(ids, dtype=np.int64)
+    levels = cell_levels(ids)
+    target = levels - 1 if level is None else np.full(levels.shape, level)
+    if np.any(target < 0) or np.any(target > levels):
+        raise ValueError("Parent levels must be between 0 and the level of each cell.")
+    new_lsb = np.left_shift(np.int64(1), 2 * (MAX_LEVEL - target))
+    return (ids & ~(2 * new_lsb - 1)) | new_lsb
+
+
+def children(ids) -> np.ndarray:
+    """
+    (N, 4) children of each cell in ID order.
+    """
+    ids = np.asarray(ids, dtype=np.int64)
+    if np.any(cell_levels(ids) >= MAX_LEVEL):
+        raise ValueError("Cells at level {} have no children.".format(MAX_LEVEL))
+    child_lsb = _lsb(ids) >> 2
+    first = ids - _lsb(ids) + child_lsb
+    return first[:, None] + (2 * child_lsb)[:, None] * np.arange(4)
+
+
+def descendant_range(ids) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Inclusive (minimum, maximum) IDs of the cell and all its descendants.
+    """
+    ids = np.asarray(ids, dtype=np.int64)
+    lsb = _lsb(ids)
+    return ids - lsb + 1, ids + lsb - 1
+
+
+def neighbours(ids) -> np.ndarray:
+    """
+    (N, 8) same-level cells sharing an edge or corner, wrapping in longitude.  Slots past a pole hold -1.
+    """
+    i, j, levels = _to_ij(ids)
+    n_cells = np.left_shift(np.int64(1), levels)
+    result = np.full((len(i), 8), -1, dtype=np.int64)
+    offsets = [(di, dj) for di in (-1, 0, 1) for dj in (-1, 0, 1) if di or dj]
+    for k, (di, dj) in enumerate(offsets):
+        row = i + di
+        valid = (row >= 0) & (row < n_cells)
+        column = (j + dj) % n_cells
+        result[valid, k] = _from_ij(row[valid], column[valid], levels[valid])
+    return result
+
+
+def cover_box(lat_min: float, lat_max: float, lon_min: float, lon_max: float, level: int) -> np.ndarray:
+    """
+    Sorted IDs of all level cells overlapping the latitude/longitude box.  The box crosses the date line when
+    lon_min > lon_max and spans every longitude when lon_max - lon_min >= 360.
+    """
+    _check_level(level)
+    if lat_min > lat_max:
+        raise ValueError("lat_min must not exceed lat_max.")
+    n_cells = 1 << level
+    first_row, last_row = np.clip(np.floor((np.array([lat_min, lat_max]) + 90.) / 180. * n_cells), 0, n_cells - 1)
+    rows = np.arange(int(first_row), int(last_row) + 1)
+    full_circle = lon_max - lon_min >= 360.
+    lon_min, lon_max = (lon_min + 180.) % 360., (lon_max + 180.) % 360.
+    first, last = np.minimum(np.floor(np.array([lon_min, lon_max]) / 360. * n_cells), n_cells - 1).astype(np.int64)
+    if full_circle:
+        columns = np.arange(n_cells)
+    elif lon_min <= lon_max:
+        columns = np.arange(first, last + 1)
+    else:
+        columns = np.concatenate((np.arange(first, n_cells), np.arange(0, last + 1)))
+    i, j = np.meshgrid(rows, columns, indexing="ij")
+    return np.unique(_from_ij(i.ravel(), j.ravel(), level))
+
+
+def cover_cap(cap: SphericalCap, level: int) -> np.ndarray:
+    """
+    Sorted IDs of level cells that may overlap the cap.  The covering is conservative: it may include cells just
+    outside the cap but never misses one that overlaps it.
+    """
+    _check_level(level)
+    if not isinstance(cap, SphericalCap):
+        raise TypeError("The region to cover must be a SphericalCap.")
+    center_lat = np.degrees(np.asin(np.clip(cap.unit[2], -1., 1.)))
+    center_lon = np.degrees(np.atan2(cap.unit[1], cap.unit[0]))
+    angle_deg = np.degrees(cap.angle)
+    lat_min, lat_max = center_lat - angle_deg, center_lat + angle_deg
+    if lat_min <= -90. or lat_max >= 90.:
+        ids = cover_box(max(lat_min, -90.), min(lat_max, 90.), -180., 180., level)
+    else:
+        half_width = np.degrees(np.asin(np.sin(cap.angle) / np.cos(np.radians(center_lat))))
+        lon_min = (center_lon - half_width + 180.) % 360. - 180.
+        lon_max = (center_lon + half_width + 180.) % 360. - 180.
+        ids = cover_box(lat_min, lat_max, lon_min, lon_max, level)
+    centers = np.radians(cell_centers(ids)[:, :2])
+    units = np.column_stack((np.cos(centers[:, 0]) * np.cos(centers[:, 1]),
+                             np.cos(centers[:, 0]) * np.sin(centers[:, 1]), np.sin(centers[:, 0])))
+    half_diagonal = np.radians(270. / (1 << level))  # bounds the distance from a cell center to its corners.
+    keep = units @ cap.unit >= np.cos(min(np.pi, cap.angle + half_diagonal))
+    return ids[keep]
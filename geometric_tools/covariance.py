@@ -0,0 +1,123 @@
+"""
+Analytic Jacobians of the location conversions and rotations, and batch propagation of (N, 3, 3) covariance stacks
+through them to first order: C_out = J C_in J^T.
+"""
+from __future__ import annotations
+from typing import Tuple
+
+import numpy as np
+
+from batch_helpers import as_triples
+from locations import (ECEF, SphCoords, Geo, ecef_to_sph_coords, sph_coords_to_ecef, sph_coords_to_geo,
+                       geo_to_sph_coords, ecef_to_geo, geo_to_ecef)
+from quaternion import Quaternion, rotation_matrices
+
+_deg_per_rad = 180. / np.pi
+
+
+def jacobian_sph_coords_to_ecef(r_theta_phi) -> np.ndarray:
+    """
+    (..., 3, 3) derivatives of x, y, z with respect to r, theta, phi.
+    """
+    r_theta_phi = as_triples(r_theta_phi)
+    r = r_theta_phi[..., 0]
+    sin_theta, cos_theta = np.sin(r_theta_phi[..., 1]), np.cos(r_theta_phi[..., 1])
+    sin_phi, cos_phi = np.sin(r_theta_phi[..., 2]), np.cos(r_theta_phi[..., 2])
+    return np.stack((np.stack((sin_theta * cos_phi, r * cos_theta * cos_phi, -r * sin_theta * sin_phi), -1),
+                     np.stack((sin_theta * sin_phi, r * cos_theta * sin_phi, r * sin_theta * cos_phi), -1),
+                     np.stack((cos_theta, -r * sin_theta, np.zeros_like(r)), -1)), axis=-2)
+
+
+def jacobian_ecef_to_sph_coords(xyz_km) -> np.ndarray:
+    """
+    (..., 3, 3) derivatives of r, theta, phi with respect to x, y, z.
+    Undefined (nan) on the z axis, where theta and phi are singular.
+    """
+    xyz_km = as_triples(xyz_km)
+    x, y, z = xyz_km[..., 0], xyz_km[..., 1], xyz_km[..., 2]
+    r_xy_sq = x * x + y * y
+    r_sq = r_xy_sq + z * z
+    r, r_xy = np.sqrt(r_sq), np.sqrt(r_xy_sq)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.stack((np.stack((x / r, y / r, z / r), -1),
+                         np.stack((x * z / (r_sq * r_xy), y * z / (r_sq * r_xy), -r_xy / r_sq), -1),
+                         np.stack((-y / r_xy_sq, x / r_xy_sq, np.zeros_like(r)), -1)), axis=-2)
+
+
+def jacobian_sph_coords_to_geo(r_theta_phi) -> np.ndarray:
+    """
+    (..., 3, 3) derivatives of latitude, longitude (deg), altitude with respect to r, theta, phi.
+    """
+    shape = as_triples(r_theta_phi).shape[:-1]
+    jacobian = np.array([[0., -_deg_per_rad, 0.], [0., 0., _deg_per_rad], [1., 0., 0.]])
+    return np.broadcast_to(jacobian, shape + (3, 3))
+
+
+def jacobian_geo_to_sph_coords(lat_lon_alt) -> np.ndarray:
+    """
+    (..., 3, 3) derivatives of r, theta, phi with respect to latitude, longitude (deg), altitude.
+    """
+    shape = as_triples(lat_lon_alt).shape[:-1]
+    jacobian = np.array([[0., 0., 1.], [-1. / _deg_per_rad, 0., 0.], [0., 1. / _deg_per_rad, 0.]])
+    return np.broadcast_to(jacobian, shape + (3, 3))
+
+
+def jacobian_geo_to_ecef(lat_lon_alt) -> np.ndarray:
+    """
+    (..., 3, 3) derivatives of x, y, z with respect to latitude, longitude (deg), altitude.
+    """
+    return jacobian_sph_coords_to_ecef(geo_to_sph_coords(lat_lon_alt)) @ jacobian_geo_to_sph_coords(lat_lon_alt)
+
+
+def jacobian_ecef_to_geo(xyz_km) -> np.ndarray:
+    """
+    (..., 3, 3) derivatives of latitude, longitude (deg), altitude with respect to x, y, z.
+    """
+    return jacobian_sph_coords_to_geo(xyz_km) @ jacobian_ecef_to_sph_coords(xyz_km)
+
+
+def propagate_covariance(jacobians, covariances) -> np.ndarray:
+    """
+    J C J^T for stacks of (..., 3, 3) Jacobians and covariances; either may be a single (3, 3) matrix.
+    """
+    jacobians = np.asarray(jacobians, dtype=float)
+    return jacobians @ np.asarray(covariances, dtype=float) @ np.swapaxes(jacobians, -1, -2)
+
+
+_conversions = {(ECEF, SphCoords): (ecef_to_sph_coords, jacobian_ecef_to_sph_coords),
+                (SphCoords, ECEF): (sph_coords_to_ecef, jacobian_sph_coords_to_ecef),
+                (SphCoords, Geo): (sph_coords_to_geo, jacobian_sph_coords_to_geo),
+                (Geo, SphCoords): (geo_to_sph_coords, jacobian_geo_to_sph_coords),
+                (ECEF, Geo): (ecef_to_geo, jacobian_ecef_to_geo),
+                (Geo, ECEF): (geo_to_ecef, jacobian_geo_to_ecef)}
+
+
+def convert_covariance(means, covariances, from_frame: type, to_frame: type) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Converts (N, 3) means and their (N, 3, 3) covariances between the ECEF, SphCoords and Geo representations.
+    The frames are the location classes, e.g. convert_covariance(xyz, cov, ECEF, Geo).
+    """
+    means = as_triples(means)
+    if from_frame is to_frame:
+        return means, np.asarray(covariances, dtype=float)
+    try:
+        convert, jacobian = _conversions[(from_frame, to_frame)]
+    except KeyError:
+        err_msg = "No conversion from {} to {}."
+        raise TypeError(err_msg.format(getattr(from_frame, "__name__", from_frame),
+                                       getattr(to_frame, "__name__", to_frame)))
+    return convert(means), propagate_covariance(jacobian(means), covariances)
+
+
+def rotate_covariance(rotation, covariances, rot_axes=None) -> np.ndarray:
+    """
+    Rotates covariances of vectors.  rotation is either a Quaternion applied to every covariance or, with rot_axes,
+    an array of angles matching the rows of the (N, 3) rot_axes as in quaternion_rotations.
+    """
+    if isinstance(rotation, Quaternion):
+        if rot_axes is not None:
+            raise ValueError("Give either a Quaternion or rotation angles with axes.")
+        return propagate_covariance(rotation.as_matrix(), covariances)
+    if rot_axes is None:
+        raise ValueError("Rotation angles need matching rot_axes.")
+    return propagate_covariance(rotation_matrices(rotation, rot_axes), covariances)
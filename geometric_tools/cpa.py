@@ -0,0 +1,128 @@
+"""
+Vectorized closest point of approach (CPA) between objects moving in straight lines at constant velocity.
+
+Positions are sequences of Locations or (N, 3) ECEF arrays (km) and velocities are sequences of Vector3D or (N, 3)
+arrays (km/s).  The look-ahead window runs from 0 to horizon_s seconds.
+"""
+from __future__ import annotations
+from typing import Iterator, Tuple
+
+import numpy as np
+
+from batch_helpers import DEFAULT_MAX_PAIRS, pair_chunks, vector_rows
+from locations import ecef_array
+
+
+def _tracks(positions, velocities) -> Tuple[np.ndarray, np.ndarray]:
+    positions_km = ecef_array(positions).reshape(-1, 3)
+    velocities_km_s = vector_rows(velocities)
+    if positions_km.shape != velocities_km_s.shape:
+        raise ValueError("Need one velocity per position.  Got {} and {}.".format(len(positions_km),
+                                                                                    len(velocities_km_s)))
+    return positions_km, velocities_km_s
+
+
+def _check_horizon(horizon_s: float):
+    if horizon_s < 0:
+        raise ValueError("The look-ahead horizon must not be negative.  Got {}.".format(horizon_s))
+
+
+def relative_cpa(rel_positions_km, rel_velocities_km_s, horizon_s: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Time (s) and distance (km) of closest approach for (..., 3) relative positions and velocities.
+    The time is -p.v / |v|**2 clipped to the window, or 0 when the relative velocity is zero.
+    """
+    _check_horizon(horizon_s)
+    p = np.asarray(rel_positions_km, dtype=float)
+    v = np.asarray(rel_velocities_km_s, dtype=float)
+    speed_sq = np.einsum("...i,...i->...", v, v)
+    p_dot_v = np.einsum("...i,...i->...", p, v)
+    t = np.divide(-p_dot_v, speed_sq, out=np.zeros_like(speed_sq), where=speed_sq > 0)
+    t = np.clip(t, 0., horizon_s)
+    return t, np.linalg.norm(p + t[..., None] * v, axis=-1)
+
+
+def closest_approach(positions_1, velocities_1, positions_2, velocities_2, horizon_s: float,
+                     max_pairs: int = DEFAULT_MAX_PAIRS) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Time (s) and distance (km) of closest approach of each of N objects to each of M objects, each as an (N, M) array.
+    """
+    _check_horizon(horizon_s)
+    p_1, v_1 = _tracks(positions_1, velocities_1)
+    p_2, v_2 = _tracks(positions_2, velocities_2)
+    time_s, distance_km = np.empty((len(p_1), len(p_2))), np.empty((len(p_1), len(p_2)))
+    for chunk in pair_chunks(len(p_1), len(p_2), max_pairs):
+        time_s[chunk], distance_km[chunk] = relative_cpa(p_2[None, :, :] - p_1[chunk, None, :],
+                                                         v_2[None, :, :] - v_1[chunk, None, :], horizon_s)
+    return time_s, distance_km
+
+
+def _swept_boxes(positions_km: np.ndarray, velocities_km_s: np.ndarray,
+                 horizon_s: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Lower and upper corners of the axis aligned box holding each track over the window.
+    """
+    end_km = positions_km + horizon_s * velocities_km_s
+    return np.minimum(positions_km, end_km), np.maximum(positions_km, end_km)
+
+
+def _sweep_pairs(lower_1: np.ndarray, upper_1: np.ndarray, lower_2: np.ndarray, upper_2: np.ndarray,
+                 max_pairs: int) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Sort and sweep along one axis: yields chunks of at most about max_pairs (i, j) pairs whose intervals on that axis
+    overlap.  The second set is sorted by lower bound, so the candidates for each i form one contiguous run.
+    """
+    order = np.argsort(lower_2, kind="stable")
+    sorted_lower = lower_2[order]
+    max_width = np.max(upper_2 - lower_2, initial=0.)
+    start = np.searchsorted(sorted_lower, lower_1 - max_width, side="left")
+    counts = np.maximum(np.searchsorted(sorted_lower, upper_1, side="right") - start, 0)
+    total = np.cumsum(counts)
+    bounds = np.searchsorted(total, np.arange(max_pairs, total[-1] if len(total) else 0, max_pairs), side="left")
+    for first, last in zip(np.concatenate(([0], bounds + 1)), np.concatenate((bounds + 1, [len(counts)]))):
+        rows = np.arange(first, last)
+        i = np.repeat(rows, counts[rows])
+        runs = np.repeat(start[rows] - np.cumsum(counts[rows]) + counts[rows], counts[rows])
+        j = order[runs + np.arange(len(i))]
+        yield i, j
+
+
+def conflicts(positions_1, velocities_1, positions_2, velocities_2, horizon_s: float, threshold_km: float,
+              max_pairs: int = DEFAULT_MAX_PAIRS, prefilter: bool = True) -> Tuple[np.ndarray, ...]:
+    """
+    Pairs that come within threshold_km of each other inside the window.  Returns the index into the first set, the
+    index into the second set, the time (s) and the distance (km) of closest approach of each such pair, sorted by
+    index.
+
+    With prefilter, only pairs whose swept boxes (padded by threshold_km) overlap reach the CPA computation.  The
+    boxes are matched by sorting along the axis of largest spread, which skips most pairs when the tracks are spread
+    out compared with how far they move in the window.  Without it, every pair is evaluated in chunks.
+    """
+    _check_horizon(horizon_s)
+    if threshold_km < 0:
+        raise ValueError("The conflict threshold must not be negative.  Got {}.".format(threshold_km))
+    p_1, v_1 = _tracks(positions_1, velocities_1)
+    p_2, v_2 = _tracks(positions_2, velocities_2)
+    found = []
+    if prefilter:
+        lower_1, upper_1 = _swept_boxes(p_1, v_1, horizon_s)
+        lower_2, upper_2 = _swept_boxes(p_2, v_2, horizon_s)
+        lower_1, upper_1 = lower_1 - threshold_km, upper_1 + threshold_km
+        axis = np.argmax(np.ptp(np.concatenate((lower_1, lower_2)), axis=0)) if len(p_1) and len(p_2) else 0
+        for i, j in _sweep_pairs(lower_1[:, axis], upper_1[:, axis], lower_2[:, axis], upper_2[:, axis], max_pairs):
+            overlap = np.all((lower_1[i] <= upper_2[j]) & (lower_2[j] <= upper_1[i]), axis=1)
+            i, j = i[overlap], j[overlap]
+            time_s, distance_km = relative_cpa(p_2[j] - p_1[i], v_2[j] - v_1[i], horizon_s)
+            close = distance_km <= threshold_km
+            found.append((i[close], j[close], time_s[close], distance_km[close]))
+    else:
+        for chunk in pair_chunks(len(p_1), len(p_2), max_pairs):
+            time_s, distance_km = relative_cpa(p_2[None, :, :] - p_1[chunk, None, :],
+                                               v_2[None, :, :] - v_1[chunk, None, :], horizon_s)
+            i, j = np.nonzero(distance_km <= threshold_km)
+            found.append((i + chunk.start, j, time_s[i, j], distance_km[i, j]))
+    if not found:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0), np.zeros(0)
+    i, j, time_s, distance_km = (np.concatenate(values) for values in zip(*found))
+    order = np.lexsort((j, i))
+    return i[order], j[order], time_s[order], distance_km[order]
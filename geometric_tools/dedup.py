@@ -0,0 +1,166 @@
+"""
+Tolerance-based comparison and deduplication of batches of vectors and locations.
+
+Deduplication is greedy in input order: a point is kept unless an earlier kept point lies within tol of it, in which
+case it maps to the earliest such point.  Candidate pairs come from a hash grid with cells of size tol, so each point
+is only compared with points in its own and the neighbouring cells, and the run time is close to linear in the number
+of points.
+"""
+from __future__ import annotations
+from itertools import product
+from typing import Tuple
+
+import numpy as np
+
+from locations import Location, ecef_array
+from vector_alg import DEFAULT_TOL, Vector, evaluate
+
+DEFAULT_CHUNK_SIZE = 65536
+
+_hash_primes = np.array([0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F, 0x165667B19E3779F9, 0xD6E8FEB86659FD93],
+                        dtype=np.uint64)
+
+
+def _as_points(values) -> np.ndarray:
+    """
+    (N, D) float array from an array, a sequence of Vectors or a sequence of Locations (as ECEF km).
+    """
+    if isinstance(values, np.ndarray):
+        values = np.atleast_1d(values).astype(float)
+        return values.reshape(-1, values.shape[-1])
+    values = [evaluate(value) for value in values]
+    if all(isinstance(value, Location) for value in values) and len(values):
+        return ecef_array(values)
+    if all(isinstance(value, Vector) for value in values) and len(values):
+        return np.array([value.array for value in values], dtype=float).reshape(len(values), -1)
+    if any(isinstance(value, (Location, Vector)) for value in values):
+        raise TypeError("Points must be an array, Vectors or Locations.")
+    values = np.atleast_1d(np.asarray(values, dtype=float))
+    return values.reshape(-1, values.shape[-1])
+
+
+def isclose(points_1, points_2, tol: float = DEFAULT_TOL) -> np.ndarray:
+    """
+    Batch Vector.isclose/Location.isclose: True where the paired (broadcast) points are at most tol apart.
+    """
+    return np.linalg.norm(_as_points(points_1) - _as_points(points_2), axis=-1) <= tol
+
+
+def quantized_keys(points, tol: float = DEFAULT_TOL) -> np.ndarray:
+    """
+    (N, D) integer grid cells of size tol holding each point.  Row i equals points[i].quantized_key(tol).
+    """
+    return np.floor(_as_points(points) / tol).astype(np.int64)
+
+
+def _hash_cells(cells: np.ndarray) -> np.ndarray:
+    """
+    Mixes (N, D) integer cells into 64 bit hashes.  Collisions only add candidate pairs, never lose one.
+    """
+    cells = cells.astype(np.uint64)
+    hashes = np.zeros(len(cells), dtype=np.uint64)
+    for k in range(cells.shape[1]):
+        hashes ^= cells[:, k] * _hash_primes[k % len(_hash_primes)]
+    return hashes.view(np.int64)
+
+
+def _candidate_pairs(points: np.ndarray, tol: float, chunk_size: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    All (i, j), i < j, with points i and j at most tol apart.
+    """
+    cells = np.floor(points / tol).astype(np.int64)
+    hashes = _hash_cells(cells)
+    order = np.argsort(hashes, kind="stable")
+    sorted_hashes = hashes[order]
+    # Every neighbouring pair of cells is reached from one side only, by the half of the offsets that are
+    # lexicographically non-negative.
+    offsets = [offset for offset in product((-1, 0, 1), repeat=points.shape[1]) if offset >= (0,) * len(offset)]
+    pairs_i, pairs_j = [], []
+    for start in range(0, len(points), chunk_size):
+        chunk = np.arange(start, min(start + chunk_size, len(points)))
+        for offset in offsets:
+            neighbours = _hash_cells(cells[chunk] + np.array(offset, dtype=np.int64))
+            # Sorted queries walk the sorted hashes in order, which is several times faster than random lookups.
+            by_hash = np.argsort(neighbours)
+            neighbours = neighbours[by_hash]
+            lower = np.searchsorted(sorted_hashes, neighbours, side="left")
+            counts = np.searchsorted(sorted_hashes, neighbours, side="right") - lower
+            i = np.repeat(chunk[by_hash], counts)
+            runs = np.repeat(lower - np.cumsum(counts) + counts, counts)
+            j = order[runs + np.arange(len(i))]
+            close = (i != j) & (np.linalg.norm(points[i] - points[j], axis=1) <= tol)
+            pairs_i.append(np.minimum(i, j)[close])
+            pairs_j.append(np.maximum(i, j)[close])
+    pairs = np.unique(np.column_stack((np.concatenate(pairs_i), np.concatenate(pairs_j))), axis=0)
+    return pairs[:, 0], pairs[:, 1]
+
+
+def _greedy_keep(n_points: int, pairs_i: np.ndarray, pairs_j: np.ndarray) -> np.ndarray:
+    """
+    Greedy keep mask in index order: a point is kept unless an earlier neighbour is kept.
+
+    Vectorized rounds settle every point whose earlier neighbours are all settled, for as long as each round settles
+    at least an eighth of the points left, and only pairs ending at unsettled points are carried to the next round.
+    Whatever remains, typically chains of near-duplicates, is settled in one ascending sweep over a CSR list of
+    earlier neighbours, so the work stays O(N + pairs) however long the chains are.
+    """
+    status = np.zeros(n_points, dtype=np.int8)  # 1 kept, -1 dropped, 0 not settled yet.
+    n_unsettled = n_points
+    while n_unsettled:
+        earlier_status = status[pairs_i]
+        dropped = np.zeros(n_points, dtype=bool)
+        dropped[pairs_j[earlier_status == 1]] = True
+        waiting = np.zeros(n_points, dtype=bool)
+        waiting[pairs_j[earlier_status == 0]] = True
+        status[(status == 0) & dropped] = -1
+        status[(status == 0) & ~waiting] = 1
+        still_open = status[pairs_j] == 0
+        pairs_i, pairs_j = pairs_i[still_open], pairs_j[still_open]
+        previous, n_unsettled = n_unsettled, np.count_nonzero(status == 0)
+        if 8 * (previous - n_unsettled) < previous:
+            break
+    order = np.argsort(pairs_j, kind="stable")
+    earlier = pairs_i[order].tolist()
+    bounds = np.searchsorted(pairs_j[order], np.arange(n_points + 1), side="left")
+    unsettled = np.flatnonzero(status == 0)
+    keep = (status == 1).tolist()
+    for point, first, last in zip(unsettled.tolist(), bounds[unsettled].tolist(), bounds[unsettled + 1].tolist()):
+        keep[point] = not any(keep[k] for k in earlier[first:last])
+    return np.array(keep, dtype=bool)
+
+
+def unique_indices(points, tol: float = DEFAULT_TOL,
+                   chunk_size: int = DEFAULT_CHUNK_SIZE) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Deduplicates points to within tol.  Returns the ascending indices of the kept points and, for every input point,
+    the position in those indices of the kept point it maps to.
+    """
+    if tol <= 0:
+        raise ValueError("The tolerance must be positive.")
+    points = _as_points(points)
+    if len(points) == 0:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    # Exact duplicates collapse without any distance checks.
+    distinct, first, exact_inverse = np.unique(points, axis=0, return_index=True, return_inverse=True)
+    order = np.argsort(first)
+    distinct, first = distinct[order], first[order]
+    exact_inverse = np.argsort(order)[exact_inverse.ravel()]
+    pairs_i, pairs_j = _candidate_pairs(distinct, tol, chunk_size)
+    keep = _greedy_keep(len(distinct), pairs_i, pairs_j)
+    representative = np.arange(len(distinct))
+    representative[~keep] = len(distinct)
+    linked = keep[pairs_i] & ~keep[pairs_j]
+    np.minimum.at(representative, pairs_j[linked], pairs_i[linked])
+    position = np.cumsum(keep) - 1
+    return first[keep], position[representative[exact_inverse]]
+
+
+def deduplicate(points, tol: float = DEFAULT_TOL, chunk_size: int = DEFAULT_CHUNK_SIZE):
+    """
+    The points kept by unique_indices, as an array for array input and a list otherwise.
+    """
+    index, _ = unique_indices(points, tol, chunk_size)
+    if isinstance(points, np.ndarray):
+        return points.reshape(-1, points.shape[-1])[index]
+    points = list(points)
+    return [points[k] for k in index]
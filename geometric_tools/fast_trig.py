@@ -0,0 +1,89 @@
+"""
+Selectable precision for the sines and cosines in batch conversions and rotations.
+
+"exact" uses numpy's float64 functions.  "fast" reduces the angle to [-pi, pi] in float64 and evaluates numpy's
+vectorized float32 sin and cos, whose polynomial kernels are several times quicker than the float64 ones.  In fast
+mode the absolute error of sin and cos is at most FAST_MAX_ERROR for angles up to FAST_MAX_ANGLE_RAD in magnitude,
+and each coordinate of a converted position, a product of up to two such factors, is within 2 * FAST_MAX_ERROR of its
+radius: 1 m per 1000 km, or about 6.4 m at the earth surface.
+
+The inverse functions (acos, asin, atan2) have no fast mode.  numpy's float64 atan2 is already vectorized, so
+neither float32 arguments nor a polynomial evaluated with array operations is any quicker, and float32 acos and asin
+lose accuracy near +-1, where they are steep.  Batch conversions take angles from atan2, which is accurate
+everywhere, and the fast mode pays off where sines and cosines are a large share of the work: sph_coords_to_ecef,
+geo_to_ecef and quaternion_rotations.  rotation_matrices accepts it too, but its time goes to writing the (N, 3, 3)
+output.
+
+The precision is chosen per call with the precision argument or for a block with trig_precision.
+"""
+from __future__ import annotations
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Tuple
+
+import numpy as np
+
+EXACT = "exact"
+FAST = "fast"
+PRECISIONS = (EXACT, FAST)
+FAST_MAX_ERROR = 5e-7
+FAST_MAX_ANGLE_RAD = 1e6
+
+_precision = ContextVar("precision", default=EXACT)
+
+
+@contextmanager
+def trig_precision(precision: str):
+    """
+    Within the block, batch functions that take a precision argument default to precision.
+    """
+    token = _precision.set(_check(precision))
+    try:
+        yield
+    finally:
+        _precision.reset(token)
+
+
+def _check(precision: str) -> str:
+    if precision not in PRECISIONS:
+        raise ValueError("The precision must be one of {}.  Got {}.".format(PRECISIONS, precision))
+    return precision
+
+
+def resolve(precision: str = None) -> str:
+    """
+    The precision to use: the argument if given, otherwise the one set by trig_precision.
+    """
+    return _precision.get() if precision is None else _check(precision)
+
+
+def _reduced(angles_rad) -> np.ndarray:
+    """
+    Angles reduced to [-pi, pi] in float64 and then rounded to float32.
+    """
+    angles_rad = np.asarray(angles_rad, dtype=float)
+    turns = np.rint(angles_rad * (0.5 / np.pi))
+    return (angles_rad - 2. * np.pi * turns).astype(np.float32)
+
+
+def sin(angles_rad, precision: str = None) -> np.ndarray:
+    if resolve(precision) == EXACT:
+        return np.sin(angles_rad)
+    return np.sin(_reduced(angles_rad)).astype(float)
+
+
+def cos(angles_rad, precision: str = None) -> np.ndarray:
+    if resolve(precision) == EXACT:
+        return np.cos(angles_rad)
+    return np.cos(_reduced(angles_rad)).astype(float)
+
+
+def sin_cos(angles_rad, precision: str = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Sine and cosine of the same angles, sharing the range reduction in fast mode.
+    """
+    if resolve(precision) == EXACT:
+        return np.sin(angles_rad), np.cos(angles_rad)
+    reduced = _reduced(angles_rad)
+    return np.sin(reduced).astype(float), np.cos(reduced).astype(float)
+
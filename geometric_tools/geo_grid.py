@@ -0,0 +1,127 @@
+"""
+Conversion of regular latitude/longitude grids to ECEF using cached per-row and per-column trigonometry.
+"""
+from __future__ import annotations
+from collections import OrderedDict
+from typing import Tuple
+
+import numpy as np
+
+from locations import Geo
+
+DEFAULT_CACHE_BYTES = 64 * 1024 * 1024
+
+
+class GeoGrid(object):
+    """
+    Regular grid of n_lat latitudes starting at lat0_deg spaced by lat_step_deg and n_lon longitudes starting at
+    lon0_deg spaced by lon_step_deg.  Grids with equal definitions share cached trig tables.
+    """
+
+    def __init__(self, lat0_deg: float, lat_step_deg: float, n_lat: int,
+                 lon0_deg: float, lon_step_deg: float, n_lon: int):
+        if n_lat < 1 or n_lon < 1:
+            raise ValueError("A grid needs at least one latitude and one longitude.")
+        self.lat0 = float(lat0_deg)
+        self.lat_step = float(lat_step_deg)
+        self.n_lat = int(n_lat)
+        self.lon0 = float(lon0_deg)
+        self.lon_step = float(lon_step_deg)
+        self.n_lon = int(n_lon)
+
+    def key(self) -> Tuple:
+        return self.lat0, self.lat_step, self.n_lat, self.lon0, self.lon_step, self.n_lon
+
+    def __eq__(self, other):
+        if not isinstance(other, GeoGrid):
+            return NotImplemented
+        return self.key() == other.key()
+
+    def __hash__(self):
+        return hash(self.key())
+
+    def __str__(self):
+        return "GeoGrid" + str(self.key())
+
+    def latitudes(self) -> np.ndarray:
+        return self.lat0 + self.lat_step * np.arange(self.n_lat)
+
+    def longitudes(self) -> np.ndarray:
+        return self.lon0 + self.lon_step * np.arange(self.n_lon)
+
+
+class TrigCache(object):
+    """
+    Least recently used cache of grid trig tables holding at most max_bytes of arrays.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self._tables = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._tables)
+
+    def __contains__(self, grid: GeoGrid) -> bool:
+        return grid.key() in self._tables
+
+    def clear(self):
+        self._tables.clear()
+        self.nbytes = 0
+
+    def get(self, grid: GeoGrid) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Returns sin and cos of the polar angle theta for each latitude and of phi for each longitude.
+        """
+        key = grid.key()
+        if key in self._tables:
+            self._tables.move_to_end(key)
+            return self._tables[key]
+        theta_rad = np.radians(90. - grid.latitudes())
+        phi_rad = np.radians(grid.longitudes())
+        tables = (np.sin(theta_rad), np.cos(theta_rad), np.sin(phi_rad), np.cos(phi_rad))
+        for table in tables:
+            table.flags.writeable = False
+        self._store(key, tables)
+        return tables
+
+    def _store(self, key: Tuple, tables: Tuple[np.ndarray, ...]):
+        size = sum(table.nbytes for table in tables)
+        if size > self.max_bytes:
+            return
+        while self.nbytes + size > self.max_bytes:
+            _, evicted = self._tables.popitem(last=False)
+            self.nbytes -= sum(table.nbytes for table in evicted)
+        self._tables[key] = tables
+        self.nbytes += size
+
+
+trig_cache = TrigCache()
+
+
+def grid_unit_vectors(grid: GeoGrid, cache: TrigCache = None) -> np.ndarray:
+    """
+    (n_lat, n_lon, 3) unit vectors from the earth center through each grid cell, formed by outer products.
+    """
+    if cache is None:
+        cache = trig_cache
+    sin_theta, cos_theta, sin_phi, cos_phi = cache.get(grid)
+    units = np.empty((grid.n_lat, grid.n_lon, 3))
+    np.multiply.outer(sin_theta, cos_phi, out=units[..., 0])
+    np.multiply.outer(sin_theta, sin_phi, out=units[..., 1])
+    units[..., 2] = cos_theta[:, None]
+    return units
+
+
+def grid_ecef(grid: GeoGrid, altitudes_km, cache: TrigCache = None) -> np.ndarray:
+    """
+    ECEF coordinates (km) of every grid cell.  A scalar altitude gives an (n_lat, n_lon, 3) array and a sequence of
+    n_alt altitude layers gives (n_alt, n_lat, n_lon, 3).
+    """
+    units = grid_unit_vectors(grid, cache)
+    r_km = Geo.Re_km + np.asarray(altitudes_km, dtype=float)
+    if r_km.ndim == 0:
+        units *= r_km
+        return units
+    return np.multiply.outer(r_km, units)
@@ -0,0 +1,178 @@
+"""
+Spherical regions defined by Geo vertices and a batch containment engine for many points against many regions.
+Containment only depends on direction from the earth center, so altitudes are ignored.
+"""
+from __future__ import annotations
+from typing import Sequence, Tuple
+
+import numpy as np
+
+from batch_helpers import DEFAULT_MAX_PAIRS, as_triples, pair_chunks
+from locations import Location, ECEF, Geo, ecef_array, geo_to_ecef
+
+
+def _unit_vectors(lat_lon_alt) -> np.ndarray:
+    """
+    (N, 3) unit vectors from the earth center through (N, 3) latitude, longitude, altitude rows.
+    """
+    lat_lon = as_triples(lat_lon_alt).reshape(-1, 3).copy()
+    lat_lon[:, 2] = 0.
+    return geo_to_ecef(lat_lon) / Geo.Re_km
+
+
+def _geo_rows(points) -> np.ndarray:
+    """
+    Accepts a sequence of Geo objects or an (N, 3) latitude, longitude, altitude array.
+    """
+    if isinstance(points, np.ndarray):
+        return as_triples(points).reshape(-1, 3)
+    return np.array([[point.lat, point.lon, point.alt] for point in points], dtype=float).reshape(-1, 3)
+
+
+class SphericalRegion(object):
+    """
+    Base class for regions on the sphere.
+    """
+
+    def bounding_cap(self) -> SphericalCap:
+        raise NotImplementedError("Should not be using regions with the base class.")
+
+    def _contains_units(self, units: np.ndarray) -> np.ndarray:
+        raise NotImplementedError("Should not be using regions with the base class.")
+
+    def contains(self, points) -> np.ndarray:
+        """
+        Boolean mask of the Geo points (sequence or (N, 3) array) that lie in the region.
+        """
+        return self._contains_units(_unit_vectors(_geo_rows(points)))
+
+
+class SphericalCap(SphericalRegion):
+    """
+    All points within radius_km of the center, measured along the surface of the spherical earth.
+    """
+
+    def __init__(self, center: Location, radius_km: float):
+        if not isinstance(center, Location):
+            raise TypeError("The center of a cap must be a Location.")
+        if radius_km < 0:
+            raise ValueError("The radius of a cap cannot be negative.")
+        center_km = ecef_array(center)[0]
+        center_mag = np.linalg.norm(center_km)
+        if center_mag == 0:
+            raise ValueError("The center of a cap cannot be the center of the earth.")
+        self.center = center
+        self.radius_km = radius_km
+        self.unit = center_km / center_mag
+        self.angle = min(radius_km / Geo.Re_km, np.pi)
+        self.cos_angle = np.cos(self.angle)
+
+    @classmethod
+    def _from_unit(cls, unit: np.ndarray, angle_rad: float) -> SphericalCap:
+        return cls(ECEF(*(Geo.Re_km * unit)), angle_rad * Geo.Re_km)
+
+    def bounding_cap(self) -> SphericalCap:
+        return self
+
+    def _contains_units(self, units: np.ndarray) -> np.ndarray:
+        return units @ self.unit >= self.cos_angle
+
+
+class SphericalPolygon(SphericalRegion):
+    """
+    Polygon whose edges are the great-circle arcs between consecutive Geo vertices (the last joins the first).
+    Vertices may also be given as an (N, 3) latitude, longitude, altitude array.
+    The polygon must fit inside a hemisphere so that its interior is unambiguous.
+    """
+    _fudge = 1e-12
+
+    def __init__(self, vertices: Sequence[Geo]):
+        if not isinstance(vertices, np.ndarray) and not all(isinstance(vertex, Geo) for vertex in vertices):
+            raise TypeError("The vertices of a polygon must be Geo locations or an (N, 3) array of them.")
+        self.vertices = _geo_rows(vertices)
+        if len(self.vertices) < 3:
+            raise ValueError("A polygon needs at least 3 vertices.")
+        self.units = _unit_vectors(self.vertices)
+        center = self.units.sum(axis=0)
+        center_mag = np.linalg.norm(center)
+        if center_mag == 0:
+            raise ValueError("The polygon must fit inside a hemisphere.")
+        center = center / center_mag
+        angle = np.acos(np.clip(self.units @ center, -1., 1.)).max()
+        if angle >= np.pi / 2.:
+            raise ValueError("The polygon must fit inside a hemisphere.")
+        self._cap = SphericalCap._from_unit(center, angle + self._fudge)
+        self._edge_normals = np.cross(self.units, np.roll(self.units, -1, axis=0))
+        self._edge_dots = np.einsum("ij,ij->i", self.units, np.roll(self.units, -1, axis=0))
+
+    def bounding_cap(self) -> SphericalCap:
+        return self._cap
+
+    def _contains_units(self, units: np.ndarray) -> np.ndarray:
+        """
+        Winding number test: the signed angles subtended by the edges at each point sum to +-2 pi inside and 0
+        outside.  The bounding cap excludes the antipodal region where the sum would also be +-2 pi.
+        """
+        inside = self._cap._contains_units(units)
+        candidates = units[inside]
+        if len(candidates) == 0:
+            return inside
+        to_start = candidates @ self.units.T
+        to_end = np.roll(to_start, -1, axis=1)
+        winding = np.atan2(candidates @ self._edge_normals.T, self._edge_dots - to_start * to_end).sum(axis=1)
+        inside[inside] = np.abs(winding) > np.pi
+        return inside
+
+
+class Geofence(object):
+    """
+    Tests batches of Geo points against many regions.  Each chunk of points is first compared with every region's
+    precomputed bounding cap in one matrix product, and only candidate point/region pairs get the exact test.
+    Chunks hold at most max_pairs point/region pairs, so the cap matrix stays the same size however many regions
+    there are.
+    """
+
+    def __init__(self, regions: Sequence[SphericalRegion], max_pairs: int = DEFAULT_MAX_PAIRS):
+        if not all(isinstance(region, SphericalRegion) for region in regions):
+            raise TypeError("Geofence regions must be SphericalRegion objects.")
+        self.regions = list(regions)
+        self.max_pairs = max_pairs
+        caps = [region.bounding_cap() for region in self.regions]
+        self._cap_units = np.array([cap.unit for cap in caps]).reshape(-1, 3)
+        self._cap_cos_angles = np.array([cap.cos_angle for cap in caps])
+
+    def query(self, points) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns (point_indices, region_indices), the pairs for which the point lies in the region.
+        """
+        units = _unit_vectors(_geo_rows(points))
+        candidates = [(np.zeros(0, dtype=int), np.zeros(0, dtype=int))]
+        for chunk in pair_chunks(len(units), len(self.regions), self.max_pairs):
+            point_idx, region_idx = np.nonzero(units[chunk] @ self._cap_units.T >= self._cap_cos_angles)
+            candidates.append((point_idx + chunk.start, region_idx))
+        # Candidates from every chunk are grouped by region once, so each region's exact test runs a single time.
+        point_idx, region_idx = (np.concatenate(values) for values in zip(*candidates))
+        order = np.argsort(region_idx, kind="stable")
+        point_idx, region_idx = point_idx[order], region_idx[order]
+        boundaries = np.flatnonzero(np.diff(region_idx)) + 1
+        point_hits, region_hits = [], []
+        for points_in_cap, regions_in_cap in zip(np.split(point_idx, boundaries), np.split(region_idx, boundaries)):
+            if len(points_in_cap) == 0:
+                continue
+            inside = self.regions[regions_in_cap[0]]._contains_units(units[points_in_cap])
+            point_hits.append(points_in_cap[inside])
+            region_hits.append(regions_in_cap[inside])
+        if not point_hits:
+            return np.zeros(0, dtype=int), np.zeros(0, dtype=int)
+        point_hits, region_hits = np.concatenate(point_hits), np.concatenate(region_hits)
+        order = np.lexsort((region_hits, point_hits))
+        return point_hits[order], region_hits[order]
+
+    def contains(self, points) -> np.ndarray:
+        """
+        (N, R) boolean mask of which of the R regions contain each of the N points.
+        """
+        point_idx, region_idx = self.query(points)
+        mask = np.zeros((len(_geo_rows(points)), len(self.regions)), dtype=bool)
+        mask[point_idx, region_idx] = True
+        return mask
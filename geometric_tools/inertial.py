@@ -0,0 +1,182 @@
+"""
+Earth Centered Inertial (ECI) frame and its time-dependent conversion to and from ECEF.
+
+The two frames share the z axis and differ by the Earth Rotation Angle (IERS 2003), with UTC standing in for UT1.
+Precession, nutation and polar motion are ignored.  Times are POSIX seconds or numpy datetime64 values.
+"""
+from __future__ import annotations
+from typing import Tuple
+
+import numpy as np
+
+from batch_helpers import as_triples
+from locations import Location, ECEF, SphCoords, Geo
+from vector_3d import Vector3D
+from vector_alg import evaluate
+
+J2000_POSIX_S = 946728000.  # 2000-01-01T12:00:00 as POSIX seconds.
+DEFAULT_CACHE_SIZE = 65536
+
+
+def _posix_seconds(times) -> np.ndarray:
+    times = np.asarray(times)
+    if np.issubdtype(times.dtype, np.datetime64):
+        return times.astype("datetime64[ns]").astype(np.int64) / 1e9
+    return times.astype(float)
+
+
+def earth_rotation_angle(times) -> np.ndarray:
+    """
+    Earth Rotation Angle (rad, between 0 and 2 pi) at each time.
+    """
+    days = (_posix_seconds(times) - J2000_POSIX_S) / 86400.
+    turns = (0.7790572732640 + 0.00273781191135448 * days + days % 1.) % 1.
+    return 2. * np.pi * turns
+
+
+def _matrices(angles_rad: np.ndarray) -> np.ndarray:
+    """
+    (N, 3, 3) rotations taking ECI components to ECEF components.
+    """
+    cos_angle, sin_angle = np.cos(angles_rad), np.sin(angles_rad)
+    matrices = np.zeros(angles_rad.shape + (3, 3))
+    matrices[..., 0, 0] = cos_angle
+    matrices[..., 0, 1] = sin_angle
+    matrices[..., 1, 0] = -sin_angle
+    matrices[..., 1, 1] = cos_angle
+    matrices[..., 2, 2] = 1.
+    return matrices
+
+
+class RotationCache(object):
+    """
+    Least recently used cache of ECI to ECEF matrices keyed on epoch (POSIX seconds), holding at most maxsize.
+    The epochs are kept sorted alongside their matrices and last-use stamps, so lookups, insertions and evictions
+    are array operations on whole batches.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.clear()
+
+    def __len__(self) -> int:
+        return len(self._epochs)
+
+    def clear(self):
+        self._epochs = np.zeros(0)
+        self._matrices = np.zeros((0, 3, 3))
+        self._last_used = np.zeros(0, dtype=np.int64)
+        self._clock = 0
+
+    def matrices(self, times) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns (U, 3, 3) matrices for the U unique epochs and the index of each time into them.
+        Only epochs missing from the cache are computed, all in one vectorized call.
+        """
+        epochs, inverse = np.unique(_posix_seconds(times).ravel(), return_inverse=True)
+        position = np.searchsorted(self._epochs, epochs)
+        found = position < len(self._epochs)
+        found[found] = self._epochs[position[found]] == epochs[found]
+        matrices = np.empty((len(epochs), 3, 3))
+        matrices[found] = self._matrices[position[found]]
+        matrices[~found] = _matrices(earth_rotation_angle(epochs[~found]))
+        self._clock += 1
+        self._last_used[position[found]] = self._clock
+        if self.maxsize >= 1 and not np.all(found):
+            self._store(epochs[~found], matrices[~found])
+        return matrices, inverse.ravel()
+
+    def _store(self, epochs: np.ndarray, matrices: np.ndarray):
+        """
+        Adds epochs missing from the cache, then evicts the least recently used beyond maxsize.
+        """
+        epochs = np.concatenate((self._epochs, epochs))
+        matrices = np.concatenate((self._matrices, matrices))
+        last_used = np.concatenate((self._last_used, np.full(len(epochs) - len(self._epochs), self._clock)))
+        if len(epochs) > self.maxsize:
+            recent = np.argpartition(last_used, len(epochs) - self.maxsize)[len(epochs) - self.maxsize:]
+            epochs, matrices, last_used = epochs[recent], matrices[recent], last_used[recent]
+        order = np.argsort(epochs)
+        self._epochs, self._matrices, self._last_used = epochs[order], matrices[order], last_used[order]
+
+
+rotation_cache = RotationCache()
+
+
+def _rotate(xyz_km, times, transpose: bool, cache: RotationCache) -> np.ndarray:
+    xyz_km = as_triples(xyz_km).reshape(-1, 3)
+    times = np.broadcast_to(np.asarray(times), xyz_km.shape[:1])
+    if cache is None:
+        cache = rotation_cache
+    matrices, inverse = cache.matrices(times)
+    # Every matrix is a rotation about z, so only its cosine and sine are gathered per row instead of a 3x3 block.
+    cos_angle, sin_angle = matrices[:, 0, 0][inverse], matrices[:, 0, 1][inverse]
+    if transpose:
+        sin_angle = -sin_angle
+    rotated = np.empty_like(xyz_km)
+    rotated[:, 0] = cos_angle * xyz_km[:, 0] + sin_angle * xyz_km[:, 1]
+    rotated[:, 1] = cos_angle * xyz_km[:, 1] - sin_angle * xyz_km[:, 0]
+    rotated[:, 2] = xyz_km[:, 2]
+    return rotated
+
+
+def eci_to_ecef(xyz_km, times, cache: RotationCache = None) -> np.ndarray:
+    """
+    (N, 3) ECEF positions of (N, 3) ECI positions at scalar or (N,) times.
+    """
+    return _rotate(xyz_km, times, False, cache)
+
+
+def ecef_to_eci(xyz_km, times, cache: RotationCache = None) -> np.ndarray:
+    """
+    (N, 3) ECI positions of (N, 3) ECEF positions at scalar or (N,) times.
+    """
+    return _rotate(xyz_km, times, True, cache)
+
+
+class ECI(Location):
+    """
+    Earth Centered Inertial location at time (POSIX seconds).  All units are km.
+    Like every location, displacement vectors added to or subtracted from it have ECEF components.
+    """
+
+    def __init__(self, x_km: float, y_km: float, z_km: float, time_s: float):
+        self.x = x_km
+        self.y = y_km
+        self.z = z_km
+        self.time = float(_posix_seconds(time_s))
+
+    @classmethod
+    def from_location(cls, location: Location, time_s: float) -> ECI:
+        if not isinstance(location, Location):
+            raise TypeError("Can only convert a Location to ECI.")
+        ecef = location.ecef()
+        return cls(*ecef_to_eci([[ecef.x, ecef.y, ecef.z]], time_s)[0], time_s)
+
+    def __str__(self):
+        return "(" + str(self.x) + " km, " + str(self.y) + " km," + str(self.z) + " km, t=" + str(self.time) + " s)"
+
+    def __add__(self, other: Vector3D) -> ECI:
+        """
+        Returns the ECI location at the same time displaced by the input (ECEF) vector.
+        """
+        other = evaluate(other)
+        if isinstance(other, Vector3D):
+            return ECI.from_location(self.ecef() + other, self.time)
+        else:
+            raise TypeError("Displacement vector must be a Vector3D.")
+
+    def __radd__(self, other: Vector3D) -> ECI:
+        return self.__add__(other)
+
+    def ecef(self) -> ECEF:
+        """
+        Convert to ECEF representation.
+        """
+        return ECEF(*eci_to_ecef([[self.x, self.y, self.z]], self.time)[0])
+
+    def sph_coords(self) -> SphCoords:
+        return self.ecef().sph_coords()
+
+    def geo(self) -> Geo:
+        return self.ecef().geo()
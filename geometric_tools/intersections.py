@@ -0,0 +1,93 @@
+"""
+Vectorized intersection of rays with the earth, modelled as a sphere or as an ellipsoid with axes along ECEF x, y, z.
+
+Rays start at ECEF origins and run along ECEF directions, which need not be unit vectors.  Intersection points are
+returned in the batch form of any locations frame or local frame; missed rays give NaN ranges and points.
+"""
+from __future__ import annotations
+from typing import Tuple
+
+import numpy as np
+
+from batch_helpers import vector_rows
+from local_frames import LocalFrame
+from locations import ECEF, SphCoords, Geo, ecef_array, ecef_to_geo, ecef_to_sph_coords
+from quaternion import Quaternion
+
+_frame_converters = {ECEF: lambda xyz_km: xyz_km, SphCoords: ecef_to_sph_coords, Geo: ecef_to_geo}
+
+
+def _radii(radii_km) -> np.ndarray:
+    radii_km = np.broadcast_to(np.asarray(radii_km, dtype=float), (3,))
+    if np.any(radii_km <= 0):
+        raise ValueError("Radii must be positive.  Got {}.".format(radii_km))
+    return radii_km
+
+
+def _in_frame(xyz_km: np.ndarray, frame) -> np.ndarray:
+    if isinstance(frame, LocalFrame):
+        return frame.from_ecef(xyz_km)
+    try:
+        return _frame_converters[frame](xyz_km)
+    except (KeyError, TypeError):
+        raise TypeError("The frame must be ECEF, SphCoords, Geo or a LocalFrame.  Got {}.".format(frame))
+
+
+def ray_intersections(origins, directions, radii_km=Geo.Re_km,
+                      frame=ECEF) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    First intersection of each ray with the surface.  radii_km is one radius for a sphere or the three semi-axes of
+    an ellipsoid.  Returns the (N,) hit mask, the (N,) range (km) along the ray and the (N, 3) point in frame.
+    Origins and directions broadcast against each other; a ray starting inside the surface hits it on the way out.
+    """
+    radii_km = _radii(radii_km)
+    origins_km = ecef_array(origins).reshape(-1, 3)
+    directions = vector_rows(directions)
+    origins_km, directions = np.broadcast_arrays(origins_km, directions)
+    length = np.linalg.norm(directions, axis=1)
+    units = np.divide(directions, length[:, None], out=np.zeros_like(directions), where=length[:, None] > 0)
+    # Scaling by the semi-axes turns the ellipsoid into the unit sphere, where the ray parameter stays the range.
+    scaled_origins, scaled_units = origins_km / radii_km, units / radii_km
+    a = np.einsum("ni,ni->n", scaled_units, scaled_units)
+    half_b = np.einsum("ni,ni->n", scaled_origins, scaled_units)
+    c = np.einsum("ni,ni->n", scaled_origins, scaled_origins) - 1.
+    discriminant = half_b * half_b - a * c
+    root = np.sqrt(np.maximum(discriminant, 0.))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        near, far = (-half_b - root) / a, (-half_b + root) / a
+    range_km = np.where(near >= 0., near, far)
+    hit = (a > 0) & (discriminant >= 0) & (range_km >= 0)
+    range_km = np.where(hit, range_km, np.nan)
+    points_km = origins_km + range_km[:, None] * units
+    return hit, range_km, _in_frame(points_km, frame)
+
+
+def detector_directions(n_rows: int, n_columns: int, fov_x_rad: float, fov_y_rad: float) -> np.ndarray:
+    """
+    (n_rows, n_columns, 3) unit pointing vectors of the pixel centers of a pinhole detector in the sensor frame.
+    The boresight is +z, columns run along +x across fov_x_rad and rows along +y across fov_y_rad.
+    """
+    if n_rows < 1 or n_columns < 1:
+        raise ValueError("The detector needs at least one row and one column.")
+    if not (0 <= fov_x_rad < np.pi and 0 <= fov_y_rad < np.pi):
+        raise ValueError("Fields of view must be between 0 and pi.")
+    x = np.tan(fov_x_rad / 2.) * ((np.arange(n_columns) + 0.5) / n_columns * 2. - 1.)
+    y = np.tan(fov_y_rad / 2.) * ((np.arange(n_rows) + 0.5) / n_rows * 2. - 1.)
+    directions = np.stack(np.broadcast_arrays(x[None, :], y[:, None], 1.), axis=-1)
+    return directions / np.linalg.norm(directions, axis=-1, keepdims=True)
+
+
+def footprint(origin, attitude: Quaternion, directions, radii_km=Geo.Re_km,
+              frame=ECEF) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Projects (..., 3) sensor-frame directions, such as a detector_directions grid, from a single origin onto the
+    surface.  The directions are taken to ECEF with one attitude.rotate call.  The hit mask, range and points keep
+    the leading shape of directions.
+    """
+    if not isinstance(attitude, Quaternion):
+        raise TypeError("The attitude must be a Quaternion.")
+    directions = np.asarray(directions, dtype=float)
+    shape = directions.shape[:-1]
+    ecef_directions = attitude.rotate(directions.reshape(-1, 3))
+    hit, range_km, points = ray_intersections(ecef_array(origin).reshape(1, 3), ecef_directions, radii_km, frame)
+    return hit.reshape(shape), range_km.reshape(shape), points.reshape(shape + (3,))
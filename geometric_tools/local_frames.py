@@ -0,0 +1,127 @@
+"""
+Local tangent-plane frames (East-North-Up and North-East-Down) attached to a reference location.
+"""
+from __future__ import annotations
+from typing import Tuple
+
+import numpy as np
+
+from batch_helpers import as_triples
+from locations import Location, ECEF, ecef_array, ecef_to_geo, ecef_to_sph_coords, geo_to_ecef
+from vector_3d import Vector3D
+from vector_alg import evaluate
+
+
+class LocalFrame(object):
+    """
+    Base class for local tangent-plane frames on the spherical earth.  All units are km.
+    The rotation from ECEF into the local frame is computed once per reference and reused.
+    """
+
+    def __init__(self, reference: Location):
+        if not isinstance(reference, Location):
+            raise TypeError("The reference of a local frame must be a Location.")
+        self.reference = reference
+        self.origin = ecef_array(reference)[0]
+        sph_coords = reference.sph_coords()
+        self.rotation = self._rotation_matrix(sph_coords.theta, sph_coords.phi)
+
+    @staticmethod
+    def _rotation_matrix(theta_rad: float, phi_rad: float) -> np.ndarray:
+        """
+        Rows are the local axes expressed in ECEF.
+        """
+        raise NotImplementedError("Should not be building a local frame with the base class.")
+
+    def vector(self, vec: Vector3D) -> Vector3D:
+        """
+        Expresses an ECEF displacement vector in the local frame.
+        """
+        vec = evaluate(vec)
+        if not isinstance(vec, Vector3D):
+            raise TypeError("Displacement vector must be a Vector3D.")
+        return Vector3D(self.rotation @ vec.array)
+
+    def ecef_vector(self, vec: Vector3D) -> Vector3D:
+        """
+        Expresses a local displacement vector in the ECEF frame.
+        """
+        vec = evaluate(vec)
+        if not isinstance(vec, Vector3D):
+            raise TypeError("Displacement vector must be a Vector3D.")
+        return Vector3D(self.rotation.T @ vec.array)
+
+    def displacement(self, location: Location, start: Location = None) -> Vector3D:
+        """
+        The local-frame vector from start (the reference by default) to location, i.e. location - start.
+        """
+        if start is None:
+            start = self.reference
+        return self.vector(location - start)
+
+    def location(self, vec: Vector3D) -> ECEF:
+        """
+        The location displaced from the reference by the local vector.
+        """
+        return self.reference.ecef() + self.ecef_vector(vec)
+
+    def from_ecef(self, xyz_km) -> np.ndarray:
+        """
+        Batch transform of (..., 3) ECEF positions into (..., 3) local coordinates.
+        """
+        return (as_triples(xyz_km) - self.origin) @ self.rotation.T
+
+    def to_ecef(self, local_km) -> np.ndarray:
+        """
+        Batch transform of (..., 3) local coordinates into (..., 3) ECEF positions.
+        """
+        return as_triples(local_km) @ self.rotation + self.origin
+
+    def from_geo(self, lat_lon_alt) -> np.ndarray:
+        """
+        Batch transform of (..., 3) latitude, longitude, altitude into (..., 3) local coordinates.
+        """
+        return self.from_ecef(geo_to_ecef(lat_lon_alt))
+
+    def to_geo(self, local_km) -> np.ndarray:
+        """
+        Batch transform of (..., 3) local coordinates into (..., 3) latitude, longitude, altitude.
+        """
+        return ecef_to_geo(self.to_ecef(local_km))
+
+
+class ENU(LocalFrame):
+    """
+    East-North-Up frame tangent to the sphere at the reference location.
+    """
+
+    @staticmethod
+    def _rotation_matrix(theta_rad: float, phi_rad: float) -> np.ndarray:
+        """
+        Rows are the east, north and up unit vectors.  (N,) angles give a (3, 3, N) array.
+        """
+        sin_theta, cos_theta = np.sin(theta_rad), np.cos(theta_rad)
+        sin_phi, cos_phi = np.sin(phi_rad), np.cos(phi_rad)
+        return np.array([[-sin_phi, cos_phi, np.zeros_like(sin_phi)],
+                         [-cos_theta * cos_phi, -cos_theta * sin_phi, sin_theta],
+                         [sin_theta * cos_phi, sin_theta * sin_phi, cos_theta]])
+
+
+def local_axes(xyz_km: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    East, north and up unit vectors (each (N, 3)) of the ENU frames at (N, 3) ECEF points.
+    """
+    r_theta_phi = ecef_to_sph_coords(as_triples(xyz_km).reshape(-1, 3))
+    east, north, up = ENU._rotation_matrix(r_theta_phi[:, 1], r_theta_phi[:, 2])
+    return east.T, north.T, up.T
+
+
+class NED(LocalFrame):
+    """
+    North-East-Down frame tangent to the sphere at the reference location.
+    """
+
+    @staticmethod
+    def _rotation_matrix(theta_rad: float, phi_rad: float) -> np.ndarray:
+        east, north, up = ENU._rotation_matrix(theta_rad, phi_rad)
+        return np.array([north, east, -up])
@@ -0,0 +1,71 @@
+"""
+Vectorized look angles (range, elevation, azimuth) and line of sight between many observers and many targets.
+The earth is the sphere of radius Geo.Re_km used throughout locations.
+"""
+from __future__ import annotations
+from typing import Tuple
+
+import numpy as np
+
+from batch_helpers import DEFAULT_MAX_PAIRS, pair_chunks
+from local_frames import local_axes
+from locations import Geo, ecef_array
+
+
+def look_angles(observers, targets, max_pairs: int = DEFAULT_MAX_PAIRS) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Range (km), elevation and azimuth (rad) from each of N observers to each of M targets, each as an (N, M) array.
+    Elevation is measured from the local horizontal and azimuth clockwise from north, between 0 and 2 pi.
+    Observers and targets are sequences of Locations or (N, 3) ECEF arrays.
+    """
+    observers_km = ecef_array(observers)
+    targets_km = ecef_array(targets)
+    shape = (len(observers_km), len(targets_km))
+    range_km, elevation, azimuth = np.empty(shape), np.empty(shape), np.empty(shape)
+    for chunk in pair_chunks(shape[0], shape[1], max_pairs):
+        east, north, up = local_axes(observers_km[chunk])
+        diff = targets_km[None, :, :] - observers_km[chunk, None, :]
+        range_km[chunk] = np.linalg.norm(diff, axis=-1)
+        d_east = np.einsum("nmi,ni->nm", diff, east)
+        d_north = np.einsum("nmi,ni->nm", diff, north)
+        d_up = np.einsum("nmi,ni->nm", diff, up)
+        elevation[chunk] = np.atan2(d_up, np.hypot(d_east, d_north))
+        azimuth[chunk] = np.atan2(d_east, d_north) % (2. * np.pi)
+    return range_km, elevation, azimuth
+
+
+def line_of_sight(observers, targets, radius_km: float = Geo.Re_km,
+                  max_pairs: int = DEFAULT_MAX_PAIRS) -> np.ndarray:
+    """
+    (N, M) mask that is True where the straight segment between observer and target does not pass through the
+    sphere of radius_km.  Endpoints at or below the surface are treated as lying on it.
+    """
+    observers_km = ecef_array(observers)
+    targets_km = ecef_array(targets)
+    clear = np.empty((len(observers_km), len(targets_km)), dtype=bool)
+    target_r = np.linalg.norm(targets_km, axis=-1)
+    for chunk in pair_chunks(*clear.shape, max_pairs):
+        start = observers_km[chunk, None, :]
+        diff = targets_km[None, :, :] - start
+        diff_sq = np.einsum("nmi,nmi->nm", diff, diff)
+        t = np.divide(-np.einsum("nmi,nmi->nm", start, diff), diff_sq, out=np.zeros_like(diff_sq), where=diff_sq > 0)
+        closest = start + np.clip(t, 0., 1.)[..., None] * diff
+        closest_r = np.linalg.norm(closest, axis=-1)
+        surface_r = np.minimum(radius_km, np.minimum(np.linalg.norm(start, axis=-1), target_r[None, :]))
+        clear[chunk] = closest_r >= surface_r
+    return clear
+
+
+def visibility(observers, targets, min_elevation_rad: float = 0., radius_km: float = Geo.Re_km,
+               max_pairs: int = DEFAULT_MAX_PAIRS) -> np.ndarray:
+    """
+    (N, M) mask of targets that are above min_elevation_rad and not occluded by the earth for each observer.
+    """
+    observers_km = ecef_array(observers)
+    targets_km = ecef_array(targets)
+    visible = np.empty((len(observers_km), len(targets_km)), dtype=bool)
+    for chunk in pair_chunks(*visible.shape, max_pairs):
+        _, elevation, _ = look_angles(observers_km[chunk], targets_km, max_pairs)
+        clear = line_of_sight(observers_km[chunk], targets_km, radius_km, max_pairs)
+        visible[chunk] = (elevation >= min_elevation_rad) & clear
+    return visible
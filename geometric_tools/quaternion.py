@@ -1,10 +1,12 @@
 from __future__ import annotations
+import math
 from numbers import Number
 from typing import Tuple
 
 import numpy as np
 
-from vector_alg import Vector
+from fast_trig import sin_cos
+from vector_alg import Vector, evaluate
 from vector_3d import Vector3D
 
 
@@ -14,25 +16,36 @@ class Quaternion(Vector):
     def __init__(self, q0, q1, q2, q3):
         super().__init__(q0, q1, q2, q3)
 
+    @classmethod
+    def _from_array(cls, array: np.ndarray) -> Quaternion:
+        return cls(*array)
+
     @classmethod
     def from_rotation_about_axis(cls, angle: Number, vec: Vector3D) -> Quaternion:
+        vec = evaluate(vec)
         if not isinstance(vec, Vector3D):
             raise TypeError("The vector argument must be a Vector3D object.")
         unit = vec.unit()
         cos_half_angle = np.cos(angle / 2.)
         sin_half_angle = np.sin(angle / 2.)
-        qvec = sin_half_angle * unit
+        qvec = evaluate(sin_half_angle * unit)
         return Quaternion(cos_half_angle, qvec.x, qvec.y, qvec.z)
 
     def to_angle_and_unit(self) -> Tuple[Number, Vector3D]:
-        angle = 2. * np.acos(self.array[0])
-        sin_half_angle = np.sin(angle / 2.)
+        """
+        Rotation angle and unit axis of a unit quaternion.  The angle is 2 atan2(|qv|, q0), which equals 2 acos(q0)
+        but stays accurate for rotations near 0 and 2 pi.
+        """
+        q0, q1, q2, q3 = self.array.tolist()
+        sin_half_angle = math.sqrt(q1 * q1 + q2 * q2 + q3 * q3)
+        angle = 2. * math.atan2(sin_half_angle, q0)
         if sin_half_angle == 0:
             raise ValueError("Could not recover unit vector from angle = {}.".format(angle))
-        return angle, Vector3D(*list((self.array / sin_half_angle)[1:]))
+        return angle, Vector3D(q1 / sin_half_angle, q2 / sin_half_angle, q3 / sin_half_angle)
 
     @classmethod
     def from_vector(cls, vec: Vector3D) -> Quaternion:
+        vec = evaluate(vec)
         if not isinstance(vec, Vector3D):
             raise TypeError("The vector argument must be a Vector3D object.")
         return Quaternion(0, vec.x, vec.y, vec.z)
@@ -54,12 +67,121 @@ class Quaternion(Vector):
     def inv(self) -> Quaternion:
         return Quaternion(self[0], -self[1], -self[2], -self[3])
 
+    def rotate(self, vec):
+        """
+        Rotates vec the same way as self.inv() * vec * self for a unit quaternion, without building quaternions.
+        A Vector3D is rotated with the vector form v + q0 t + qv x t, where t = 2 qv x v.
+        An (..., 3) array of vectors is rotated with a single product against as_matrix().
+        """
+        vec = evaluate(vec)
+        if isinstance(vec, np.ndarray):
+            return vec @ self.as_matrix().T
+        if not isinstance(vec, Vector3D):
+            raise TypeError("The vector argument must be a Vector3D object or an array of vectors.")
+        q0, q1, q2, q3 = self.array
+        t1 = 2. * (q2 * vec.z - q3 * vec.y)
+        t2 = 2. * (q3 * vec.x - q1 * vec.z)
+        t3 = 2. * (q1 * vec.y - q2 * vec.x)
+        return Vector3D(vec.x + q0 * t1 + q2 * t3 - q3 * t2,
+                        vec.y + q0 * t2 + q3 * t1 - q1 * t3,
+                        vec.z + q0 * t3 + q1 * t2 - q2 * t1)
+
+    def as_matrix(self) -> np.ndarray:
+        """
+        The 3x3 matrix R of a unit quaternion such that R @ v equals self.rotate(v).
+        """
+        q0, q1, q2, q3 = self.array
+        return np.array([[1. - 2. * (q2 * q2 + q3 * q3), 2. * (q1 * q2 - q0 * q3), 2. * (q1 * q3 + q0 * q2)],
+                         [2. * (q1 * q2 + q0 * q3), 1. - 2. * (q1 * q1 + q3 * q3), 2. * (q2 * q3 - q0 * q1)],
+                         [2. * (q1 * q3 - q0 * q2), 2. * (q2 * q3 + q0 * q1), 1. - 2. * (q1 * q1 + q2 * q2)]])
+
 
 def quaternion_rotation(rot_angle, rot_axis: Vector3D, vec: Vector3D) -> Vector3D:
     """
     Rotates vec by rot_angle about the axis along rot_axis.
     """
-    rot_q = Quaternion.from_rotation_about_axis(rot_angle, rot_axis)
-    qvec = Quaternion.from_vector(vec)
-    qvec_rot = rot_q.inv() * qvec * rot_q
-    return qvec_rot.to_vector()
+    return Quaternion.from_rotation_about_axis(rot_angle, rot_axis).rotate(vec)
+
+
+def _unit_quaternions(rot_angles, rot_axes, precision: str) -> Tuple[np.ndarray, ...]:
+    """
+    Components q0, q1, q2, q3 of the unit quaternions rotating by rot_angles about the (..., 3) rot_axes.
+    """
+    rot_angles = np.asarray(rot_angles, dtype=float)
+    rot_axes = np.asarray(rot_axes, dtype=float)
+    axis_mags = np.sqrt(np.einsum("...i,...i->...", rot_axes, rot_axes))
+    if np.any(axis_mags == 0):
+        raise ValueError("The 0 vector does not have a unit.")
+    sin_half, q0 = sin_cos(rot_angles / 2., precision)
+    scale = sin_half / axis_mags
+    return q0, scale * rot_axes[..., 0], scale * rot_axes[..., 1], scale * rot_axes[..., 2]
+
+
+def quaternion_rotations(rot_angles, rot_axes, vecs, precision: str = None) -> np.ndarray:
+    """
+    Batch version of quaternion_rotation.  Rotates each of the (N, 3) vecs by the matching angle about the matching
+    row of the (N, 3) rot_axes.  precision selects exact or fast sines and cosines (see fast_trig).
+    Works component by component, as Quaternion.rotate does, rather than through (N, 3) cross products.
+    """
+    q0, q1, q2, q3 = _unit_quaternions(rot_angles, rot_axes, precision)
+    vecs = np.asarray(vecs, dtype=float)
+    v1, v2, v3 = vecs[..., 0], vecs[..., 1], vecs[..., 2]
+    t1 = 2. * (q2 * v3 - q3 * v2)
+    t2 = 2. * (q3 * v1 - q1 * v3)
+    t3 = 2. * (q1 * v2 - q2 * v1)
+    rotated = np.empty(np.broadcast_shapes(q0.shape, v1.shape) + (3,))
+    rotated[..., 0] = v1 + q0 * t1 + q2 * t3 - q3 * t2
+    rotated[..., 1] = v2 + q0 * t2 + q3 * t1 - q1 * t3
+    rotated[..., 2] = v3 + q0 * t3 + q1 * t2 - q2 * t1
+    return rotated
+
+
+def rotation_matrices(rot_angles, rot_axes, precision: str = None) -> np.ndarray:
+    """
+    (N, 3, 3) matrices R with R @ v equal to quaternion_rotation(rot_angle, rot_axis, v) for each pair.
+    precision selects exact or fast sines and cosines (see fast_trig).
+    """
+    q0, q1, q2, q3 = _unit_quaternions(rot_angles, rot_axes, precision)
+    matrices = np.empty(q0.shape + (3, 3))
+    q1_q1, q2_q2, q3_q3 = q1 * q1, q2 * q2, q3 * q3
+    q1_q2, q1_q3, q2_q3 = q1 * q2, q1 * q3, q2 * q3
+    q0_q1, q0_q2, q0_q3 = q0 * q1, q0 * q2, q0 * q3
+    matrices[..., 0, 0] = 1. - 2. * (q2_q2 + q3_q3)
+    matrices[..., 0, 1] = 2. * (q1_q2 - q0_q3)
+    matrices[..., 0, 2] = 2. * (q1_q3 + q0_q2)
+    matrices[..., 1, 0] = 2. * (q1_q2 + q0_q3)
+    matrices[..., 1, 1] = 1. - 2. * (q1_q1 + q3_q3)
+    matrices[..., 1, 2] = 2. * (q2_q3 - q0_q1)
+    matrices[..., 2, 0] = 2. * (q1_q3 - q0_q2)
+    matrices[..., 2, 1] = 2. * (q2_q3 + q0_q1)
+    matrices[..., 2, 2] = 1. - 2. * (q1_q1 + q2_q2)
+    return matrices
+
+
+def quaternion_angles_and_units(quaternions) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Batch version of Quaternion.to_angle_and_unit for (..., 4) unit quaternions.  Returns the (...) rotation angles
+    and the (..., 3) unit axes.
+    """
+    quaternions = np.asarray(quaternions, dtype=float)
+    if quaternions.ndim == 0 or quaternions.shape[-1] != 4:
+        raise ValueError("Quaternions must have shape (..., 4).  Got {}.".format(quaternions.shape))
+    qvec = quaternions[..., 1:]
+    sin_half_angles = np.sqrt(np.einsum("...i,...i->...", qvec, qvec))
+    if np.any(sin_half_angles == 0):
+        raise ValueError("Could not recover unit vectors from rotations by 0 or 2 pi.")
+    return 2. * np.atan2(sin_half_angles, quaternions[..., 0]), qvec / sin_half_angles[..., None]
+
+
+def quaternion_products(q_1, q_2) -> np.ndarray:
+    """
+    Batch version of Quaternion.__mul__ for (..., 4) arrays of quaternion components.
+    """
+    q_1 = np.asarray(q_1, dtype=float)
+    q_2 = np.asarray(q_2, dtype=float)
+    a0, a1, a2, a3 = np.moveaxis(q_1, -1, 0)
+    b0, b1, b2, b3 = np.moveaxis(q_2, -1, 0)
+    return np.stack((a0 * b0 - a1 * b1 - a2 * b2 - a3 * b3,
+                     a0 * b1 + a1 * b0 - a2 * b3 + a3 * b2,
+                     a0 * b2 + a2 * b0 - a3 * b1 + a1 * b3,
+                     a0 * b3 + a3 * b0 - a1 * b2 + a2 * b1), axis=-1)
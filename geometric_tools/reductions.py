@@ -0,0 +1,261 @@
+"""
+Vectorized reductions (sums, means, bounds, covariance, principal axes, grouped reductions) over collections of
+vectors and locations.  Collections may be an (N, 3) array, a sequence of Vector3D or Location objects, or an
+iterable of (n, 3) array chunks or of Vector3D or Location objects, which is reduced one chunk at a time.
+"""
+from __future__ import annotations
+from typing import Iterator, Tuple
+
+import numpy as np
+
+from batch_helpers import as_triples
+from geofence import SphericalCap
+from locations import Location, ECEF, Geo, ecef_array, ecef_to_geo, geo_to_ecef
+from vector_alg import Vector, evaluate
+
+DEFAULT_CHUNK_SIZE = 65536  # Vector or Location items gathered per chunk from an iterable.
+_fudge = 1e-12  # angular slack (rad) so that the extreme value stays inside a bounding cap.
+
+
+def _is_objects(values) -> bool:
+    return isinstance(values, (list, tuple)) and bool(values) and isinstance(evaluate(values[0]), (Vector, Location))
+
+
+def _object_rows(values: list) -> np.ndarray:
+    """
+    (n, 3) rows of a list of Locations (in ECEF) or of 3D Vectors.
+    """
+    if isinstance(values[0], Location):
+        return ecef_array(values)
+    for value in values:
+        if not isinstance(value, Vector) or value.size() != 3:
+            raise ValueError("Can only reduce 3D vectors.  Got {}.".format(value))
+    return np.array([value.array for value in values], dtype=float)
+
+
+def _chunks(values, object_rows=_object_rows) -> Iterator[np.ndarray]:
+    """
+    Yields (n, 3) float arrays.  Locations are reduced in ECEF.
+
+    Any other iterable is read one item at a time: runs of Vector or Location items are gathered into chunks of at
+    most DEFAULT_CHUNK_SIZE rows and every other item is taken as an array chunk.
+    """
+    if isinstance(values, np.ndarray):
+        yield as_triples(values).reshape(-1, 3)
+        return
+    if _is_objects(values):
+        yield object_rows([evaluate(value) for value in values])
+        return
+    pending = []
+    for item in values:
+        item = evaluate(item)
+        if isinstance(item, (Vector, Location)):
+            pending.append(item)
+            if len(pending) == DEFAULT_CHUNK_SIZE:
+                yield object_rows(pending)
+                pending = []
+            continue
+        if pending:
+            yield object_rows(pending)
+            pending = []
+        yield from _chunks(item if _is_objects(item) else np.asarray(item, dtype=float), object_rows)
+    if pending:
+        yield object_rows(pending)
+
+
+def _as_array(values) -> np.ndarray:
+    chunks = list(_chunks(values))
+    if len(chunks) == 1:
+        return chunks[0]
+    return np.concatenate(chunks) if chunks else np.zeros((0, 3))
+
+
+class VectorMoments(object):
+    """
+    Single-pass accumulator of count, mean, scatter matrix and bounds of 3D points.
+    Chunks are merged with the pairwise update of Chan et al., which stays accurate for large offsets.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self._mean = np.zeros(3)
+        self._scatter = np.zeros((3, 3))
+        self.minimum = np.full(3, np.inf)
+        self.maximum = np.full(3, -np.inf)
+
+    @classmethod
+    def from_values(cls, values) -> VectorMoments:
+        moments = cls()
+        for chunk in _chunks(values):
+            moments.update(chunk)
+        return moments
+
+    def update(self, chunk) -> VectorMoments:
+        chunk = as_triples(chunk).reshape(-1, 3)
+        if len(chunk) == 0:
+            return self
+        other = VectorMoments()
+        other.count = len(chunk)
+        other._mean = chunk.mean(axis=0)
+        centered = chunk - other._mean
+        other._scatter = centered.T @ centered
+        other.minimum = chunk.min(axis=0)
+        other.maximum = chunk.max(axis=0)
+        return self.merge(other)
+
+    def merge(self, other: VectorMoments) -> VectorMoments:
+        count = self.count + other.count
+        if other.count == 0:
+            return self
+        delta = other._mean - self._mean
+        self._scatter = self._scatter + other._scatter + np.outer(delta, delta) * self.count * other.count / count
+        self._mean = self._mean + delta * other.count / count
+        self.count = count
+        self.minimum = np.minimum(self.minimum, other.minimum)
+        self.maximum = np.maximum(self.maximum, other.maximum)
+        return self
+
+    def _check_count(self, minimum: int = 1):
+        if self.count < minimum:
+            raise ValueError("Need at least {} values; have {}.".format(minimum, self.count))
+
+    def sum(self) -> np.ndarray:
+        return self._mean * self.count
+
+    def mean(self) -> np.ndarray:
+        self._check_count()
+        return self._mean.copy()
+
+    def bounds(self) -> Tuple[np.ndarray, np.ndarray]:
+        self._check_count()
+        return self.minimum.copy(), self.maximum.copy()
+
+    def covariance(self, ddof: int = 1) -> np.ndarray:
+        self._check_count(ddof + 1)
+        return self._scatter / (self.count - ddof)
+
+    def principal_axes(self, ddof: int = 1) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Variances along the principal axes, largest first, and the matching unit axes as rows.
+        """
+        variances, axes = np.linalg.eigh(self.covariance(ddof))
+        return variances[::-1], axes.T[::-1]
+
+
+def vector_sum(values) -> np.ndarray:
+    total = np.zeros(3)
+    for chunk in _chunks(values):
+        total += chunk.sum(axis=0)
+    return total
+
+
+def centroid(values) -> np.ndarray:
+    """
+    Mean position (ECEF km for locations).
+    """
+    return VectorMoments.from_values(values).mean()
+
+
+def bounding_box(values) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Axis-aligned (minimum, maximum) corners.
+    """
+    return VectorMoments.from_values(values).bounds()
+
+
+def covariance(values, ddof: int = 1) -> np.ndarray:
+    return VectorMoments.from_values(values).covariance(ddof)
+
+
+def principal_axes(values, ddof: int = 1) -> Tuple[np.ndarray, np.ndarray]:
+    return VectorMoments.from_values(values).principal_axes(ddof)
+
+
+def mean_direction(values) -> np.ndarray:
+    """
+    Unit vector along the sum of the unit vectors of the values.
+    """
+    total = np.zeros(3)
+    for chunk in _chunks(values):
+        mags = np.linalg.norm(chunk, axis=1, keepdims=True)
+        total += np.divide(chunk, mags, out=np.zeros_like(chunk), where=mags > 0).sum(axis=0)
+    mag = np.linalg.norm(total)
+    if mag == 0:
+        raise ValueError("The directions cancel, so their mean direction is undefined.")
+    return total / mag
+
+
+def _geo_rows(locations: list) -> np.ndarray:
+    for location in locations:
+        if not isinstance(location, Location):
+            raise TypeError("Geographic points must be Locations or arrays.  Got {}.".format(location))
+    return np.array([[geo.lat, geo.lon, geo.alt] for geo in (location.geo() for location in locations)],
+                    dtype=float)
+
+
+def _geo_chunks(geos) -> Iterator[np.ndarray]:
+    """
+    Yields (n, 3) latitude, longitude, altitude arrays from Locations, arrays or chunks of either.
+    """
+    yield from _chunks(geos, _geo_rows)
+
+
+def spherical_mean(geos) -> np.ndarray:
+    """
+    Mean (latitude, longitude, altitude) of geographic points: the direction of the summed surface unit vectors,
+    which is correct across the date line and near the poles, at the mean altitude.
+    """
+    total, altitude_sum, count = np.zeros(3), 0., 0
+    for chunk in _geo_chunks(geos):
+        surface = chunk.copy()
+        surface[:, 2] = 0.
+        total += geo_to_ecef(surface).sum(axis=0)
+        altitude_sum += chunk[:, 2].sum()
+        count += len(chunk)
+    if count == 0:
+        raise ValueError("Need at least one value for a spherical mean.")
+    mag = np.linalg.norm(total)
+    if mag == 0:
+        raise ValueError("The directions cancel, so their spherical mean is undefined.")
+    lat_lon_alt = ecef_to_geo(Geo.Re_km * total / mag)
+    lat_lon_alt[2] = altitude_sum / count
+    return lat_lon_alt
+
+
+def spherical_bounding_cap(values) -> SphericalCap:
+    """
+    A cap around the mean direction containing the direction of every value (locations or ECEF arrays).
+    Two passes are made, so chunked input is gathered into one array first.
+    """
+    array = _as_array(values)
+    center = mean_direction(array)
+    mags = np.linalg.norm(array, axis=1)
+    cos_angles = np.divide(array @ center, mags, out=np.ones(len(array)), where=mags > 0)
+    angle = np.acos(np.clip(cos_angles.min(), -1., 1.))
+    return SphericalCap(ECEF(*(Geo.Re_km * center)), (angle + _fudge) * Geo.Re_km)
+
+
+def grouped_sum(values, labels, n_groups: int = None) -> np.ndarray:
+    """
+    (n_groups, 3) sums of the values sharing each non-negative integer label.
+    """
+    array = _as_array(values)
+    labels = np.asarray(labels)
+    if labels.shape != (len(array),):
+        raise ValueError("Need one label per value.")
+    if n_groups is None:
+        n_groups = int(labels.max()) + 1 if len(labels) else 0
+    if len(labels) and (labels.min() < 0 or labels.max() >= n_groups):
+        raise ValueError("Labels must be in [0, {}).  Got labels from {} to {}.".format(
+            n_groups, labels.min(), labels.max()))
+    return np.stack([np.bincount(labels, weights=array[:, i], minlength=n_groups) for i in range(3)], axis=1)
+
+
+def grouped_mean(values, labels, n_groups: int = None) -> np.ndarray:
+    """
+    (n_groups, 3) means of the values sharing each label; empty groups are nan.
+    """
+    sums = grouped_sum(values, labels, n_groups)
+    counts = np.bincount(np.asarray(labels), minlength=len(sums))[:, None]
+    with np.errstate(invalid="ignore"):
+        return sums / counts
@@ -0,0 +1,104 @@
+"""
+Vectorized random sampling of directions, locations and rotations.
+
+Every sampler takes a numpy.random.Generator and a count and returns a batch array, so results are reproducible from
+the generator's seed.  sample_chunks draws large samples a chunk at a time to bound memory.
+"""
+from __future__ import annotations
+from typing import Callable, Iterator
+
+import numpy as np
+
+from geofence import SphericalCap
+from local_frames import local_axes
+from locations import Geo
+
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+
+def _check_count(n: int):
+    if n < 0:
+        raise ValueError("The number of samples must not be negative.  Got {}.".format(n))
+
+
+def unit_vectors(rng: np.random.Generator, n: int) -> np.ndarray:
+    """
+    (n, 3) unit vectors uniform on the sphere (Archimedes: z is uniform on [-1, 1]).
+    """
+    _check_count(n)
+    z = rng.uniform(-1., 1., n)
+    phi = rng.uniform(0., 2. * np.pi, n)
+    rho = np.sqrt(1. - z * z)
+    return np.column_stack((rho * np.cos(phi), rho * np.sin(phi), z))
+
+
+def cone_vectors(rng: np.random.Generator, n: int, axis, half_angle_rad: float) -> np.ndarray:
+    """
+    (n, 3) unit vectors uniform over the part of the sphere within half_angle_rad of axis.
+    """
+    _check_count(n)
+    if not 0. <= half_angle_rad <= np.pi:
+        raise ValueError("The half angle must be between 0 and pi.  Got {}.".format(half_angle_rad))
+    axis = np.asarray(axis, dtype=float).reshape(1, 3)
+    east, north, up = local_axes(axis / np.linalg.norm(axis))
+    cos_angle = rng.uniform(np.cos(half_angle_rad), 1., n)
+    azimuth = rng.uniform(0., 2. * np.pi, n)
+    sin_angle = np.sqrt(1. - cos_angle * cos_angle)
+    return ((sin_angle * np.cos(azimuth))[:, None] * east + (sin_angle * np.sin(azimuth))[:, None] * north
+            + cos_angle[:, None] * up)
+
+
+def cap_points(rng: np.random.Generator, n: int, cap: SphericalCap, altitude_km: float = 0.) -> np.ndarray:
+    """
+    (n, 3) ECEF points (km) uniform by area within the cap, at altitude_km above the spherical earth.
+    """
+    if not isinstance(cap, SphericalCap):
+        raise TypeError("The region to sample must be a SphericalCap.")
+    return (Geo.Re_km + altitude_km) * cone_vectors(rng, n, cap.unit, cap.angle)
+
+
+def shell_points(rng: np.random.Generator, n: int, inner_km: float, outer_km: float) -> np.ndarray:
+    """
+    (n, 3) ECEF points (km) uniform by volume between the spheres of radius inner_km and outer_km.
+    """
+    if not 0. <= inner_km <= outer_km:
+        raise ValueError("Need 0 <= inner_km <= outer_km.  Got {} and {}.".format(inner_km, outer_km))
+    r = np.cbrt(rng.uniform(inner_km ** 3, outer_km ** 3, n))
+    return r[:, None] * unit_vectors(rng, n)
+
+
+def geo_points(rng: np.random.Generator, n: int, lat_min: float = -90., lat_max: float = 90.,
+               lon_min: float = -180., lon_max: float = 180., altitude_km: float = 0.) -> np.ndarray:
+    """
+    (n, 3) latitude, longitude (deg) and altitude (km) uniform by area within the latitude/longitude box.
+    The box crosses the date line when lon_min > lon_max.
+    """
+    _check_count(n)
+    if not -90. <= lat_min <= lat_max <= 90.:
+        raise ValueError("Need -90 <= lat_min <= lat_max <= 90.  Got {} and {}.".format(lat_min, lat_max))
+    sin_lat = rng.uniform(np.sin(np.radians(lat_min)), np.sin(np.radians(lat_max)), n)
+    lon_span = (lon_max - lon_min) % 360. or (360. if lon_max != lon_min else 0.)
+    lon = (lon_min + rng.uniform(0., lon_span, n) + 180.) % 360. - 180.
+    return np.column_stack((np.degrees(np.asin(sin_lat)), lon, np.full(n, float(altitude_km))))
+
+
+def quaternions(rng: np.random.Generator, n: int) -> np.ndarray:
+    """
+    (n, 4) unit quaternions (q0 first) of rotations uniform over SO(3), by the method of Shoemake (1992).
+    """
+    _check_count(n)
+    u_1, u_2, u_3 = rng.random(n), rng.uniform(0., 2. * np.pi, n), rng.uniform(0., 2. * np.pi, n)
+    a, b = np.sqrt(1. - u_1), np.sqrt(u_1)
+    return np.column_stack((b * np.cos(u_3), a * np.sin(u_2), a * np.cos(u_2), b * np.sin(u_3)))
+
+
+def sample_chunks(sampler: Callable, rng: np.random.Generator, n: int, *args,
+                  chunk_size: int = DEFAULT_CHUNK_SIZE, **kwargs) -> Iterator[np.ndarray]:
+    """
+    Yields n samples from sampler(rng, count, *args, **kwargs) in chunks of at most chunk_size.
+    """
+    _check_count(n)
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be positive.  Got {}.".format(chunk_size))
+    for start in range(0, n, chunk_size):
+        yield sampler(rng, min(chunk_size, n - start), *args, **kwargs)
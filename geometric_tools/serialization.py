@@ -0,0 +1,113 @@
+"""
+Compact binary serialization of collections of vectors, quaternions and locations.
+
+The layout is a 16 byte header followed by one contiguous little-endian float column per component:
+
+    magic (4s) | version (u1) | kind tag (u1) | dtype tag (u1) | number of columns (u1) | count (u8)
+
+Deserializing to arrays is zero-copy; the returned array is a view of the input buffer.
+"""
+from __future__ import annotations
+import struct
+from typing import Sequence, Tuple
+
+import numpy as np
+
+from locations import ECEF, SphCoords, Geo
+from quaternion import Quaternion
+from vector_3d import Vector3D
+
+MAGIC = b"GTRC"
+VERSION = 1
+_header = struct.Struct("<4sBBBBQ")
+
+# kind tag -> (class, attributes holding the columns)
+_kinds = {1: (Vector3D, ("x", "y", "z")),
+          2: (Quaternion, None),
+          3: (ECEF, ("x", "y", "z")),
+          4: (SphCoords, ("r", "theta", "phi")),
+          5: (Geo, ("lat", "lon", "alt"))}
+_kind_tags = {cls: tag for tag, (cls, _) in _kinds.items()}
+_dtypes = {1: np.dtype("<f8"), 2: np.dtype("<f4")}
+_dtype_tags = {dtype: tag for tag, dtype in _dtypes.items()}
+
+
+def _n_columns(cls: type) -> int:
+    return 4 if cls is Quaternion else 3
+
+
+def to_array(values: Sequence) -> Tuple[type, np.ndarray]:
+    """
+    Stacks a sequence of objects that all share one serializable class into an (N, n_columns) array.
+    """
+    if len(values) == 0:
+        raise ValueError("Cannot infer the kind of an empty sequence.  Use dumps_array instead.")
+    cls = values[0].__class__
+    if cls not in _kind_tags:
+        raise TypeError("Cannot serialize objects of type {}.".format(cls.__name__))
+    if any(value.__class__ is not cls for value in values):
+        raise TypeError("All values must be of type {}.".format(cls.__name__))
+    attributes = _kinds[_kind_tags[cls]][1]
+    if attributes is None:
+        return cls, np.array([value.array for value in values], dtype=float)
+    return cls, np.array([[getattr(value, name) for name in attributes] for value in values], dtype=float)
+
+
+def dumps_array(cls: type, array, dtype=np.float64) -> bytes:
+    """
+    Serializes an (N, n_columns) array holding the components of N objects of type cls.
+    """
+    if cls not in _kind_tags:
+        raise TypeError("Cannot serialize objects of type {}.".format(getattr(cls, "__name__", cls)))
+    dtype = np.dtype(dtype).newbyteorder("<")
+    if dtype not in _dtype_tags:
+        raise ValueError("Unsupported dtype {}.  Use float64 or float32.".format(dtype))
+    n_columns = _n_columns(cls)
+    array = np.asarray(array)
+    if array.ndim != 2 or array.shape[1] != n_columns:
+        err_msg = "Expected an (N, {}) array for {}.  Got {}."
+        raise ValueError(err_msg.format(n_columns, cls.__name__, array.shape))
+    header = _header.pack(MAGIC, VERSION, _kind_tags[cls], _dtype_tags[dtype], n_columns, array.shape[0])
+    return header + np.ascontiguousarray(array.T, dtype=dtype).tobytes()
+
+
+def dumps(values: Sequence, dtype=np.float64) -> bytes:
+    """
+    Serializes a sequence of Vector3D, Quaternion, ECEF, SphCoords or Geo objects of a single type.
+    """
+    cls, array = to_array(values)
+    return dumps_array(cls, array, dtype)
+
+
+def loads_array(buffer) -> Tuple[type, np.ndarray]:
+    """
+    Returns the class tagged in the buffer and an (N, n_columns) read-only view of the buffer's columns.
+    """
+    buffer = memoryview(buffer)
+    if buffer.nbytes < _header.size:
+        raise ValueError("Buffer is too short to hold a header.")
+    magic, version, kind_tag, dtype_tag, n_columns, count = _header.unpack_from(buffer)
+    if magic != MAGIC:
+        raise ValueError("Buffer does not start with the expected magic bytes.")
+    if version != VERSION:
+        raise ValueError("Unsupported serialization version {}.".format(version))
+    if kind_tag not in _kinds or dtype_tag not in _dtypes:
+        raise ValueError("Unknown kind tag {} or dtype tag {}.".format(kind_tag, dtype_tag))
+    cls = _kinds[kind_tag][0]
+    if n_columns != _n_columns(cls):
+        raise ValueError("Column count {} does not match {}.".format(n_columns, cls.__name__))
+    dtype = _dtypes[dtype_tag]
+    if buffer.nbytes < _header.size + count * n_columns * dtype.itemsize:
+        raise ValueError("Buffer is truncated.")
+    columns = np.frombuffer(buffer, dtype=dtype, count=count * n_columns, offset=_header.size)
+    # frombuffer views of a writable buffer, such as a bytearray, are writable too.
+    columns.flags.writeable = False
+    return cls, columns.reshape(n_columns, count).T
+
+
+def loads(buffer) -> list:
+    """
+    Rebuilds the list of objects serialized with dumps.
+    """
+    cls, array = loads_array(buffer)
+    return [cls(*row) for row in array.tolist()]
@@ -0,0 +1,175 @@
+"""
+Error-bounded simplification of tracks (polylines of locations).
+
+Every point dropped from a track lies within tolerance_km of the segment joining the retained points either side of
+it.  The deviation is measured either as the 3D chord distance to the straight segment ("chord") or as the distance
+along the surface of the spherical earth to the great circle arc ("surface", which ignores altitude).  Results are
+the indices of the retained points, so any per-point attributes can be subset with them.
+"""
+from __future__ import annotations
+
+import numpy as np
+
+from batch_helpers import as_triples
+from locations import ECEF, SphCoords, Geo, ecef_array, geo_to_ecef, sph_coords_to_ecef
+
+METRICS = ("chord", "surface")
+DEFAULT_MAX_BUFFER = 4096
+
+_to_ecef = {ECEF: lambda xyz_km: xyz_km, SphCoords: sph_coords_to_ecef, Geo: geo_to_ecef}
+
+
+def _track_ecef(points, frame) -> np.ndarray:
+    """
+    (N, 3) ECEF rows of a sequence of Locations or of an (N, 3) array of rows in frame.
+    """
+    if not isinstance(points, np.ndarray):
+        return ecef_array(points).reshape(-1, 3)
+    if frame not in _to_ecef:
+        raise TypeError("The frame must be ECEF, SphCoords or Geo.  Got {}.".format(frame))
+    return _to_ecef[frame](as_triples(points).reshape(-1, 3))
+
+
+def _check_arguments(tolerance_km: float, metric: str):
+    if tolerance_km < 0:
+        raise ValueError("The tolerance must not be negative.  Got {}.".format(tolerance_km))
+    if metric not in METRICS:
+        raise ValueError("The metric must be one of {}.  Got {}.".format(METRICS, metric))
+
+
+def _chord_deviation(points: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """
+    Distance from each point to the straight segment between its start and end.
+    """
+    chord = ends - starts
+    chord_sq = np.einsum("ni,ni->n", chord, chord)
+    t = np.divide(np.einsum("ni,ni->n", points - starts, chord), chord_sq, out=np.zeros_like(chord_sq),
+                  where=chord_sq > 0)
+    return np.linalg.norm(points - starts - np.clip(t, 0., 1.)[:, None] * chord, axis=1)
+
+
+def _surface_deviation(points: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """
+    Distance along the surface from each point to the great circle arc between its start and end.
+    Beyond the ends of the arc this is the distance to the nearer end.
+    """
+    p, a, b = (v / np.linalg.norm(v, axis=1, keepdims=True) for v in (points, starts, ends))
+    normal = np.cross(a, b)
+    normal_mag = np.linalg.norm(normal, axis=1, keepdims=True)
+    normal = np.divide(normal, normal_mag, out=np.zeros_like(normal), where=normal_mag > 0)
+    between = (np.einsum("ni,ni->n", np.cross(a, p), normal) >= 0) & (np.einsum("ni,ni->n", np.cross(p, b),
+                                                                               normal) >= 0)
+    cross_track = np.asin(np.clip(np.abs(np.einsum("ni,ni->n", p, normal)), 0., 1.))
+    to_a = np.acos(np.clip(np.einsum("ni,ni->n", p, a), -1., 1.))
+    to_b = np.acos(np.clip(np.einsum("ni,ni->n", p, b), -1., 1.))
+    angle = np.where(between & (normal_mag[:, 0] > 0), cross_track, np.minimum(to_a, to_b))
+    return Geo.Re_km * angle
+
+
+def _deviation(points: np.ndarray, starts: np.ndarray, ends: np.ndarray, metric: str) -> np.ndarray:
+    if metric == "chord":
+        return _chord_deviation(points, starts, ends)
+    return _surface_deviation(points, starts, ends)
+
+
+def _douglas_peucker(xyz_km: np.ndarray, tolerance_km: float, metric: str) -> np.ndarray:
+    """
+    Keep mask of Douglas-Peucker on ECEF rows.  All segments at one depth of the recursion are split together, so
+    each pass over the track is a handful of array operations.
+    """
+    n_points = len(xyz_km)
+    keep = np.zeros(n_points, dtype=bool)
+    if n_points == 0:
+        return keep
+    keep[[0, -1]] = True
+    starts, ends = np.array([0]), np.array([n_points - 1])
+    while len(starts):
+        lengths = ends - starts - 1
+        starts, ends, lengths = starts[lengths > 0], ends[lengths > 0], lengths[lengths > 0]
+        if not len(starts):
+            break
+        segment = np.repeat(np.arange(len(starts)), lengths)
+        first = np.cumsum(lengths) - lengths
+        interior = starts[segment] + 1 + np.arange(len(segment)) - first[segment]
+        deviation = _deviation(xyz_km[interior], xyz_km[starts[segment]], xyz_km[ends[segment]], metric)
+        largest = np.maximum.reduceat(deviation, first)
+        # The first interior point reaching its segment's largest deviation is where the segment splits.
+        at_largest = np.flatnonzero(deviation == largest[segment])
+        _, first_at_largest = np.unique(segment[at_largest], return_index=True)
+        split = interior[at_largest[first_at_largest]]
+        exceeds = largest > tolerance_km
+        keep[split[exceeds]] = True
+        starts, ends, split = starts[exceeds], ends[exceeds], split[exceeds]
+        starts, ends = np.concatenate((starts, split)), np.concatenate((split, ends))
+    return keep
+
+
+def simplify(points, tolerance_km: float, metric: str = "chord", frame=ECEF) -> np.ndarray:
+    """
+    Ascending indices of the points Douglas-Peucker retains.  The first and last points are always retained.
+    points is a sequence of Locations or an (N, 3) array of rows in frame (ECEF, SphCoords or Geo).
+    """
+    _check_arguments(tolerance_km, metric)
+    return np.flatnonzero(_douglas_peucker(_track_ecef(points, frame), tolerance_km, metric))
+
+
+class StreamingSimplifier(object):
+    """
+    Simplifies a live track chunk by chunk, holding at most max_buffer unresolved points.
+
+    push returns the global indices of points that are final as retained; flush returns the rest at the end of the
+    track.  When the buffer fills, Douglas-Peucker runs on it and everything before its last interior retained point
+    is released.  If the whole buffer fits within tolerance, its last point is retained to bound memory, so the
+    result keeps the error bound but may hold a few more points than simplify on the whole track.
+    """
+
+    def __init__(self, tolerance_km: float, metric: str = "chord", frame=ECEF, max_buffer: int = DEFAULT_MAX_BUFFER):
+        _check_arguments(tolerance_km, metric)
+        if max_buffer < 3:
+            raise ValueError("max_buffer must be at least 3.  Got {}.".format(max_buffer))
+        self.tolerance_km = tolerance_km
+        self.metric = metric
+        self.frame = frame
+        self.max_buffer = max_buffer
+        self.count = 0
+        self._xyz_km = np.zeros((0, 3))
+        self._indices = np.zeros(0, dtype=np.int64)
+
+    def push(self, points) -> np.ndarray:
+        """
+        Adds the next points of the track.  Returns the ascending global indices newly known to be retained.
+        """
+        xyz_km = _track_ecef(points, self.frame)
+        indices = self.count + np.arange(len(xyz_km))
+        retained = [np.zeros(0, dtype=np.int64)]
+        if self.count == 0 and len(xyz_km):
+            retained.append(indices[:1])
+        self.count += len(xyz_km)
+        start = 0
+        while start < len(xyz_km):
+            take = min(self.max_buffer - len(self._indices), len(xyz_km) - start)
+            self._xyz_km = np.concatenate((self._xyz_km, xyz_km[start:start + take]))
+            self._indices = np.concatenate((self._indices, indices[start:start + take]))
+            start += take
+            if len(self._indices) == self.max_buffer:
+                retained.append(self._release())
+        return np.concatenate(retained)
+
+    def _release(self) -> np.ndarray:
+        kept = np.flatnonzero(_douglas_peucker(self._xyz_km, self.tolerance_km, self.metric))
+        anchor = kept[-2] if len(kept) > 2 else kept[-1]
+        released = self._indices[kept[1:]][kept[1:] <= anchor]
+        self._xyz_km, self._indices = self._xyz_km[anchor:], self._indices[anchor:]
+        return released
+
+    def flush(self) -> np.ndarray:
+        """
+        Ends the track.  Returns the remaining retained global indices and empties the buffer.
+        """
+        if len(self._indices) < 2:
+            retained = np.zeros(0, dtype=np.int64)
+        else:
+            kept = np.flatnonzero(_douglas_peucker(self._xyz_km, self.tolerance_km, self.metric))
+            retained = self._indices[kept[1:]]
+        self._xyz_km, self._indices = self._xyz_km[:0], self._indices[:0]
+        return retained
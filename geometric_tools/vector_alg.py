@@ -2,10 +2,27 @@
 Encodes the basic algebraic rules for vector algebra.
 """
 from __future__ import annotations
+from contextlib import contextmanager
+from contextvars import ContextVar
 from numbers import Number
 
 import numpy as np
 
+_deferred = ContextVar("deferred", default=False)
+DEFAULT_TOL = 1e-9
+
+
+@contextmanager
+def deferred():
+    """
+    Within the block, the Vector operators build VectorExpr trees instead of computing each intermediate vector.
+    """
+    token = _deferred.set(True)
+    try:
+        yield
+    finally:
+        _deferred.reset(token)
+
 
 class Vector(object):
 
@@ -15,6 +32,10 @@ class Vector(object):
             return
         self.array = np.array(args)
 
+    @classmethod
+    def _from_array(cls, array: np.ndarray) -> Vector:
+        return cls(array)
+
     def size(self) -> int:
         return self.array.size
 
@@ -24,21 +45,29 @@ class Vector(object):
     def __add__(self, other: Vector) -> Vector:
         if not isinstance(other, Vector):
             return NotImplemented
+        if _deferred.get():
+            return VectorExpr(self) + other
         return self.__class__(*list(self.array + other.array))
 
     def __sub__(self, other: Vector) -> Vector:
         if not isinstance(other, Vector):
             return NotImplemented
+        if _deferred.get():
+            return VectorExpr(self) - other
         return self.__class__(*list(self.array - other.array))
 
     def __mul__(self, other: Number) -> Vector:
         if not isinstance(other, Number):
             return NotImplemented
+        if _deferred.get():
+            return VectorExpr(self) * other
         return self.__class__(*(list(other * self.array)))
 
     def __rmul__(self, other: Number) -> Vector:
         if not isinstance(other, Number):
             raise TypeError("You can only use a scalar for rmul.")
+        if _deferred.get():
+            return VectorExpr(self) * other
         return self.__class__(*list(other * self.array))
 
     def __neg__(self) -> Vector:
@@ -59,6 +88,24 @@ class Vector(object):
             return NotImplemented
         return not self.__eq__(other)
 
+    def isclose(self, other: Vector, tol: Number = DEFAULT_TOL) -> bool:
+        """
+        True if the Euclidean distance between the vectors is at most tol.
+        """
+        other = evaluate(other)
+        if not isinstance(other, Vector):
+            raise TypeError("Can only compare a Vector with another Vector.")
+        if not self._size_eq(other):
+            return False
+        return bool(np.linalg.norm(self.array - other.array) <= tol)
+
+    def quantized_key(self, tol: Number = DEFAULT_TOL) -> tuple:
+        """
+        Hashable key of the tol sized grid cell holding the vector.  Equal keys do not imply close vectors, and close
+        vectors may fall in neighbouring cells, so the key is for bucketing candidates rather than for equality.
+        """
+        return tuple(np.floor(self.array / tol).astype(np.int64).tolist())
+
     def __str__(self) -> str:
         return "(" + ", ".join([str(x) for x in self.array]) + ")"
 
@@ -76,9 +123,165 @@ class Vector(object):
         mag = self.mag()
         if mag == 0:
             raise ValueError("The 0 vector does not have a unit.")
-        return self / mag
+        return evaluate(self / mag)
 
 
 def dot(vec_1: type[Vector], vec_2: type[Vector]) -> Number:
     """ Short for dot/inner product of two vectors. """
     return (vec_1.array * vec_2.array).sum()
+
+
+class VectorExpr(object):
+    """
+    Deferred linear combination of vectors built by the Vector operators inside deferred().
+    Nodes are leaves (a Vector), sums of two nodes or a node scaled by a number.  The tree is evaluated in one pass
+    that accumulates every leaf into a single output array, reusing one temporary, the first time a value is needed.
+    """
+    # Makes numpy scalars and arrays defer to the reflected operators instead of converting the tree via __array__.
+    __array_ufunc__ = None
+
+    def __init__(self, operand, kind: str = "leaf", other=None):
+        self._operand = operand
+        self._kind = kind
+        self._other = other
+        self._value = None
+        self._cls = operand.__class__ if kind == "leaf" else operand._cls
+
+    @staticmethod
+    def _node(value) -> VectorExpr:
+        return value if isinstance(value, VectorExpr) else VectorExpr(value)
+
+    def __add__(self, other) -> VectorExpr:
+        if not isinstance(other, (Vector, VectorExpr)):
+            return NotImplemented
+        return VectorExpr(self, "add", self._node(other))
+
+    def __radd__(self, other) -> VectorExpr:
+        if not isinstance(other, Vector):
+            return NotImplemented
+        return VectorExpr(VectorExpr(other), "add", self)
+
+    def __sub__(self, other) -> VectorExpr:
+        if not isinstance(other, (Vector, VectorExpr)):
+            return NotImplemented
+        return VectorExpr(self, "add", VectorExpr(self._node(other), "scale", -1))
+
+    def __rsub__(self, other) -> VectorExpr:
+        if not isinstance(other, Vector):
+            return NotImplemented
+        return VectorExpr(VectorExpr(other), "add", VectorExpr(self, "scale", -1))
+
+    def __mul__(self, other: Number) -> VectorExpr:
+        if not isinstance(other, Number):
+            return NotImplemented
+        return VectorExpr(self, "scale", other)
+
+    def __rmul__(self, other: Number) -> VectorExpr:
+        if not isinstance(other, Number):
+            raise TypeError("You can only use a scalar for rmul.")
+        return VectorExpr(self, "scale", other)
+
+    def __neg__(self) -> VectorExpr:
+        return VectorExpr(self, "scale", -1)
+
+    def __truediv__(self, other: Number) -> VectorExpr:
+        return VectorExpr(self, "scale", 1. / other)
+
+    def _terms(self) -> list:
+        """
+        Flattens the tree into [coefficient, array] pairs, merging repeated leaves.
+        """
+        terms = {}
+        stack = [(self, 1)]
+        while stack:
+            node, coefficient = stack.pop()
+            if node._value is not None:
+                node, kind = node._value, "leaf"
+            else:
+                kind = node._kind
+            if kind == "leaf":
+                vector = node if isinstance(node, Vector) else node._operand
+                key = id(vector.array)
+                if key in terms:
+                    terms[key][0] += coefficient
+                else:
+                    terms[key] = [coefficient, vector.array]
+            elif kind == "scale":
+                stack.append((node._operand, coefficient * node._other))
+            else:
+                stack.append((node._other, coefficient))
+                stack.append((node._operand, coefficient))
+        return list(terms.values())
+
+    def evaluate(self) -> Vector:
+        if self._value is not None:
+            return self._value
+        terms = self._terms()
+        shape = np.broadcast_shapes(*[array.shape for _, array in terms])
+        out = np.empty(shape, dtype=np.result_type(*[array for _, array in terms], *[c for c, _ in terms]))
+        temp = None
+        for i, (coefficient, array) in enumerate(terms):
+            if i == 0:
+                np.multiply(array, coefficient, out=out)
+            elif coefficient == 1:
+                np.add(out, array, out=out)
+            elif coefficient == -1:
+                np.subtract(out, array, out=out)
+            else:
+                if temp is None:
+                    temp = np.empty_like(out)
+                np.multiply(array, coefficient, out=temp)
+                np.add(out, temp, out=out)
+        self._value = self._cls._from_array(out)
+        return self._value
+
+    @property
+    def array(self) -> np.ndarray:
+        return self.evaluate().array
+
+    def __array__(self, dtype=None, copy=None) -> np.ndarray:
+        return np.asarray(self.array, dtype=dtype)
+
+    def __getitem__(self, index: int) -> Number:
+        return self.evaluate()[index]
+
+    def __getattr__(self, name: str):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self.evaluate(), name)
+
+    def __setattr__(self, name: str, value):
+        # Setting a component on the expression would silently diverge from its evaluated value.
+        if not name.startswith("_"):
+            raise AttributeError("A VectorExpr is read-only; evaluate() it before setting {}.".format(name))
+        object.__setattr__(self, name, value)
+
+    def __delattr__(self, name: str):
+        raise AttributeError("A VectorExpr is read-only; cannot delete {}.".format(name))
+
+    def __setitem__(self, index: int, value: Number):
+        raise TypeError("A VectorExpr is read-only; evaluate() it before setting item {}.".format(index))
+
+    def __eq__(self, other) -> bool:
+        return self.evaluate() == evaluate(other)
+
+    def __neq__(self, other) -> bool:
+        return not self.__eq__(other)
+
+    def __str__(self) -> str:
+        return str(self.evaluate())
+
+    def size(self) -> int:
+        return self.evaluate().size()
+
+    def mag(self) -> Number:
+        return self.evaluate().mag()
+
+
+def evaluate(value):
+    """
+    Returns the Vector of a deferred VectorExpr and any other value unchanged.
+    """
+    if isinstance(value, VectorExpr):
+        return value.evaluate()
+    return value
@@ -0,0 +1,220 @@
+# Built-in modules
+import asyncio
+import os
+import sys
+import unittest
+
+# 3rd party
+import numpy as np
+
+# This next bit makes sure the resources are available without needing to install.
+this_dir = os.path.abspath(os.path.dirname(__file__))
+python_dir = os.path.dirname(this_dir)
+module_dir = os.path.join(python_dir, "geometric_tools")
+if module_dir not in sys.path:
+    sys.path.append(module_dir)
+
+# Custom modules
+from async_batching import AsyncLocationService, BatchCoalescer
+from locations import ECEF, SphCoords, Geo
+from quaternion import quaternion_rotation
+from vector_3d import Vector3D
+
+
+async def _load(submit, requests, concurrency: int):
+    """
+    Local load generator: runs the requests from at most concurrency coroutines at a time.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(request):
+        async with semaphore:
+            return await submit(*request)
+
+    return await asyncio.gather(*[one(request) for request in requests])
+
+
+class BatchCoalescerTests(unittest.TestCase):
+
+    def testInitializationErrors(self):
+        for kwargs in [{"max_batch_size": 0}, {"max_pending": 0}, {"max_latency_s": -1}]:
+            with self.subTest(**kwargs):
+                with self.assertRaises(ValueError):
+                    BatchCoalescer(np.square, **kwargs)
+
+    def testCoalescesRequests(self):
+        calls = []
+
+        def batch_func(rows):
+            calls.append(len(rows))
+            return rows.sum(axis=1)
+
+        async def run():
+            async with BatchCoalescer(batch_func, max_batch_size=64, max_latency_s=0.01) as coalescer:
+                results = await _load(coalescer.submit, [((i, 2 * i),) for i in range(500)], 500)
+            return coalescer, results
+
+        coalescer, results = asyncio.run(run())
+        self.assertEqual(list(results), [3 * i for i in range(500)])
+        self.assertEqual(sum(calls), 500)
+        self.assertLessEqual(max(calls), 64)
+        self.assertLess(len(calls), 500)
+        self.assertEqual(coalescer.metrics.requests, 500)
+        self.assertEqual(coalescer.metrics.batches, len(calls))
+        self.assertEqual(coalescer.metrics.largest_batch, max(calls))
+        self.assertGreater(coalescer.metrics.throughput(), 0)
+        self.assertGreaterEqual(coalescer.metrics.max_latency_s, coalescer.metrics.mean_latency_s())
+
+    def testBackpressure(self):
+        async def run():
+            coalescer = BatchCoalescer(lambda rows: rows, max_batch_size=1, max_pending=2)
+            tasks = [asyncio.create_task(coalescer.submit((i,))) for i in range(5)]
+            # One pass of the event loop: every submitter has run, but the worker has not taken anything yet.
+            await asyncio.sleep(0)
+            full = coalescer.pending()
+            waiting = sum(not task.done() for task in tasks)
+            results = await asyncio.gather(*tasks)
+            await coalescer.close()
+            return full, waiting, results
+
+        full, waiting, results = asyncio.run(run())
+        # Two requests are queued and the other three submitters are blocked waiting for room.
+        self.assertEqual(full, 2)
+        self.assertEqual(waiting, 5)
+        self.assertEqual([float(result[0]) for result in results], list(range(5)))
+
+    def testCloseWhileBackpressured(self):
+        async def run():
+            coalescer = BatchCoalescer(lambda rows: rows, max_batch_size=4, max_pending=2)
+            tasks = [asyncio.create_task(coalescer.submit((i,))) for i in range(20)]
+            await asyncio.sleep(0)
+            await asyncio.wait_for(coalescer.close(), 1.)
+            results = await asyncio.wait_for(asyncio.gather(*tasks, return_exceptions=True), 1.)
+            return coalescer, results
+
+        coalescer, results = asyncio.run(run())
+        served = [float(result[0]) for result in results if not isinstance(result, Exception)]
+        refused = [result for result in results if isinstance(result, Exception)]
+        self.assertEqual(len(served) + len(refused), 20)
+        self.assertEqual(served, list(range(len(served))))
+        self.assertTrue(refused and all(isinstance(result, RuntimeError) for result in refused))
+        self.assertEqual(coalescer.pending(), 0)
+
+    def testMalformedRowFailsOnlyItsCaller(self):
+        async def run():
+            async with BatchCoalescer(lambda rows: rows.sum(axis=1), max_latency_s=0.01) as coalescer:
+                return await asyncio.gather(coalescer.submit((2.,)), coalescer.submit((1., 2.)),
+                                            coalescer.submit([[3.]]), coalescer.submit((4.,)),
+                                            return_exceptions=True)
+
+        results = asyncio.run(run())
+        self.assertEqual([float(results[0]), float(results[3])], [2., 4.])
+        self.assertIsInstance(results[1], ValueError)
+        self.assertIsInstance(results[2], ValueError)
+        with self.assertRaises(ValueError):
+            BatchCoalescer(np.square, row_width=0)
+
+    def testMalformedResultsReachEveryCaller(self):
+        for batch_func in [lambda rows: rows[:1], lambda rows: 0.]:
+            async def run():
+                async with BatchCoalescer(batch_func, max_latency_s=0.01) as coalescer:
+                    results = await asyncio.wait_for(asyncio.gather(*[coalescer.submit((i,)) for i in range(5)],
+                                                                    return_exceptions=True), 1.)
+                    # The worker survives and serves later requests.
+                    coalescer.batch_func = lambda rows: rows
+                    return results, await asyncio.wait_for(coalescer.submit((7,)), 1.)
+
+            with self.subTest(batch_func=batch_func):
+                results, later = asyncio.run(run())
+                self.assertTrue(all(isinstance(result, (ValueError, TypeError)) for result in results))
+                self.assertEqual(float(later[0]), 7.)
+
+    def testWorkerExitFailsLeftovers(self):
+        async def run():
+            coalescer = BatchCoalescer(lambda rows: rows, max_latency_s=10.)
+            task = asyncio.create_task(coalescer.submit((1,)))
+            await asyncio.sleep(0.01)
+            coalescer._worker.cancel()
+            result = await asyncio.gather(task, return_exceptions=True)
+            await asyncio.wait_for(coalescer.close(), 1.)
+            return result[0]
+
+        self.assertIsInstance(asyncio.run(run()), RuntimeError)
+
+    def testBatchErrorsReachEveryCaller(self):
+        def batch_func(rows):
+            raise ArithmeticError("bad batch")
+
+        async def run():
+            async with BatchCoalescer(batch_func, max_latency_s=0.01) as coalescer:
+                return await asyncio.gather(*[coalescer.submit((i,)) for i in range(5)], return_exceptions=True)
+
+        results = asyncio.run(run())
+        self.assertTrue(all(isinstance(result, ArithmeticError) for result in results))
+
+    def testSubmitAfterClose(self):
+        async def run():
+            coalescer = BatchCoalescer(np.square)
+            await coalescer.close()
+            await coalescer.submit((1,))
+
+        with self.assertRaises(RuntimeError):
+            asyncio.run(run())
+
+
+class AsyncLocationServiceTests(unittest.TestCase):
+    _fudge = 1e-6
+
+    def testConversionsMatchScalar(self):
+        rng = np.random.default_rng(0)
+        geos = [Geo(*row) for row in np.column_stack((rng.uniform(-80, 80, 50), rng.uniform(-80, 80, 50),
+                                                       rng.uniform(0, 1000, 50)))]
+        sphs = [geo.sph_coords() for geo in geos]
+        ecefs = [geo.ecef() for geo in geos]
+
+        async def run():
+            async with AsyncLocationService(max_latency_s=0.005) as service:
+                results = await asyncio.gather(_load(service.ecef, [(geo,) for geo in geos], 50),
+                                               _load(service.ecef, [(sph,) for sph in sphs], 50),
+                                               _load(service.geo, [(ecef,) for ecef in ecefs], 50),
+                                               _load(service.geo, [(sph,) for sph in sphs], 50))
+                self.assertIs(await service.ecef(ecefs[0]), ecefs[0])
+                self.assertIs(await service.geo(geos[0]), geos[0])
+            return service, results
+
+        service, (from_geo, from_sph, geo_from_ecef, geo_from_sph) = asyncio.run(run())
+        for i, geo in enumerate(geos):
+            with self.subTest(geo=str(geo)):
+                self.assertIsInstance(from_geo[i], ECEF)
+                self.assertTrue((from_geo[i] - ecefs[i]).mag() < self._fudge)
+                self.assertTrue((from_sph[i] - ecefs[i]).mag() < self._fudge)
+                self.assertIsInstance(geo_from_ecef[i], Geo)
+                self.assertTrue((geo_from_ecef[i] - geo).mag() < self._fudge)
+                self.assertTrue((geo_from_sph[i] - geo).mag() < self._fudge)
+        self.assertLess(service.coalescers["geo_to_ecef"].metrics.batches, 50)
+
+    def testRotateMatchesScalar(self):
+        rng = np.random.default_rng(1)
+        requests = [(rng.uniform(0, 2 * np.pi), Vector3D(*rng.normal(size=3)), Vector3D(*rng.normal(size=3)))
+                    for _ in range(100)]
+
+        async def run():
+            async with AsyncLocationService(max_batch_size=16) as service:
+                return await _load(service.rotate, requests, 100)
+
+        rotated = asyncio.run(run())
+        for request, rot_vec in zip(requests, rotated):
+            with self.subTest(vec=str(request[2])):
+                self.assertTrue((rot_vec - quaternion_rotation(*request)).mag() < self._fudge)
+
+    def testIncorrectArguments(self):
+        async def run(coroutine):
+            async with AsyncLocationService() as service:
+                await coroutine(service)
+
+        with self.assertRaises(TypeError):
+            asyncio.run(run(lambda service: service.ecef(Vector3D(1, 2, 3))))
+        with self.assertRaises(TypeError):
+            asyncio.run(run(lambda service: service.geo(1)))
+        with self.assertRaises(ValueError):
+            asyncio.run(run(lambda service: service.rotate(1., Vector3D(0, 0, 0), Vector3D(1, 0, 0))))
@@ -0,0 +1,81 @@
+# Built-in modules
+import os
+import sys
+import unittest
+
+# 3rd party
+import numpy as np
+
+# This next bit makes sure the resources are available without needing to install.
+this_dir = os.path.abspath(os.path.dirname(__file__))
+python_dir = os.path.dirname(this_dir)
+module_dir = os.path.join(python_dir, "geometric_tools")
+if module_dir not in sys.path:
+    sys.path.append(module_dir)
+
+# Custom modules
+from attitude import rate_increments, cumulative_products, propagate_attitude
+from quaternion import Quaternion
+from vector_3d import Vector3D
+
+
+class AttitudeTests(unittest.TestCase):
+    _fudge = 1e-9
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.rates = rng.normal(scale=0.1, size=(500, 3))
+        self.dt = rng.uniform(0.005, 0.015, 500)
+        self.q_start = Quaternion.from_rotation_about_axis(0.3, Vector3D(1, 2, 3))
+
+    def _loop(self):
+        """
+        The scalar reference: one from_rotation_about_axis and one product per step.
+        """
+        q = self.q_start
+        history = [q.array]
+        for rate, dt in zip(self.rates, self.dt):
+            rate_vec = Vector3D(*rate)
+            q = Quaternion.from_rotation_about_axis(rate_vec.mag() * dt, rate_vec) * q
+            history.append(q.array)
+        return np.array(history)
+
+    def testRateIncrements(self):
+        increments = rate_increments([[0, 0, 2], [0, 0, 0]], 0.5)
+        exp_increment = Quaternion.from_rotation_about_axis(1., Vector3D(0, 0, 1)).array
+        self.assertTrue(np.all(np.abs(increments[0] - exp_increment) < self._fudge))
+        self.assertTrue(np.all(increments[1] == [1, 0, 0, 0]))
+
+    def testCumulativeProducts(self):
+        increments = rate_increments(self.rates[:13], self.dt[:13])
+        products = cumulative_products(increments)
+        q = Quaternion(1, 0, 0, 0)
+        for increment, product in zip(increments, products):
+            q = Quaternion(*increment) * q
+            with self.subTest(product=str(product)):
+                self.assertTrue(np.all(np.abs(product - q.array) < self._fudge))
+
+    def testMatchesScalarLoop(self):
+        exp_history = self._loop()
+        for block_size in [1, 7, 64, 10000]:
+            with self.subTest(block_size=block_size):
+                history = propagate_attitude(self.q_start, self.rates, self.dt, block_size)
+                self.assertEqual(history.shape, (501, 4))
+                self.assertTrue(np.all(np.abs(history - exp_history) < self._fudge))
+
+    def testConstantRate(self):
+        history = propagate_attitude(Quaternion(1, 0, 0, 0), np.tile([0, 0, 0.1], (1000, 1)), 0.01, block_size=128)
+        exp_q = Quaternion.from_rotation_about_axis(1., Vector3D(0, 0, 1))
+        self.assertTrue(np.all(np.abs(history[-1] - exp_q.array) < self._fudge))
+        rotated = Quaternion(*history[-1]).rotate(Vector3D(1, 0, 0))
+        self.assertTrue((rotated - Vector3D(np.cos(1.), np.sin(1.), 0)).mag() < self._fudge)
+
+    def testStaysNormalized(self):
+        history = propagate_attitude(self.q_start, np.tile(self.rates, (20, 1)), 0.01, block_size=256)
+        self.assertTrue(np.all(np.abs(np.linalg.norm(history, axis=1) - 1) < self._fudge))
+
+    def testIncorrectArguments(self):
+        with self.assertRaises(TypeError):
+            propagate_attitude(Vector3D(1, 0, 0), self.rates, 0.01)
+        with self.assertRaises(ValueError):
+            propagate_attitude(self.q_start, self.rates, 0.01, block_size=0)
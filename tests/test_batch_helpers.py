@@ -0,0 +1,51 @@
+# Built-in modules
+import os
+import sys
+import unittest
+
+# 3rd party
+import numpy as np
+
+# This next bit makes sure the resources are available without needing to install.
+this_dir = os.path.abspath(os.path.dirname(__file__))
+python_dir = os.path.dirname(this_dir)
+module_dir = os.path.join(python_dir, "geometric_tools")
+if module_dir not in sys.path:
+    sys.path.append(module_dir)
+
+# Custom modules
+from batch_helpers import as_triples, pair_chunks, vector_rows
+from vector_3d import Vector3D
+from vector_alg import Vector
+
+
+class BatchHelpersTests(unittest.TestCase):
+
+    def testAsTriples(self):
+        self.assertEqual(as_triples([1, 2, 3]).shape, (3,))
+        self.assertEqual(as_triples(np.zeros((4, 5, 3))).shape, (4, 5, 3))
+        for values in [1., [1, 2], np.zeros((3, 2))]:
+            with self.subTest(values=str(values)):
+                with self.assertRaises(ValueError):
+                    as_triples(values)
+
+    def testVectorRows(self):
+        exp = np.array([[1., 2., 3.], [4., 5., 6.]])
+        for vectors in [exp, exp.tolist(), [Vector3D(1, 2, 3), Vector3D(4, 5, 6)]]:
+            with self.subTest(vectors=str(vectors)):
+                self.assertTrue(np.all(vector_rows(vectors) == exp))
+        self.assertTrue(np.all(vector_rows(Vector3D(1, 2, 3)) == exp[:1]))
+        for vectors in [[Vector(1., 2.), Vector(3., 4.), Vector(5., 6.)], [Vector3D(1, 2, 3), 4.]]:
+            with self.subTest(vectors=str(vectors)):
+                with self.assertRaises(ValueError):
+                    vector_rows(vectors)
+
+    def testPairChunks(self):
+        for n_rows, n_columns, max_pairs in [(10, 7, 20), (10, 7, 3), (10, 0, 5), (0, 7, 5)]:
+            with self.subTest(n_rows=n_rows, n_columns=n_columns, max_pairs=max_pairs):
+                chunks = list(pair_chunks(n_rows, n_columns, max_pairs))
+                self.assertEqual([k for chunk in chunks for k in range(n_rows)[chunk]], list(range(n_rows)))
+                self.assertTrue(all((chunk.stop - chunk.start) * n_columns <= max(max_pairs, n_columns)
+                                    for chunk in chunks))
+        with self.assertRaises(ValueError):
+            list(pair_chunks(10, 7, 0))
@@ -0,0 +1,135 @@
+# Built-in modules
+import os
+import sys
+import unittest
+
+# 3rd party
+import numpy as np
+
+# This next bit makes sure the resources are available without needing to install.
+this_dir = os.path.abspath(os.path.dirname(__file__))
+python_dir = os.path.dirname(this_dir)
+module_dir = os.path.join(python_dir, "geometric_tools")
+if module_dir not in sys.path:
+    sys.path.append(module_dir)
+
+# Custom modules
+from cell_ids import (MAX_LEVEL, geo_cell_ids, sph_coords_cell_ids, cell_levels, cell_bounds, cell_centers, parents,
+                      children, descendant_range, neighbours, cover_box, cover_cap)
+from geofence import SphericalCap
+from locations import Geo, geo_to_sph_coords
+
+
+class CellIdTests(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.points = np.column_stack((rng.uniform(-90, 90, 1000), rng.uniform(-180, 180, 1000), np.zeros(1000)))
+
+    def testLevelZero(self):
+        ids = geo_cell_ids(self.points, 0)
+        self.assertTrue(np.all(ids == 1 << (2 * MAX_LEVEL)))
+        self.assertTrue(np.all(cell_levels(ids) == 0))
+
+    def testCellsContainTheirPoints(self):
+        for level in [1, 5, 17, MAX_LEVEL]:
+            with self.subTest(level=level):
+                ids = geo_cell_ids(self.points, level)
+                self.assertTrue(np.all(ids > 0))
+                self.assertTrue(np.all(cell_levels(ids) == level))
+                bounds = cell_bounds(ids)
+                self.assertTrue(np.all((bounds[:, 0] <= self.points[:, 0]) & (self.points[:, 0] <= bounds[:, 1])))
+                self.assertTrue(np.all((bounds[:, 2] <= self.points[:, 1]) & (self.points[:, 1] <= bounds[:, 3])))
+
+    def testGeoAndSphCoordsAgree(self):
+        geo_ids = geo_cell_ids([Geo(10, 20, 0), Geo(-45, -80, 3)], 12)
+        self.assertTrue(np.all(geo_ids == geo_cell_ids(np.array([[10, 20, 0], [-45, -80, 3]]), 12)))
+        self.assertTrue(np.all(sph_coords_cell_ids(geo_to_sph_coords(self.points), 12)
+                               == geo_cell_ids(self.points, 12)))
+        with self.assertRaises(TypeError):
+            sph_coords_cell_ids([Geo(1, 2, 3)], 3)
+        with self.assertRaises(ValueError):
+            geo_cell_ids(self.points, MAX_LEVEL + 1)
+
+    def testCenters(self):
+        ids = geo_cell_ids(np.array([[0.1, 0.1, 0], [-89.9, 179.9, 0]]), 1)
+        self.assertTrue(np.all(cell_centers(ids) == [[45, 90, 0], [-45, 90, 0]]))
+
+    def testParentsMatchCoarserEncoding(self):
+        fine = geo_cell_ids(self.points, 20)
+        self.assertTrue(np.all(parents(fine) == geo_cell_ids(self.points, 19)))
+        self.assertTrue(np.all(parents(fine, 7) == geo_cell_ids(self.points, 7)))
+        with self.assertRaises(ValueError):
+            parents(geo_cell_ids(self.points, 0))
+        with self.assertRaises(ValueError):
+            parents(fine, 21)
+
+    def testChildren(self):
+        ids = geo_cell_ids(self.points[:50], 9)
+        kids = children(ids)
+        self.assertEqual(kids.shape, (50, 4))
+        self.assertTrue(np.all(parents(kids.ravel()) == np.repeat(ids, 4)))
+        self.assertTrue(np.all(np.diff(kids, axis=1) > 0))
+        self.assertTrue(np.any(kids == geo_cell_ids(self.points[:50], 10)[:, None], axis=1).all())
+        with self.assertRaises(ValueError):
+            children(geo_cell_ids(self.points[:1], MAX_LEVEL))
+
+    def testDescendantRangeAndSorting(self):
+        coarse = geo_cell_ids(self.points, 6)
+        fine = geo_cell_ids(self.points, 25)
+        lower, upper = descendant_range(coarse)
+        self.assertTrue(np.all((lower <= fine) & (fine <= upper)))
+        self.assertTrue(np.all((lower <= coarse) & (coarse <= upper)))
+        order = np.argsort(fine)
+        self.assertTrue(np.all(np.diff(parents(fine[order], 6)) >= 0))
+
+    def testNeighbours(self):
+        level = 3
+        ids = geo_cell_ids(np.array([[1, 1, 0], [89, 179, 0]]), level)
+        found = neighbours(ids)
+        self.assertTrue(np.all(found[0] > 0))
+        self.assertEqual(len(set(found[0])), 8)
+        center = cell_centers(ids[:1])[0]
+        size = np.array([180, 360]) / 2 ** level
+        for offset in [(1, 0), (0, -1), (-1, 1)]:
+            neighbour = geo_cell_ids(np.array([[*(center[:2] + size * offset), 0]]), level)[0]
+            with self.subTest(offset=offset):
+                self.assertIn(neighbour, found[0])
+        self.assertEqual(np.sum(found[1] == -1), 3)
+        wrapped = geo_cell_ids(np.array([[80, -179, 0]]), level)[0]
+        self.assertIn(wrapped, found[1])
+
+
+class CoveringTests(unittest.TestCase):
+
+    def testCoverBox(self):
+        ids = cover_box(-10, 10, -20, 20, 4)
+        self.assertEqual(len(ids), 2 * 2)
+        self.assertTrue(np.all(np.diff(ids) > 0))
+        self.assertEqual(len(cover_box(-90, 90, -180, 180, 3)), 64)
+        date_line = cover_box(0, 1, 170, -170, 5)
+        bounds = cell_bounds(date_line)
+        self.assertTrue(np.all((bounds[:, 2] >= 168.75) | (bounds[:, 3] <= -168.75)))
+        with self.assertRaises(ValueError):
+            cover_box(10, -10, 0, 1, 3)
+
+    def testCoverBoxContainsPoints(self):
+        rng = np.random.default_rng(1)
+        longitudes = (rng.uniform(100, 200, 500) + 180) % 360 - 180
+        points = np.column_stack((rng.uniform(-30, 40, 500), longitudes, np.zeros(500)))
+        covering = cover_box(-30, 40, 100, -160, 8)
+        self.assertTrue(np.all(np.isin(geo_cell_ids(points, 8), covering)))
+
+    def testCoverCap(self):
+        rng = np.random.default_rng(2)
+        points = np.column_stack((rng.uniform(-90, 90, 20000), rng.uniform(-180, 180, 20000), np.zeros(20000)))
+        for cap in [SphericalCap(Geo(40, -70, 0), 800), SphericalCap(Geo(85, 10, 0), 1000),
+                    SphericalCap(Geo(0, 0, 0), 30000)]:
+            with self.subTest(center=str(cap.center)):
+                covering = cover_cap(cap, 7)
+                inside = cap.contains(points)
+                self.assertTrue(inside.any())
+                self.assertTrue(np.all(np.isin(geo_cell_ids(points[inside], 7), covering)))
+        self.assertLess(len(cover_cap(SphericalCap(Geo(40, -70, 0), 800), 7)), 200)
+        with self.assertRaises(TypeError):
+            cover_cap(Geo(0, 0, 0), 3)
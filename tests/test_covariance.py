@@ -0,0 +1,112 @@
+# Built-in modules
+import os
+import sys
+import unittest
+
+# 3rd party
+import numpy as np
+
+# This next bit makes sure the resources are available without needing to install.
+this_dir = os.path.abspath(os.path.dirname(__file__))
+python_dir = os.path.dirname(this_dir)
+module_dir = os.path.join(python_dir, "geometric_tools")
+if module_dir not in sys.path:
+    sys.path.append(module_dir)
+
+# Custom modules
+from covariance import (jacobian_sph_coords_to_ecef, jacobian_ecef_to_sph_coords, jacobian_sph_coords_to_geo,
+                        jacobian_geo_to_sph_coords, jacobian_geo_to_ecef, jacobian_ecef_to_geo,
+                        propagate_covariance, convert_covariance, rotate_covariance)
+from locations import (ECEF, SphCoords, Geo, ecef_to_sph_coords, sph_coords_to_ecef, sph_coords_to_geo,
+                       geo_to_sph_coords, geo_to_ecef, ecef_to_geo)
+from quaternion import Quaternion, quaternion_rotations
+from vector_3d import Vector3D
+
+
+def _finite_difference(func, points: np.ndarray, step: float = 1e-6) -> np.ndarray:
+    jacobians = np.empty(points.shape + (3,))
+    for i in range(3):
+        offset = np.zeros(3)
+        offset[i] = step
+        jacobians[..., i] = (func(points + offset) - func(points - offset)) / (2 * step)
+    return jacobians
+
+
+class JacobianTests(unittest.TestCase):
+    _fudge = 1e-5
+
+    def setUp(self):
+        self.lat_lon_alt = np.array([[10, 20, 0], [-45, -80, 500], [60, 135, 20200], [1, 1, 1]])
+        self.xyz = geo_to_ecef(self.lat_lon_alt)
+        self.r_theta_phi = geo_to_sph_coords(self.lat_lon_alt)
+
+    def testAgainstFiniteDifferences(self):
+        cases = [(jacobian_sph_coords_to_ecef, sph_coords_to_ecef, self.r_theta_phi),
+                 (jacobian_ecef_to_sph_coords, ecef_to_sph_coords, self.xyz),
+                 (jacobian_sph_coords_to_geo, sph_coords_to_geo, self.r_theta_phi),
+                 (jacobian_geo_to_sph_coords, geo_to_sph_coords, self.lat_lon_alt),
+                 (jacobian_geo_to_ecef, geo_to_ecef, self.lat_lon_alt),
+                 (jacobian_ecef_to_geo, ecef_to_geo, self.xyz)]
+        for jacobian, convert, points in cases:
+            with self.subTest(jacobian=jacobian.__name__):
+                analytic = jacobian(points)
+                numeric = _finite_difference(convert, points)
+                self.assertEqual(analytic.shape, (len(points), 3, 3))
+                self.assertTrue(np.all(np.abs(analytic - numeric) < self._fudge * (1 + np.abs(numeric))))
+
+    def testInverses(self):
+        products = [jacobian_ecef_to_sph_coords(self.xyz) @ jacobian_sph_coords_to_ecef(self.r_theta_phi),
+                    jacobian_ecef_to_geo(self.xyz) @ jacobian_geo_to_ecef(self.lat_lon_alt)]
+        for product in products:
+            self.assertTrue(np.allclose(product, np.eye(3)))
+
+    def testPole(self):
+        jacobian = jacobian_ecef_to_sph_coords(np.array([[0, 0, 1.]]))
+        self.assertTrue(np.all(jacobian[0, 0] == [0, 0, 1]))
+        self.assertTrue(np.all(np.isnan(jacobian[0, 2, :2])))
+
+
+class CovarianceTests(unittest.TestCase):
+    _fudge = 1e-6
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        factors = rng.normal(size=(4, 3, 3))
+        self.covariances = factors @ np.swapaxes(factors, -1, -2)
+        self.lat_lon_alt = np.array([[10, 20, 0], [-45, -80, 500], [60, 135, 20200], [1, 1, 1]])
+
+    def testPropagateCovariance(self):
+        jacobians = np.random.default_rng(1).normal(size=(4, 3, 3))
+        propagated = propagate_covariance(jacobians, self.covariances)
+        for jacobian, covariance, result in zip(jacobians, self.covariances, propagated):
+            self.assertTrue(np.allclose(result, jacobian @ covariance @ jacobian.T))
+        self.assertEqual(propagate_covariance(np.eye(3), self.covariances).shape, (4, 3, 3))
+
+    def testConvertRoundTrip(self):
+        xyz, ecef_cov = convert_covariance(self.lat_lon_alt, self.covariances, Geo, ECEF)
+        sph, sph_cov = convert_covariance(xyz, ecef_cov, ECEF, SphCoords)
+        lat_lon_alt, geo_cov = convert_covariance(sph, sph_cov, SphCoords, Geo)
+        self.assertTrue(np.allclose(lat_lon_alt, self.lat_lon_alt))
+        self.assertTrue(np.allclose(geo_cov, self.covariances))
+        self.assertTrue(np.all(np.linalg.eigvalsh(ecef_cov) > 0))
+
+    def testConvertErrors(self):
+        means, covariances = convert_covariance(self.lat_lon_alt, self.covariances, Geo, Geo)
+        self.assertTrue(np.all(means == self.lat_lon_alt))
+        self.assertTrue(np.all(covariances == self.covariances))
+        with self.assertRaises(TypeError):
+            convert_covariance(self.lat_lon_alt, self.covariances, Geo, Vector3D)
+
+    def testRotateCovariance(self):
+        q = Quaternion.from_rotation_about_axis(np.pi / 2, Vector3D(0, 0, 1))
+        covariance = np.diag([1., 4., 9.])
+        self.assertTrue(np.allclose(rotate_covariance(q, covariance), np.diag([4., 1., 9.])))
+        rng = np.random.default_rng(2)
+        rot_angles, axes = rng.uniform(0, np.pi, 4), rng.normal(size=(4, 3))
+        rotated = rotate_covariance(rot_angles, self.covariances, axes)
+        numeric = _finite_difference(lambda vecs: quaternion_rotations(rot_angles, axes, vecs), np.zeros((4, 3)))
+        self.assertTrue(np.allclose(rotated, propagate_covariance(numeric, self.covariances), atol=self._fudge))
+        with self.assertRaises(ValueError):
+            rotate_covariance(rot_angles, self.covariances)
+        with self.assertRaises(ValueError):
+            rotate_covariance(q, self.covariances, axes)
@@ -0,0 +1,99 @@
+# Built-in modules
+import os
+import sys
+import unittest
+
+# 3rd party
+import numpy as np
+
+# This next bit makes sure the resources are available without needing to install.
+this_dir = os.path.abspath(os.path.dirname(__file__))
+python_dir = os.path.dirname(this_dir)
+module_dir = os.path.join(python_dir, "geometric_tools")
+if module_dir not in sys.path:
+    sys.path.append(module_dir)
+
+# Custom modules
+from cpa import relative_cpa, closest_approach, conflicts
+from locations import ECEF
+from vector_3d import Vector3D
+from vector_alg import Vector, dot
+
+
+class ClosestApproachTests(unittest.TestCase):
+    _fudge = 1e-9
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.p_1 = rng.uniform(-500, 500, (40, 3))
+        self.v_1 = rng.normal(scale=0.3, size=(40, 3))
+        self.p_2 = rng.uniform(-500, 500, (70, 3))
+        self.v_2 = rng.normal(scale=0.3, size=(70, 3))
+
+    def testHeadOn(self):
+        t, d = relative_cpa([100., 5., 0.], [-2., 0., 0.], 600.)
+        self.assertTrue(abs(t - 50.) < self._fudge)
+        self.assertTrue(abs(d - 5.) < self._fudge)
+
+    def testWindowClipping(self):
+        t, d = relative_cpa([[100., 0, 0], [100., 0, 0], [100., 0, 0]], [[1., 0, 0], [-1., 0, 0], [0, 0, 0]], 30.)
+        self.assertTrue(np.all(t == [0., 30., 0.]))
+        self.assertTrue(np.all(np.abs(d - [100., 70., 100.]) < self._fudge))
+
+    def testMatchesScalarLoop(self):
+        positions_1 = [ECEF(*p) for p in self.p_1[:5]]
+        velocities_1 = [Vector3D(*v) for v in self.v_1[:5]]
+        positions_2 = [ECEF(*p) for p in self.p_2[:6]]
+        velocities_2 = [Vector3D(*v) for v in self.v_2[:6]]
+        time_s, distance_km = closest_approach(positions_1, velocities_1, positions_2, velocities_2, 1000.)
+        for n, (p_1, v_1) in enumerate(zip(positions_1, velocities_1)):
+            for m, (p_2, v_2) in enumerate(zip(positions_2, velocities_2)):
+                rel_p, rel_v = p_2 - p_1, v_2 - v_1
+                t = min(max(-dot(rel_p, rel_v) / dot(rel_v, rel_v), 0.), 1000.)
+                with self.subTest(n=n, m=m):
+                    self.assertTrue(abs(time_s[n, m] - t) < 1e-6)
+                    self.assertTrue(abs(distance_km[n, m] - (rel_p + rel_v * t).mag()) < 1e-6)
+
+    def testChunkingDoesNotChangeResults(self):
+        exp = closest_approach(self.p_1, self.v_1, self.p_2, self.v_2, 900.)
+        found = closest_approach(self.p_1, self.v_1, self.p_2, self.v_2, 900., max_pairs=100)
+        self.assertTrue(np.all(exp[0] == found[0]) and np.all(exp[1] == found[1]))
+
+    def testIncorrectArguments(self):
+        with self.assertRaises(ValueError):
+            closest_approach(self.p_1, self.v_1[:3], self.p_2, self.v_2, 10.)
+        with self.assertRaises(ValueError):
+            relative_cpa(self.p_1, self.v_1, -1.)
+        with self.assertRaises(ValueError):
+            conflicts(self.p_1, self.v_1, self.p_2, self.v_2, 10., -1.)
+        # Three 2D velocities must not be reshaped into two 3D ones.
+        for velocities in [[Vector(1., 2.), Vector(3., 4.), Vector(5., 6.)], [Vector3D(1, 2, 3), Vector(1., 2.)]]:
+            with self.subTest(velocities=[str(velocity) for velocity in velocities]):
+                with self.assertRaises(ValueError):
+                    closest_approach(np.zeros((2, 3)), velocities, self.p_2, self.v_2, 10.)
+
+
+class ConflictTests(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(1)
+        self.p_1 = rng.uniform(-2000, 2000, (300, 3))
+        self.v_1 = rng.normal(scale=0.25, size=(300, 3))
+        self.p_2 = rng.uniform(-2000, 2000, (500, 3))
+        self.v_2 = rng.normal(scale=0.25, size=(500, 3))
+
+    def testPrefilterMatchesBruteForce(self):
+        time_s, distance_km = closest_approach(self.p_1, self.v_1, self.p_2, self.v_2, 600.)
+        exp_i, exp_j = np.nonzero(distance_km <= 150.)
+        self.assertGreater(len(exp_i), 0)
+        for prefilter in [True, False]:
+            for max_pairs in [37, 1 << 20]:
+                with self.subTest(prefilter=prefilter, max_pairs=max_pairs):
+                    i, j, t, d = conflicts(self.p_1, self.v_1, self.p_2, self.v_2, 600., 150., max_pairs, prefilter)
+                    self.assertTrue(np.all(i == exp_i) and np.all(j == exp_j))
+                    self.assertTrue(np.all(t == time_s[i, j]) and np.all(d == distance_km[i, j]))
+
+    def testNoConflicts(self):
+        i, j, t, d = conflicts(self.p_1[:1], self.v_1[:1], self.p_1[:1] + 1e4, self.v_1[:1], 600., 1.)
+        self.assertEqual(len(i), 0)
+        self.assertEqual(len(conflicts(np.zeros((0, 3)), np.zeros((0, 3)), self.p_2, self.v_2, 10., 1.)[0]), 0)
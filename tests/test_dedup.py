@@ -0,0 +1,114 @@
+# Built-in modules
+import os
+import sys
+import time
+import unittest
+
+# 3rd party
+import numpy as np
+
+# This next bit makes sure the resources are available without needing to install.
+this_dir = os.path.abspath(os.path.dirname(__file__))
+python_dir = os.path.dirname(this_dir)
+module_dir = os.path.join(python_dir, "geometric_tools")
+if module_dir not in sys.path:
+    sys.path.append(module_dir)
+
+# Custom modules
+from dedup import isclose, quantized_keys, unique_indices, deduplicate
+from locations import ECEF, Geo
+from vector_3d import Vector3D
+
+
+def _greedy(points, tol):
+    """
+    Quadratic reference for unique_indices.
+    """
+    kept, inverse = [], []
+    for point in points:
+        for position, k in enumerate(kept):
+            if np.linalg.norm(points[k] - point) <= tol:
+                inverse.append(position)
+                break
+        else:
+            inverse.append(len(kept))
+            kept.append(len(inverse) - 1)
+    return np.array(kept), np.array(inverse)
+
+
+class BatchComparisonTests(unittest.TestCase):
+
+    def testIsClose(self):
+        points = np.array([[0, 0, 0], [1, 0, 0], [0, 0, 2]])
+        self.assertTrue(np.all(isclose(points, [0, 0, 0.], 1.) == [True, True, False]))
+        self.assertTrue(np.all(isclose([Geo(0, 0, 0), ECEF(1, 1, 1)], [ECEF(Geo.Re_km, 0, 0), ECEF(1, 1, 2)], 0.5)
+                               == [True, False]))
+        self.assertTrue(np.all(isclose([Vector3D(1, 2, 3)], [Vector3D(1, 2, 3.1)], 0.2)))
+        with self.assertRaises(TypeError):
+            isclose([Vector3D(1, 2, 3), ECEF(1, 2, 3)], np.zeros(3))
+
+    def testQuantizedKeysMatchScalar(self):
+        vecs = [Vector3D(0.3, -2.2, 7.9), Vector3D(-0.01, 0, 5)]
+        keys = quantized_keys(vecs, 0.25)
+        for vec, key in zip(vecs, keys):
+            with self.subTest(vec=str(vec)):
+                self.assertEqual(tuple(key), vec.quantized_key(0.25))
+
+
+class DeduplicationTests(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        centers = rng.uniform(0, 10, (100, 3))
+        self.points = centers[rng.integers(0, 100, 1000)] + rng.normal(scale=0.02, size=(1000, 3))
+        self.points[::7] = self.points[3::7][:len(self.points[::7])]
+
+    def testMatchesGreedyReference(self):
+        for tol in [0.01, 0.05, 0.3]:
+            with self.subTest(tol=tol):
+                index, inverse = unique_indices(self.points, tol, chunk_size=500)
+                exp_index, exp_inverse = _greedy(self.points, tol)
+                self.assertTrue(np.all(index == exp_index))
+                self.assertTrue(np.all(inverse == exp_inverse))
+
+    def testKeptPointsAreSeparated(self):
+        kept = deduplicate(self.points, 0.1)
+        distances = np.linalg.norm(kept[:, None] - kept[None], axis=2)
+        self.assertTrue(np.all(distances[np.triu_indices(len(kept), 1)] > 0.1))
+
+    def testInverseMapsWithinTolerance(self):
+        index, inverse = unique_indices(self.points, 0.1)
+        self.assertTrue(np.all(np.linalg.norm(self.points - self.points[index][inverse], axis=1) <= 0.1))
+
+    def testExactDuplicates(self):
+        points = np.array([[1, 2, 3], [4, 5, 6], [1, 2, 3], [4, 5, 6]], dtype=float)
+        index, inverse = unique_indices(points, 1e-9)
+        self.assertTrue(np.all(index == [0, 1]))
+        self.assertTrue(np.all(inverse == [0, 1, 0, 1]))
+
+    def testLocationsAndVectors(self):
+        locations = [Geo(10, 20, 0), ECEF(1, 2, 3), Geo(10, 20, 0).ecef(), ECEF(1, 2, 3.0001)]
+        unique = deduplicate(locations, 1e-3)
+        self.assertEqual(len(unique), 2)
+        self.assertIs(unique[0], locations[0])
+        vecs = [Vector3D(1, 0, 0), Vector3D(1, 0, 1e-12), Vector3D(0, 1, 0)]
+        self.assertEqual(len(deduplicate(vecs)), 2)
+
+    def testEdgeCases(self):
+        index, inverse = unique_indices(np.zeros((0, 3)), 1.)
+        self.assertEqual(len(index), 0)
+        self.assertTrue(np.all(unique_indices(np.arange(5.)[:, None], 1.5)[0] == [0, 2, 4]))
+        with self.assertRaises(ValueError):
+            unique_indices(self.points, 0.)
+
+    def testChainScalesLinearly(self):
+        # Each point is within tol of its neighbours only, so every other point is kept.  Settling a chain one link
+        # per round would take n rounds over all n pairs.
+        n_points = 20000
+        points = np.column_stack((0.6 * np.arange(n_points), np.zeros(n_points), np.zeros(n_points)))
+        start = time.perf_counter()
+        index, inverse = unique_indices(points, 1.)
+        elapsed = time.perf_counter() - start
+        self.assertTrue(np.all(index == np.arange(0, n_points, 2)))
+        self.assertTrue(np.all(inverse == np.arange(n_points) // 2))
+        self.assertLess(elapsed, 2.)
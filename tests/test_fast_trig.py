@@ -0,0 +1,83 @@
+# Built-in modules
+import os
+import sys
+import unittest
+
+# 3rd party
+import numpy as np
+
+# This next bit makes sure the resources are available without needing to install.
+this_dir = os.path.abspath(os.path.dirname(__file__))
+python_dir = os.path.dirname(this_dir)
+module_dir = os.path.join(python_dir, "geometric_tools")
+if module_dir not in sys.path:
+    sys.path.append(module_dir)
+
+# Custom modules
+from fast_trig import (EXACT, FAST, FAST_MAX_ERROR, FAST_MAX_ANGLE_RAD, cos, resolve, sin, sin_cos, trig_precision)
+from locations import geo_to_ecef, sph_coords_to_ecef
+from quaternion import quaternion_rotations, rotation_matrices
+
+
+class ErrorBoundTests(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        quarter_turns = np.pi / 2 * np.arange(-4000, 4000)
+        self.angles = {"dense": np.linspace(-4 * np.pi, 4 * np.pi, 1000001),
+                       "wide": rng.uniform(-FAST_MAX_ANGLE_RAD, FAST_MAX_ANGLE_RAD, 1000000),
+                       "quarter turns": quarter_turns + rng.normal(scale=1e-6, size=quarter_turns.shape)}
+
+    def testSinCos(self):
+        for name, angles in self.angles.items():
+            with self.subTest(angles=name):
+                fast_sin, fast_cos = sin_cos(angles, FAST)
+                self.assertEqual(fast_sin.dtype, np.float64)
+                self.assertLessEqual(np.max(np.abs(fast_sin - np.sin(angles))), FAST_MAX_ERROR)
+                self.assertLessEqual(np.max(np.abs(fast_cos - np.cos(angles))), FAST_MAX_ERROR)
+                self.assertTrue(np.all(sin(angles, FAST) == fast_sin) and np.all(cos(angles, FAST) == fast_cos))
+
+    def testExactIsNumpy(self):
+        angles = self.angles["dense"]
+        self.assertTrue(np.all(sin(angles) == np.sin(angles)))
+        self.assertTrue(np.all(cos(angles, EXACT) == np.cos(angles)))
+
+    def testConversionsAndRotations(self):
+        rng = np.random.default_rng(1)
+        lat_lon_alt = np.column_stack((rng.uniform(-90, 90, 100000), rng.uniform(-180, 180, 100000),
+                                       rng.uniform(0, 36000, 100000)))
+        exact, fast = geo_to_ecef(lat_lon_alt), geo_to_ecef(lat_lon_alt, FAST)
+        r = np.linalg.norm(exact, axis=1)
+        # Each coordinate is a product of at most two approximate factors, each off by at most FAST_MAX_ERROR.
+        self.assertTrue(np.all(np.abs(fast - exact) <= 2 * FAST_MAX_ERROR * r[:, None]))
+        angles, axes, vecs = rng.uniform(-10, 10, 1000), rng.normal(size=(1000, 3)), rng.normal(size=(1000, 3))
+        exact_rotated = quaternion_rotations(angles, axes, vecs)
+        fast_rotated = quaternion_rotations(angles, axes, vecs, FAST)
+        scale = np.abs(vecs).sum(axis=1)[:, None]
+        self.assertTrue(np.all(np.abs(fast_rotated - exact_rotated) <= 8 * FAST_MAX_ERROR * scale))
+        self.assertTrue(np.all(np.abs(rotation_matrices(angles, axes, FAST) - rotation_matrices(angles, axes))
+                               <= 8 * FAST_MAX_ERROR))
+
+
+class PrecisionSelectionTests(unittest.TestCase):
+
+    def testContext(self):
+        angles = np.linspace(0, 1, 101)
+        r_theta_phi = np.column_stack((np.full(101, 7000.), angles, 2 * angles))
+        self.assertEqual(resolve(), EXACT)
+        with trig_precision(FAST):
+            self.assertEqual(resolve(), FAST)
+            self.assertTrue(np.all(sph_coords_to_ecef(r_theta_phi) == sph_coords_to_ecef(r_theta_phi, FAST)))
+            self.assertEqual(resolve(EXACT), EXACT)
+            with trig_precision(EXACT):
+                self.assertTrue(np.all(sin(angles) == np.sin(angles)))
+            self.assertEqual(resolve(), FAST)
+        self.assertEqual(resolve(), EXACT)
+        self.assertFalse(np.all(sph_coords_to_ecef(r_theta_phi) == sph_coords_to_ecef(r_theta_phi, FAST)))
+
+    def testUnknownPrecision(self):
+        with self.assertRaises(ValueError):
+            sin(1., "approximate")
+        with self.assertRaises(ValueError):
+            with trig_precision("approximate"):
+                pass
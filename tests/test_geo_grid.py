@@ -0,0 +1,77 @@
+# Built-in modules
+import os
+import sys
+import unittest
+
+# 3rd party
+import numpy as np
+
+# This next bit makes sure the resources are available without needing to install.
+this_dir = os.path.abspath(os.path.dirname(__file__))
+python_dir = os.path.dirname(this_dir)
+module_dir = os.path.join(python_dir, "geometric_tools")
+if module_dir not in sys.path:
+    sys.path.append(module_dir)
+
+# Custom modules
+from geo_grid import GeoGrid, TrigCache, grid_ecef
+from locations import geo_to_ecef
+
+
+class GeoGridTests(unittest.TestCase):
+    _fudge = 1e-6
+
+    def setUp(self):
+        self.grid = GeoGrid(-10, 0.5, 7, 20, 0.25, 9)
+
+    def _expected(self, altitude_km):
+        lat, lon = np.meshgrid(self.grid.latitudes(), self.grid.longitudes(), indexing="ij")
+        return geo_to_ecef(np.stack((lat, lon, np.full(lat.shape, altitude_km)), axis=-1))
+
+    def testInitializationErrors(self):
+        with self.assertRaises(ValueError):
+            GeoGrid(0, 1, 0, 0, 1, 1)
+
+    def testEqualityAndHash(self):
+        same = GeoGrid(-10., 0.5, 7, 20., 0.25, 9)
+        self.assertEqual(self.grid, same)
+        self.assertEqual(hash(self.grid), hash(same))
+        self.assertNotEqual(self.grid, GeoGrid(-10, 0.5, 8, 20, 0.25, 9))
+
+    def testSingleAltitude(self):
+        ecef = grid_ecef(self.grid, 3., TrigCache())
+        self.assertEqual(ecef.shape, (7, 9, 3))
+        self.assertTrue(np.all(np.abs(ecef - self._expected(3.)) < self._fudge))
+
+    def testAltitudeLayers(self):
+        altitudes = [0., 1.5, 100.]
+        ecef = grid_ecef(self.grid, altitudes, TrigCache())
+        self.assertEqual(ecef.shape, (3, 7, 9, 3))
+        for layer, altitude in zip(ecef, altitudes):
+            with self.subTest(altitude=altitude):
+                self.assertTrue(np.all(np.abs(layer - self._expected(altitude)) < self._fudge))
+
+    def testCacheReuse(self):
+        cache = TrigCache()
+        first = cache.get(self.grid)
+        second = cache.get(GeoGrid(-10, 0.5, 7, 20, 0.25, 9))
+        self.assertEqual(len(cache), 1)
+        for table_1, table_2 in zip(first, second):
+            self.assertIs(table_1, table_2)
+
+    def testCacheIsMemoryBounded(self):
+        grid_bytes = 2 * 8 * (7 + 9)
+        cache = TrigCache(max_bytes=2 * grid_bytes)
+        grids = [GeoGrid(lat0, 0.5, 7, 20, 0.25, 9) for lat0 in [-10, -5, 0]]
+        for grid in grids:
+            cache.get(grid)
+        self.assertEqual(len(cache), 2)
+        self.assertLessEqual(cache.nbytes, cache.max_bytes)
+        self.assertNotIn(grids[0], cache)
+        self.assertIn(grids[2], cache)
+
+    def testOversizedGridIsNotCached(self):
+        cache = TrigCache(max_bytes=8)
+        ecef = grid_ecef(self.grid, 0., cache)
+        self.assertEqual(len(cache), 0)
+        self.assertTrue(np.all(np.abs(ecef - self._expected(0.)) < self._fudge))
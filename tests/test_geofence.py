@@ -0,0 +1,111 @@
+# Built-in modules
+import os
+import sys
+import unittest
+
+# 3rd party
+import numpy as np
+
+# This next bit makes sure the resources are available without needing to install.
+this_dir = os.path.abspath(os.path.dirname(__file__))
+python_dir = os.path.dirname(this_dir)
+module_dir = os.path.join(python_dir, "geometric_tools")
+if module_dir not in sys.path:
+    sys.path.append(module_dir)
+
+# Custom modules
+from geofence import SphericalRegion, SphericalCap, SphericalPolygon, Geofence
+from locations import ECEF, Geo
+
+
+class SphericalCapTests(unittest.TestCase):
+
+    def testInitializationErrors(self):
+        with self.assertRaises(TypeError):
+            SphericalCap((0, 0, 0), 10)
+        with self.assertRaises(ValueError):
+            SphericalCap(Geo(0, 0, 0), -1)
+        with self.assertRaises(ValueError):
+            SphericalCap(ECEF(0, 0, 0), 1)
+
+    def testContains(self):
+        cap = SphericalCap(Geo(10, 20, 0), 200)
+        one_degree_km = Geo.Re_km * np.pi / 180.
+        points = [Geo(10, 20, 0), Geo(10 + 150 / one_degree_km, 20, 30), Geo(10 + 250 / one_degree_km, 20, 0),
+                  Geo(-10, -20, 0)]
+        self.assertTrue(np.all(cap.contains(points) == [True, True, False, False]))
+
+    def testBaseClass(self):
+        with self.assertRaises(NotImplementedError):
+            SphericalRegion().contains([Geo(0, 0, 0)])
+
+
+class SphericalPolygonTests(unittest.TestCase):
+
+    def setUp(self):
+        # An L shape around the origin.
+        self.l_shape = SphericalPolygon([Geo(0, 0, 0), Geo(0, 2, 0), Geo(1, 2, 0), Geo(1, 1, 0), Geo(2, 1, 0),
+                                         Geo(2, 0, 0)])
+
+    def testInitializationErrors(self):
+        with self.assertRaises(ValueError):
+            SphericalPolygon([Geo(0, 0, 0), Geo(0, 1, 0)])
+        with self.assertRaises(TypeError):
+            SphericalPolygon([Geo(0, 0, 0), Geo(0, 1, 0), ECEF(1, 1, 1)])
+        with self.assertRaises(ValueError):
+            SphericalPolygon(np.array([[0, 0, 0], [0, 120, 0], [0, 240, 0]]))
+
+    def testConcaveContainment(self):
+        points = np.array([[0.5, 0.5, 0], [0.5, 1.5, 0], [1.5, 0.5, 0], [1.5, 1.5, 0], [-0.5, 0.5, 0],
+                           [0.5, -0.5, 0], [-0.5, 179.5, 0], [1.5, 0.5, 1000]])
+        exp_inside = [True, True, True, False, False, False, False, True]
+        self.assertTrue(np.all(self.l_shape.contains(points) == exp_inside))
+
+    def testOrientationDoesNotMatter(self):
+        reversed_shape = SphericalPolygon(self.l_shape.vertices[::-1])
+        points = np.array([[0.5, 0.5, 0], [1.5, 1.5, 0]])
+        self.assertTrue(np.all(reversed_shape.contains(points) == self.l_shape.contains(points)))
+
+    def testAcrossDateLineAndPole(self):
+        date_line = SphericalPolygon(np.array([[-1, 179, 0], [-1, -179, 0], [1, -179, 0], [1, 179, 0]]))
+        self.assertTrue(np.all(date_line.contains(np.array([[0, 180, 0], [0, -179.5, 0], [0, 178, 0]]))
+                               == [True, True, False]))
+        polar = SphericalPolygon(np.array([[80, lon, 0] for lon in range(0, 360, 45)]))
+        self.assertTrue(np.all(polar.contains(np.array([[90, 0, 0], [85, 123, 0], [75, 0, 0]]))
+                               == [True, True, False]))
+
+    def testBoundingCapContainsVertices(self):
+        cap = self.l_shape.bounding_cap()
+        self.assertTrue(np.all(cap.contains(self.l_shape.vertices)))
+
+
+class GeofenceTests(unittest.TestCase):
+
+    def setUp(self):
+        self.regions = [SphericalPolygon([Geo(0, 0, 0), Geo(0, 2, 0), Geo(2, 2, 0), Geo(2, 0, 0)]),
+                        SphericalPolygon([Geo(1, 1, 0), Geo(1, 3, 0), Geo(3, 3, 0), Geo(3, 1, 0)]),
+                        SphericalCap(Geo(-40, 60, 0), 500)]
+        self.fence = Geofence(self.regions, max_pairs=20)
+
+    def testInitializationErrors(self):
+        with self.assertRaises(TypeError):
+            Geofence([Geo(0, 0, 0)])
+
+    def testQuery(self):
+        points = [Geo(0.5, 0.5, 0), Geo(1.5, 1.5, 0), Geo(2.5, 2.5, 0), Geo(-40, 60, 0), Geo(50, 50, 0)]
+        point_idx, region_idx = self.fence.query(points)
+        self.assertEqual(list(zip(point_idx, region_idx)), [(0, 0), (1, 0), (1, 1), (2, 1), (3, 2)])
+
+    def testMatchesBruteForce(self):
+        rng = np.random.default_rng(0)
+        points = np.column_stack((rng.uniform(-45, 5, 500), rng.uniform(-1, 65, 500), np.zeros(500)))
+        exp_mask = np.column_stack([region.contains(points) for region in self.regions])
+        self.assertTrue(exp_mask.any())
+        for max_pairs in [1, 20, 1 << 20]:
+            with self.subTest(max_pairs=max_pairs):
+                self.assertTrue(np.all(Geofence(self.regions, max_pairs).contains(points) == exp_mask))
+
+    def testEmpty(self):
+        point_idx, region_idx = Geofence([]).query([Geo(0, 0, 0)])
+        self.assertEqual(len(point_idx), 0)
+        self.assertEqual(self.fence.contains(np.zeros((0, 3))).shape, (0, 3))
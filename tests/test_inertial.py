@@ -0,0 +1,110 @@
+# Built-in modules
+import os
+import sys
+import unittest
+
+# 3rd party
+import numpy as np
+
+# This next bit makes sure the resources are available without needing to install.
+this_dir = os.path.abspath(os.path.dirname(__file__))
+python_dir = os.path.dirname(this_dir)
+module_dir = os.path.join(python_dir, "geometric_tools")
+if module_dir not in sys.path:
+    sys.path.append(module_dir)
+
+# Custom modules
+from inertial import (J2000_POSIX_S, ECI, RotationCache, earth_rotation_angle, eci_to_ecef, ecef_to_eci)
+from locations import ECEF, Geo
+from quaternion import quaternion_rotation
+from vector_3d import Vector3D
+
+
+class EarthRotationTests(unittest.TestCase):
+    _fudge = 1e-9
+
+    def testAngleAtJ2000(self):
+        self.assertTrue(abs(earth_rotation_angle(J2000_POSIX_S) - 2 * np.pi * 0.7790572732640) < self._fudge)
+
+    def testSiderealDay(self):
+        sidereal_day_s = 86400. / 1.00273781191135448
+        angles = earth_rotation_angle([1.7e9, 1.7e9 + sidereal_day_s])
+        self.assertTrue(abs(angles[1] - angles[0]) < 1e-8)
+
+    def testDatetime64(self):
+        times = np.array(["2000-01-01T12:00:00", "2024-03-01T00:00:00"], dtype="datetime64[s]")
+        posix = times.astype(np.int64).astype(float)
+        self.assertTrue(np.all(np.abs(earth_rotation_angle(times) - earth_rotation_angle(posix)) < self._fudge))
+
+
+class BatchConversionTests(unittest.TestCase):
+    _fudge = 1e-6
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.xyz = rng.normal(scale=7000, size=(200, 3))
+        self.times = rng.choice(1.7e9 + 60 * np.arange(10), 200)
+
+    def testMatchesQuaternionRotation(self):
+        ecef = eci_to_ecef(self.xyz, self.times, RotationCache())
+        for xyz, time, ecef_row in zip(self.xyz[:10], self.times[:10], ecef[:10]):
+            exp_vec = quaternion_rotation(-earth_rotation_angle(time), Vector3D(0, 0, 1), Vector3D(*xyz))
+            with self.subTest(time=time):
+                self.assertTrue((Vector3D(ecef_row) - exp_vec).mag() < self._fudge)
+
+    def testRoundTrip(self):
+        cache = RotationCache()
+        eci = ecef_to_eci(eci_to_ecef(self.xyz, self.times, cache), self.times, cache)
+        self.assertTrue(np.all(np.abs(eci - self.xyz) < self._fudge))
+
+    def testScalarTime(self):
+        ecef = eci_to_ecef(self.xyz, 1.7e9, RotationCache())
+        self.assertTrue(np.all(np.abs(ecef - eci_to_ecef(self.xyz, np.full(200, 1.7e9))) < self._fudge))
+
+    def testCacheComputesEachEpochOnce(self):
+        cache = RotationCache()
+        eci_to_ecef(self.xyz, self.times, cache)
+        self.assertEqual(len(cache), 10)
+        eci_to_ecef(self.xyz[:5], self.times[:5] + 60 * 10, cache)
+        self.assertEqual(len(cache), 10 + len(np.unique(self.times[:5])))
+
+    def testCacheIsBounded(self):
+        cache = RotationCache(maxsize=4)
+        ecef = eci_to_ecef(self.xyz, self.times, cache)
+        self.assertEqual(len(cache), 4)
+        self.assertTrue(np.all(np.abs(ecef - eci_to_ecef(self.xyz, self.times, RotationCache(0))) < self._fudge))
+
+    def testCacheEvictsLeastRecentlyUsed(self):
+        cache = RotationCache(maxsize=3)
+        cache.matrices([1.7e9, 1.7e9 + 1, 1.7e9 + 2])
+        cache.matrices([1.7e9 + 2, 1.7e9])
+        matrices, inverse = cache.matrices([1.7e9 + 3, 1.7e9])
+        self.assertTrue(np.all(cache._epochs == [1.7e9, 1.7e9 + 2, 1.7e9 + 3]))
+        self.assertTrue(np.all(inverse == [1, 0]))
+        exp_matrices, _ = RotationCache(0).matrices([1.7e9, 1.7e9 + 3])
+        self.assertTrue(np.all(np.abs(matrices - exp_matrices) < 1e-15))
+
+
+class ECITests(unittest.TestCase):
+    _fudge = 1e-6
+
+    def testConversions(self):
+        geo = Geo(30, 40, 500)
+        eci = ECI.from_location(geo, 1.7e9)
+        self.assertEqual(eci.time, 1.7e9)
+        self.assertTrue((eci.ecef() - geo.ecef()).mag() < self._fudge)
+        self.assertTrue((eci.geo() - geo).mag() < self._fudge)
+        self.assertTrue((eci.sph_coords() - geo).mag() < self._fudge)
+        self.assertTrue(abs(Vector3D(eci.x, eci.y, eci.z).mag() - geo._vec().mag()) < self._fudge)
+
+    def testAlgebra(self):
+        eci = ECI.from_location(ECEF(7000, 0, 0), 1.7e9)
+        moved = eci + Vector3D(0, 10, 0)
+        self.assertIsInstance(moved, ECI)
+        self.assertEqual(moved.time, eci.time)
+        self.assertTrue((moved - ECEF(7000, 10, 0)).mag() < self._fudge)
+        self.assertTrue(((Vector3D(0, 10, 0) + eci) - moved).mag() < self._fudge)
+        with self.assertRaises(TypeError):
+            eci + 1
+        with self.assertRaises(TypeError):
+            ECI.from_location(Vector3D(1, 2, 3), 0.)
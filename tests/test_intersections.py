@@ -0,0 +1,102 @@
+# Built-in modules
+import os
+import sys
+import unittest
+
+# 3rd party
+import numpy as np
+
+# This next bit makes sure the resources are available without needing to install.
+this_dir = os.path.abspath(os.path.dirname(__file__))
+python_dir = os.path.dirname(this_dir)
+module_dir = os.path.join(python_dir, "geometric_tools")
+if module_dir not in sys.path:
+    sys.path.append(module_dir)
+
+# Custom modules
+from intersections import ray_intersections, detector_directions, footprint
+from local_frames import ENU
+from locations import ECEF, SphCoords, Geo
+from quaternion import Quaternion
+from vector_3d import Vector3D
+
+
+class RayIntersectionTests(unittest.TestCase):
+    _fudge = 1e-6
+
+    def testNadir(self):
+        origins = [Geo(10, 20, 500), Geo(-40, 60, 800)]
+        directions = [-origin.ecef()._vec() for origin in origins]
+        hit, range_km, points = ray_intersections(origins, directions, frame=Geo)
+        self.assertTrue(np.all(hit))
+        self.assertTrue(np.all(np.abs(range_km - [500, 800]) < self._fudge))
+        self.assertTrue(np.all(np.abs(points - [[10, 20, 0], [-40, 60, 0]]) < self._fudge))
+
+    def testMissAndBehind(self):
+        origins = np.array([[Geo.Re_km + 500, 0, 0]] * 3)
+        directions = np.array([[0, 1, 0], [1, 0, 0], [0, 0, 0]])
+        hit, range_km, points = ray_intersections(origins, directions)
+        self.assertFalse(np.any(hit))
+        self.assertTrue(np.all(np.isnan(range_km)) and np.all(np.isnan(points)))
+
+    def testGrazingAndInside(self):
+        hit, range_km, _ = ray_intersections([[-10, 1, 0], [0, 0, 0]], [[1, 0, 0], [0, 0, 5]], 1.)
+        self.assertTrue(np.all(hit))
+        self.assertTrue(np.all(np.abs(range_km - [10, 1]) < self._fudge))
+
+    def testEllipsoid(self):
+        radii = [6378.137, 6378.137, 6356.752]
+        hit, range_km, points = ray_intersections(ECEF(0, 0, 10000), Vector3D(0, 0, -1), radii)
+        self.assertTrue(hit[0] and abs(range_km[0] - (10000 - radii[2])) < self._fudge)
+        rng = np.random.default_rng(0)
+        origins = rng.normal(scale=10000, size=(500, 3))
+        _, _, points = ray_intersections(origins, -origins + rng.normal(scale=500, size=(500, 3)), radii)
+        points = points[~np.isnan(points[:, 0])]
+        self.assertGreater(len(points), 400)
+        self.assertTrue(np.all(np.abs(np.sum((points / radii) ** 2, axis=1) - 1) < 1e-9))
+
+    def testFrames(self):
+        origin = Geo(30, 40, 700)
+        direction = -origin.ecef()._vec()
+        exp_point = Geo(30, 40, 0)
+        _, _, sph = ray_intersections(origin, direction, frame=SphCoords)
+        self.assertTrue((SphCoords(*sph[0]) - exp_point).mag() < self._fudge)
+        _, _, local = ray_intersections(origin, direction, frame=ENU(exp_point))
+        self.assertTrue(np.all(np.abs(local) < self._fudge))
+        with self.assertRaises(TypeError):
+            ray_intersections(origin, direction, frame=Vector3D)
+        with self.assertRaises(ValueError):
+            ray_intersections(origin, direction, radii_km=[1, 0, 1])
+
+
+class FootprintTests(unittest.TestCase):
+    _fudge = 1e-6
+
+    def testDetectorDirections(self):
+        directions = detector_directions(3, 5, 0.2, 0.1)
+        self.assertEqual(directions.shape, (3, 5, 3))
+        self.assertTrue(np.all(np.abs(directions[1, 2] - [0, 0, 1]) < self._fudge))
+        self.assertTrue(np.all(np.diff(directions[..., 0], axis=1) > 0))
+        self.assertTrue(np.all(np.diff(directions[..., 1], axis=0) > 0))
+        with self.assertRaises(ValueError):
+            detector_directions(0, 5, 0.2, 0.1)
+
+    def testMatchesPerRayRotation(self):
+        origin = ECEF(Geo.Re_km + 600, 0, 0)
+        # Turns the sensor +z boresight towards -x, i.e. nadir.
+        attitude = Quaternion.from_rotation_about_axis(-np.pi / 2, Vector3D(0, 1, 0))
+        directions = detector_directions(4, 6, 0.3, 0.2)
+        hit, range_km, points = footprint(origin, attitude, directions, frame=Geo)
+        self.assertEqual(hit.shape, (4, 6))
+        self.assertEqual(points.shape, (4, 6, 3))
+        self.assertTrue(np.all(hit))
+        for index in [(0, 0), (2, 3), (3, 5)]:
+            ecef_direction = attitude.rotate(Vector3D(*directions[index]))
+            exp_hit, exp_range, exp_point = ray_intersections(origin, ecef_direction, frame=Geo)
+            with self.subTest(index=index):
+                self.assertTrue(abs(range_km[index] - exp_range[0]) < self._fudge)
+                self.assertTrue(np.all(np.abs(points[index] - exp_point[0]) < self._fudge))
+        self.assertTrue(np.all(range_km >= 600 - self._fudge))
+        self.assertTrue(np.all(np.abs(points[..., 2]) < self._fudge))
+        with self.assertRaises(TypeError):
+            footprint(origin, Vector3D(0, 0, 1), directions)
@@ -0,0 +1,80 @@
+# Built-in modules
+import os
+import sys
+import unittest
+
+# 3rd party
+import numpy as np
+
+# This next bit makes sure the resources are available without needing to install.
+this_dir = os.path.abspath(os.path.dirname(__file__))
+python_dir = os.path.dirname(this_dir)
+module_dir = os.path.join(python_dir, "geometric_tools")
+if module_dir not in sys.path:
+    sys.path.append(module_dir)
+
+# Custom modules
+from local_frames import LocalFrame, ENU, NED
+from locations import ECEF, Geo, SphCoords, geo_to_ecef
+from vector_3d import Vector3D
+
+
+class LocalFrameTests(unittest.TestCase):
+    _fudge = 1e-6
+
+    def testBaseClass(self):
+        with self.assertRaises(NotImplementedError):
+            LocalFrame(Geo(0, 0, 0))
+
+    def testReferenceType(self):
+        with self.assertRaises(TypeError):
+            ENU(Vector3D(1, 0, 0))
+
+    def testEnuAxesAtEquator(self):
+        enu = ENU(Geo(0, 0, 0))
+        exp_vecs = [Vector3D(0, 1, 0), Vector3D(0, 0, 1), Vector3D(1, 0, 0)]
+        ecef_vecs = [Vector3D(1, 0, 0), Vector3D(0, 1, 0), Vector3D(0, 0, 1)]
+        for exp_vec, ecef_vec in zip(exp_vecs, ecef_vecs):
+            vec = enu.vector(exp_vec)
+            with self.subTest(vec=str(vec), exp_vec=str(ecef_vec)):
+                self.assertTrue((vec - ecef_vec).mag() < self._fudge)
+
+    def testNedIsPermutedEnu(self):
+        reference = Geo(30, 45, 1)
+        enu = ENU(reference).vector(Vector3D(1, 2, 3))
+        ned = NED(reference).vector(Vector3D(1, 2, 3))
+        self.assertTrue((ned - Vector3D(enu.y, enu.x, -enu.z)).mag() < self._fudge)
+
+    def testRotationIsOrthonormal(self):
+        for frame in [ENU(Geo(30, 45, 1)), NED(SphCoords(7000, 1, 2)), ENU(ECEF(0, 0, 7000))]:
+            with self.subTest(frame=frame.__class__.__name__):
+                self.assertTrue(np.allclose(frame.rotation @ frame.rotation.T, np.eye(3)))
+                self.assertTrue(abs(np.linalg.det(frame.rotation) - 1) < self._fudge)
+
+    def testDisplacementUsesSubtraction(self):
+        reference = Geo(10, 20, 0)
+        enu = ENU(reference)
+        above = Geo(10, 20, 5)
+        self.assertTrue((enu.displacement(above) - Vector3D(0, 0, 5)).mag() < self._fudge)
+        self.assertTrue((enu.displacement(reference, above) - Vector3D(0, 0, -5)).mag() < self._fudge)
+
+    def testLocationRoundTrip(self):
+        ned = NED(Geo(-20, 50, 0))
+        target = Geo(-19, 51, 10)
+        self.assertTrue((ned.location(ned.displacement(target)) - target).mag() < self._fudge)
+
+    def testBatchMatchesScalar(self):
+        enu = ENU(Geo(40, -70, 0))
+        lat_lon_alt = np.array([[40, -70, 0], [41, -70, 0], [40, -69, 2], [-10, 30, 500]])
+        local = enu.from_geo(lat_lon_alt)
+        for row, local_row in zip(lat_lon_alt, local):
+            vec = enu.displacement(Geo(*row))
+            with self.subTest(geo=str(row)):
+                self.assertTrue(np.all(np.abs(local_row - vec.array) < self._fudge))
+
+    def testBatchRoundTrip(self):
+        ned = NED(Geo(5, 5, 1))
+        lat_lon_alt = np.array([[5, 5, 1], [6, 4, 0], [-3, 8, 12]])
+        self.assertTrue(np.all(np.abs(ned.to_geo(ned.from_geo(lat_lon_alt)) - lat_lon_alt) < self._fudge))
+        xyz = geo_to_ecef(lat_lon_alt)
+        self.assertTrue(np.all(np.abs(ned.to_ecef(ned.from_ecef(xyz)) - xyz) < self._fudge))
@@ -15,7 +15,8 @@ if module_dir not in sys.path:
     sys.path.append(module_dir)
 
 # Custom modules
-from locations import Location
+from locations import (Location, ECEF, Geo, ecef_array, ecef_to_sph_coords, sph_coords_to_ecef, ecef_to_geo,
+                       geo_to_ecef)
 from vector_3d import Vector3D
 
 
@@ -68,3 +69,76 @@ class LocationBaseClassTests(unittest.TestCase):
         location_2 = Location()
         self.assertFalse(location_1 != location_2)
         self.assertTrue(location_1 != 1)
+
+    def testIsClose(self):
+        geo = Geo(10, 20, 0)
+        self.assertTrue(geo.isclose(geo.ecef(), 1e-6))
+        self.assertTrue(ECEF(1, 2, 3).isclose(ECEF(1, 2, 3.5), 0.5))
+        self.assertFalse(ECEF(1, 2, 3).isclose(ECEF(1, 2, 3.5), 0.4))
+        with self.assertRaises(TypeError):
+            geo.isclose(Vector3D(1, 2, 3))
+
+    def testQuantizedKey(self):
+        self.assertEqual(ECEF(1.5, -0.5, 2).quantized_key(1.), (1, -1, 2))
+        self.assertEqual(Geo(0, 0, 0).quantized_key(1.), ECEF(Geo.Re_km, 0, 0).quantized_key(1.))
+
+
+class BatchConversionTests(unittest.TestCase):
+    _fudge = 1e-6
+
+    def setUp(self):
+        self.ecefs = [ECEF(1, 0, 0), ECEF(0, 1, 0), ECEF(0, 0, 1), ECEF(0, 0, -1), ECEF(1, 1, 0), ECEF(0, 1, 1),
+                      ECEF(3000, 2000, 4000)]
+        self.xyz = ecef_array(self.ecefs)
+
+    def testEcefArray(self):
+        self.assertEqual(self.xyz.shape, (len(self.ecefs), 3))
+        self.assertTrue(np.all(np.abs(ecef_array([Geo(0, 0, 0)]) - [[Geo.Re_km, 0, 0]]) < self._fudge))
+        self.assertEqual(ecef_array(ECEF(1, 2, 3)).shape, (1, 3))
+        self.assertTrue(np.all(ecef_array([[1, 2, 3], [4, 5, 6]]) == [[1, 2, 3], [4, 5, 6]]))
+        with self.assertRaises(ValueError):
+            ecef_array(np.zeros((2, 2)))
+
+    def testEcefToSphCoords(self):
+        r_theta_phi = ecef_to_sph_coords(self.xyz)
+        for ecef, row in zip(self.ecefs, r_theta_phi):
+            sph = ecef.sph_coords()
+            with self.subTest(ecef=str(ecef)):
+                self.assertTrue(np.all(np.abs(row - [sph.r, sph.theta, sph.phi]) < self._fudge))
+
+    def testNearPoles(self):
+        # acos(z / r) rounds angles below about 1e-8 rad from the poles to 0 or pi; atan2(rho, z) keeps them.
+        rho_km = np.array([1e-9, 1e-6, 1e-3])
+        xyz = np.column_stack((rho_km, np.zeros(3), np.full(3, 7000.)))
+        theta = ecef_to_sph_coords(xyz)[:, 1]
+        self.assertTrue(np.all(np.abs(theta - rho_km / 7000.) <= 1e-12 * rho_km / 7000.))
+        xyz[:, 2] = -7000.
+        self.assertTrue(np.all(ecef_to_sph_coords(xyz)[:, 1] < np.pi))
+
+    def testSphCoordsToEcef(self):
+        r_theta_phi = ecef_to_sph_coords(self.xyz)
+        self.assertTrue(np.all(np.abs(sph_coords_to_ecef(r_theta_phi) - self.xyz) < self._fudge))
+
+    def testGeoRoundTrip(self):
+        lat_lon_alt = np.array([[1, 0, 0], [1, 1, 1], [-45, -80, 20200], [89, 10, 3], [10, 170, 1]])
+        self.assertTrue(np.all(np.abs(ecef_to_geo(geo_to_ecef(lat_lon_alt)) - lat_lon_alt) < self._fudge))
+
+    def testGeoMatchesScalar(self):
+        lat_lon_alt = np.array([[1, 0, 0], [1, 1, 1], [-45, -80, 20200], [30, 60, 3]])
+        xyz = geo_to_ecef(lat_lon_alt)
+        for row, ecef_row in zip(lat_lon_alt, xyz):
+            ecef = Geo(*row).ecef()
+            with self.subTest(geo=str(row)):
+                self.assertTrue(np.all(np.abs(ecef_row - [ecef.x, ecef.y, ecef.z]) < self._fudge))
+
+    def testGeoLongitudeBeyond90(self):
+        # Geo folds longitude 170 to 10, so the scalar point is mirrored in x; the batch path keeps longitude 170.
+        xyz = geo_to_ecef([[10, 170, 0]])[0]
+        ecef = Geo(10, 170, 0).ecef()
+        self.assertTrue(xyz[0] < 0 < ecef.x)
+        self.assertTrue(np.all(np.abs(xyz - [-ecef.x, ecef.y, ecef.z]) < self._fudge))
+        self.assertTrue(np.all(np.abs(ecef_to_geo(xyz) - [10, 170, 0]) < self._fudge))
+
+    def testLeadingDimensions(self):
+        xyz = self.xyz.reshape(1, -1, 3)
+        self.assertEqual(ecef_to_geo(xyz).shape, xyz.shape)
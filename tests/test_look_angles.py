@@ -0,0 +1,75 @@
+# Built-in modules
+import os
+import sys
+import unittest
+
+# 3rd party
+import numpy as np
+
+# This next bit makes sure the resources are available without needing to install.
+this_dir = os.path.abspath(os.path.dirname(__file__))
+python_dir = os.path.dirname(this_dir)
+module_dir = os.path.join(python_dir, "geometric_tools")
+if module_dir not in sys.path:
+    sys.path.append(module_dir)
+
+# Custom modules
+from local_frames import ENU
+from locations import ECEF, Geo, geo_to_ecef
+from look_angles import look_angles, line_of_sight, visibility
+
+
+class LookAnglesTests(unittest.TestCase):
+    _fudge = 1e-6
+
+    def testCardinalDirections(self):
+        observer = [Geo(0, 0, 0)]
+        targets = [Geo(0, 0, 100), Geo(1, 0, 0), Geo(0, 1, 0), Geo(-1, 0, 0)]
+        range_km, elevation, azimuth = look_angles(observer, targets)
+        self.assertEqual(range_km.shape, (1, 4))
+        self.assertTrue(abs(range_km[0, 0] - 100) < self._fudge)
+        self.assertTrue(abs(elevation[0, 0] - np.pi / 2) < self._fudge)
+        exp_azimuths = [0, np.pi / 2, np.pi]
+        for azimuth_rad, exp_azimuth in zip(azimuth[0, 1:], exp_azimuths):
+            with self.subTest(azimuth=azimuth_rad, exp_azimuth=exp_azimuth):
+                self.assertTrue(abs(azimuth_rad - exp_azimuth) < self._fudge)
+
+    def testMatchesLocalFrame(self):
+        observers = [Geo(40, -70, 0), Geo(-33, 151, 1)]
+        targets = [Geo(41, -71, 10), Geo(0, 0, 20000), Geo(-30, 150, 400)]
+        range_km, elevation, azimuth = look_angles(observers, targets)
+        for i, observer in enumerate(observers):
+            enu = ENU(observer)
+            for j, target in enumerate(targets):
+                east, north, up = enu.displacement(target).array
+                with self.subTest(observer=str(observer), target=str(target)):
+                    self.assertTrue(abs(range_km[i, j] - (target - observer).mag()) < self._fudge)
+                    self.assertTrue(abs(elevation[i, j] - np.atan2(up, np.hypot(east, north))) < self._fudge)
+                    self.assertTrue(abs(azimuth[i, j] - np.atan2(east, north) % (2 * np.pi)) < self._fudge)
+
+    def testChunkingDoesNotChangeResult(self):
+        rng = np.random.default_rng(1)
+        observers = geo_to_ecef(np.column_stack((rng.uniform(-80, 80, 7), rng.uniform(-180, 180, 7), np.zeros(7))))
+        targets = geo_to_ecef(np.column_stack((rng.uniform(-80, 80, 5), rng.uniform(-180, 180, 5),
+                                               rng.uniform(300, 1000, 5))))
+        for full, chunked in zip(look_angles(observers, targets), look_angles(observers, targets, max_pairs=3)):
+            self.assertTrue(np.allclose(full, chunked))
+        self.assertTrue(np.all(visibility(observers, targets) == visibility(observers, targets, max_pairs=1)))
+
+    def testPoleObserver(self):
+        _, elevation, azimuth = look_angles([ECEF(0, 0, Geo.Re_km)], [ECEF(0, 0, Geo.Re_km + 5)])
+        self.assertTrue(abs(elevation[0, 0] - np.pi / 2) < self._fudge)
+
+    def testLineOfSight(self):
+        observers = [Geo(0, 0, 0)]
+        targets = [Geo(0, 10, 2000), ECEF(-Geo.Re_km - 2000, 0, 0), Geo(0, 0, 0), Geo(0, 20, 0)]
+        clear = line_of_sight(observers, targets)
+        self.assertTrue(np.all(clear == [[True, False, True, False]]))
+
+    def testVisibilityThreshold(self):
+        observers = [Geo(0, 0, 0)]
+        targets = [Geo(0, 0, 500), Geo(0, 20, 500), ECEF(-Geo.Re_km - 500, 0, 0)]
+        _, elevation, _ = look_angles(observers, targets)
+        self.assertTrue(np.all(visibility(observers, targets) == [[True, True, False]]))
+        threshold = (elevation[0, 0] + elevation[0, 1]) / 2
+        self.assertTrue(np.all(visibility(observers, targets, threshold) == [[True, False, False]]))
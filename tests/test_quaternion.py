@@ -15,8 +15,10 @@ if module_dir not in sys.path:
     sys.path.append(module_dir)
 
 # Custom modules
-from quaternion import Quaternion, quaternion_rotation
+from quaternion import (Quaternion, quaternion_rotation, quaternion_rotations, rotation_matrices,
+                        quaternion_products, quaternion_angles_and_units)
 from vector_3d import Vector3D
+from vector_alg import deferred
 
 
 class QuaternionTests(unittest.TestCase):
@@ -97,3 +99,89 @@ class QuaternionTests(unittest.TestCase):
             rot_vec = quaternion_rotation(rot_angle, axis, vec)
             with self.subTest(rot_vec=str(rot_vec), exp_rot_vec=str(exp_rot_vec)):
                 self.assertTrue((rot_vec - exp_rot_vec).mag() < self._fudge)
+
+    def testRotateMatchesSandwichProduct(self):
+        rng = np.random.default_rng(0)
+        for _ in range(10):
+            q = Quaternion.from_rotation_about_axis(rng.uniform(0, 2 * np.pi), Vector3D(*rng.normal(size=3)))
+            vec = Vector3D(*rng.normal(size=3))
+            exp_vec = (q.inv() * Quaternion.from_vector(vec) * q).to_vector()
+            with self.subTest(q=str(q), vec=str(vec)):
+                self.assertTrue((q.rotate(vec) - exp_vec).mag() < self._fudge)
+
+    def testRotateBatch(self):
+        q = Quaternion.from_rotation_about_axis(np.pi / 3., Vector3D(1, 2, 3))
+        vecs = np.random.default_rng(1).normal(size=(6, 3))
+        rotated = q.rotate(vecs)
+        self.assertEqual(rotated.shape, vecs.shape)
+        for vec, rot_vec in zip(vecs, rotated):
+            with self.subTest(vec=str(vec)):
+                self.assertTrue((Vector3D(rot_vec) - q.rotate(Vector3D(*vec))).mag() < self._fudge)
+
+    def testRotateIncorrect(self):
+        q = Quaternion(1, 0, 0, 0)
+        with self.assertRaises(TypeError):
+            q.rotate([1, 0, 0])
+
+    def testAsMatrix(self):
+        q = Quaternion.from_rotation_about_axis(np.pi / 2, Vector3D(0, 0, 1))
+        exp_matrix = np.array([[0, -1, 0], [1, 0, 0], [0, 0, 1]])
+        self.assertTrue(np.all(np.abs(q.as_matrix() - exp_matrix) < self._fudge))
+        self.assertTrue(np.all(np.abs(Quaternion(1, 0, 0, 0).as_matrix() - np.eye(3)) < self._fudge))
+
+    def testQuaternionRotations(self):
+        rot_angles = [np.pi / 2, np.pi / 4, np.pi]
+        axes = [[0, 0, 1], [1, 0, 0], [1, 1, 0]]
+        vecs = [[1, 0, 1], [0, 1, 0], [0, 1, 0]]
+        exp_rot_vecs = [[0, 1, 1], [0, np.sqrt(2.) / 2., np.sqrt(2.) / 2.], [1, 0, 0]]
+        rot_vecs = quaternion_rotations(rot_angles, axes, vecs)
+        self.assertTrue(np.all(np.abs(rot_vecs - exp_rot_vecs) < self._fudge))
+        with self.assertRaises(ValueError):
+            quaternion_rotations([1.], [[0, 0, 0]], [[1, 0, 0]])
+
+    def testDeferredScaling(self):
+        q = Quaternion(1, 2, 3, 4)
+        with deferred():
+            scaled = q * 2 - q
+            product = q * q
+        self.assertIsInstance(scaled.evaluate(), Quaternion)
+        self.assertEqual(scaled, q)
+        self.assertEqual(product, Quaternion(1, 2, 3, 4) * Quaternion(1, 2, 3, 4))
+
+    def testRotationMatrices(self):
+        rng = np.random.default_rng(2)
+        rot_angles, axes = rng.uniform(0, 2 * np.pi, 5), rng.normal(size=(5, 3))
+        matrices = rotation_matrices(rot_angles, axes)
+        self.assertEqual(matrices.shape, (5, 3, 3))
+        for rot_angle, axis, matrix in zip(rot_angles, axes, matrices):
+            q = Quaternion.from_rotation_about_axis(rot_angle, Vector3D(*axis))
+            with self.subTest(q=str(q)):
+                self.assertTrue(np.all(np.abs(matrix - q.as_matrix()) < self._fudge))
+        with self.assertRaises(ValueError):
+            rotation_matrices([1.], [[0, 0, 0]])
+
+    def testQuaternionProducts(self):
+        q1s = np.random.default_rng(3).normal(size=(5, 4))
+        q2s = np.random.default_rng(4).normal(size=(5, 4))
+        products = quaternion_products(q1s, q2s)
+        for q1, q2, product in zip(q1s, q2s, products):
+            with self.subTest(q1=str(q1), q2=str(q2)):
+                self.assertTrue(np.all(np.abs(product - (Quaternion(*q1) * Quaternion(*q2)).array) < self._fudge))
+
+    def testQuaternionAnglesAndUnits(self):
+        rng = np.random.default_rng(5)
+        qs = rng.normal(size=(5, 4))
+        qs /= np.linalg.norm(qs, axis=1, keepdims=True)
+        angles, units = quaternion_angles_and_units(qs)
+        for q, angle, unit in zip(qs, angles, units):
+            exp_angle, exp_unit = Quaternion(*q).to_angle_and_unit()
+            with self.subTest(q=str(q)):
+                self.assertTrue(abs(angle - 2. * np.acos(q[0])) < self._fudge and abs(angle - exp_angle) < self._fudge)
+                self.assertTrue(np.all(np.abs(unit - exp_unit.array) < self._fudge))
+        # A rotation by 1e-10 rad, where 2 acos(q0) would round to 0.
+        angle, unit = quaternion_angles_and_units([np.cos(5e-11), 0, 0, np.sin(5e-11)])
+        self.assertTrue(abs(angle - 1e-10) < 1e-24 and np.all(unit == [0, 0, 1]))
+        for bad in [[1, 0, 0, 0], np.zeros((2, 3))]:
+            with self.subTest(bad=str(bad)):
+                with self.assertRaises(ValueError):
+                    quaternion_angles_and_units(bad)
@@ -0,0 +1,134 @@
+# Built-in modules
+import os
+import sys
+import unittest
+
+# 3rd party
+import numpy as np
+
+# This next bit makes sure the resources are available without needing to install.
+this_dir = os.path.abspath(os.path.dirname(__file__))
+python_dir = os.path.dirname(this_dir)
+module_dir = os.path.join(python_dir, "geometric_tools")
+if module_dir not in sys.path:
+    sys.path.append(module_dir)
+
+# Custom modules
+from locations import ECEF, Geo, geo_to_ecef
+from reductions import (VectorMoments, vector_sum, centroid, bounding_box, covariance, principal_axes,
+                        mean_direction, spherical_mean, spherical_bounding_cap, grouped_sum, grouped_mean)
+from vector_3d import Vector3D
+from vector_alg import Vector
+
+
+class ReductionTests(unittest.TestCase):
+    _fudge = 1e-9
+
+    def setUp(self):
+        self.points = np.random.default_rng(0).normal(size=(1000, 3)) * [1., 2., 3.] + 7000.
+
+    def testInputKinds(self):
+        vectors = [Vector3D(*row) for row in self.points[:10]]
+        ecefs = [ECEF(*row) for row in self.points[:10]]
+        chunks = np.array_split(self.points[:10], 3)
+        for values in [vectors, ecefs, chunks, (chunk for chunk in chunks), (vector for vector in vectors),
+                       iter(ecefs), [chunks[0], vectors[4:6], ecefs[6], chunks[2]]]:
+            with self.subTest(kind=type(values).__name__):
+                self.assertTrue(np.allclose(vector_sum(values), self.points[:10].sum(axis=0)))
+        moments = VectorMoments.from_values(vector for vector in vectors)
+        self.assertEqual(moments.count, 10)
+
+    def testRejectsOtherDimensions(self):
+        for values in [[Vector(1, 2), Vector(3, 4), Vector(5, 6)], [Vector3D(1, 2, 3), Vector(1, 2, 3, 4)]]:
+            with self.subTest(values=[str(value) for value in values]):
+                with self.assertRaises(ValueError):
+                    vector_sum(values)
+
+    def testMomentsMatchNumpy(self):
+        chunked = VectorMoments.from_values(np.array_split(self.points, 7))
+        self.assertEqual(chunked.count, 1000)
+        self.assertTrue(np.allclose(chunked.mean(), self.points.mean(axis=0)))
+        self.assertTrue(np.allclose(chunked.covariance(), np.cov(self.points.T)))
+        self.assertTrue(np.allclose(centroid(self.points), self.points.mean(axis=0)))
+        self.assertTrue(np.allclose(covariance(self.points, ddof=0), np.cov(self.points.T, ddof=0)))
+        minimum, maximum = bounding_box(np.array_split(self.points, 4))
+        self.assertTrue(np.all(minimum == self.points.min(axis=0)))
+        self.assertTrue(np.all(maximum == self.points.max(axis=0)))
+
+    def testMerge(self):
+        first, second = VectorMoments.from_values(self.points[:300]), VectorMoments.from_values(self.points[300:])
+        merged = first.merge(second)
+        self.assertTrue(np.allclose(merged.covariance(), np.cov(self.points.T)))
+
+    def testEmpty(self):
+        moments = VectorMoments()
+        self.assertTrue(np.all(moments.sum() == 0))
+        with self.assertRaises(ValueError):
+            moments.mean()
+        with self.assertRaises(ValueError):
+            VectorMoments.from_values(self.points[:1]).covariance()
+
+    def testPrincipalAxes(self):
+        variances, axes = principal_axes(self.points)
+        self.assertTrue(np.all(np.diff(variances) <= 0))
+        self.assertTrue(abs(abs(axes[0, 2]) - 1) < 0.05)
+        self.assertTrue(np.allclose(axes @ axes.T, np.eye(3)))
+
+    def testMeanDirection(self):
+        self.assertTrue(np.allclose(mean_direction([Vector3D(2, 0, 0), Vector3D(0, 5, 0)]), [1, 1, 0] / np.sqrt(2)))
+        with self.assertRaises(ValueError):
+            mean_direction(np.array([[1, 0, 0], [-1, 0, 0]]))
+
+
+class SphericalReductionTests(unittest.TestCase):
+    _fudge = 1e-6
+
+    def testSphericalMeanAcrossDateLine(self):
+        lat_lon_alt = np.array([[10, 179, 0], [10, -179, 2], [-10, 179, 4], [-10, -179, 6]])
+        mean = spherical_mean(lat_lon_alt)
+        self.assertTrue(abs(mean[0]) < self._fudge)
+        self.assertTrue(abs(abs(mean[1]) - 180) < self._fudge)
+        self.assertTrue(abs(mean[2] - 3) < self._fudge)
+
+    def testSphericalMeanOfGeo(self):
+        mean = spherical_mean([Geo(10, 20, 0), Geo(10, 20, 4)])
+        self.assertTrue(np.allclose(mean, [10, 20, 2]))
+        self.assertTrue(np.allclose(spherical_mean(geo for geo in [Geo(10, 20, 0), Geo(10, 20, 4)]), [10, 20, 2]))
+        self.assertTrue(np.allclose(spherical_mean([Geo(10, 20, 0).ecef(), Geo(10, 20, 4)]), [10, 20, 2]))
+        with self.assertRaises(TypeError):
+            spherical_mean([Geo(10, 20, 0), Vector3D(1, 2, 3)])
+        mean = spherical_mean(np.array_split(np.array([[80, lon, 0] for lon in range(0, 360, 30)]), 5))
+        self.assertTrue(abs(mean[0] - 90) < self._fudge)
+
+    def testSphericalBoundingCap(self):
+        lat_lon_alt = np.column_stack((np.random.default_rng(1).uniform(-5, 5, (200, 2)), np.zeros(200)))
+        cap = spherical_bounding_cap(geo_to_ecef(lat_lon_alt))
+        self.assertTrue(np.all(cap.contains(lat_lon_alt)))
+        self.assertLess(cap.angle, np.radians(8))
+
+
+class GroupedReductionTests(unittest.TestCase):
+
+    def testGroupedSumAndMean(self):
+        values = np.arange(18, dtype=float).reshape(6, 3)
+        labels = np.array([0, 2, 0, 2, 2, 0])
+        sums = grouped_sum(values, labels)
+        self.assertEqual(sums.shape, (3, 3))
+        self.assertTrue(np.all(sums[0] == values[[0, 2, 5]].sum(axis=0)))
+        self.assertTrue(np.all(sums[1] == 0))
+        means = grouped_mean(values, labels, n_groups=4)
+        self.assertTrue(np.all(means[2] == values[[1, 3, 4]].mean(axis=0)))
+        self.assertTrue(np.all(np.isnan(means[[1, 3]])))
+
+    def testLabelMismatch(self):
+        with self.assertRaises(ValueError):
+            grouped_sum(np.zeros((3, 3)), [0, 1])
+
+    def testLabelsOutOfRange(self):
+        for labels, n_groups in [([0, 1, 2], 2), ([0, -1, 1], None), ([0, -1, 1], 3)]:
+            with self.subTest(labels=labels, n_groups=n_groups):
+                with self.assertRaises(ValueError):
+                    grouped_sum(np.zeros((3, 3)), labels, n_groups)
+                with self.assertRaises(ValueError):
+                    grouped_mean(np.zeros((3, 3)), labels, n_groups)
+        self.assertEqual(grouped_sum(np.zeros((0, 3)), np.zeros(0, dtype=int), 2).shape, (2, 3))
@@ -0,0 +1,101 @@
+# Built-in modules
+import os
+import sys
+import unittest
+
+# 3rd party
+import numpy as np
+
+# This next bit makes sure the resources are available without needing to install.
+this_dir = os.path.abspath(os.path.dirname(__file__))
+python_dir = os.path.dirname(this_dir)
+module_dir = os.path.join(python_dir, "geometric_tools")
+if module_dir not in sys.path:
+    sys.path.append(module_dir)
+
+# Custom modules
+from geofence import SphericalCap
+from locations import Geo, ecef_to_geo, geo_to_ecef
+from quaternion import Quaternion, rotation_matrices
+from sampling import (unit_vectors, cone_vectors, cap_points, shell_points, geo_points, quaternions, sample_chunks)
+from vector_3d import Vector3D
+
+
+class SamplingTests(unittest.TestCase):
+    _fudge = 1e-9
+    _n = 200000
+
+    def setUp(self):
+        self.rng = np.random.default_rng(0)
+
+    def testUnitVectors(self):
+        vecs = unit_vectors(self.rng, self._n)
+        self.assertEqual(vecs.shape, (self._n, 3))
+        self.assertTrue(np.all(np.abs(np.linalg.norm(vecs, axis=1) - 1) < self._fudge))
+        self.assertTrue(np.all(np.abs(vecs.mean(axis=0)) < 0.01))
+        self.assertTrue(np.all(np.abs(np.cov(vecs.T) - np.eye(3) / 3) < 0.01))
+
+    def testConeVectors(self):
+        for axis in [[0, 0, 1], [0, 0, -2], [1, 2, 3]]:
+            with self.subTest(axis=axis):
+                unit = np.array(axis) / np.linalg.norm(axis)
+                cos_angle = cone_vectors(self.rng, self._n, axis, 0.5) @ unit
+                self.assertTrue(np.all(cos_angle >= np.cos(0.5) - self._fudge))
+                # Uniform by area means the cosine is uniform on [cos(0.5), 1].
+                self.assertTrue(abs(cos_angle.mean() - (1 + np.cos(0.5)) / 2) < 1e-3)
+        self.assertTrue(np.all(np.abs(cone_vectors(self.rng, 10, [1, 0, 0], 0.) - [1, 0, 0]) < self._fudge))
+        with self.assertRaises(ValueError):
+            cone_vectors(self.rng, 10, [1, 0, 0], 4.)
+
+    def testCapPoints(self):
+        cap = SphericalCap(Geo(40, 60, 0), 1000)
+        points = cap_points(self.rng, self._n, cap, altitude_km=10.)
+        self.assertTrue(np.all(np.abs(np.linalg.norm(points, axis=1) - Geo.Re_km - 10.) < 1e-6))
+        self.assertTrue(np.all(points / (Geo.Re_km + 10.) @ cap.unit >= cap.cos_angle - self._fudge))
+        self.assertGreater(np.mean(cap.contains(ecef_to_geo(points))), 0.999)
+        with self.assertRaises(TypeError):
+            cap_points(self.rng, 10, Geo(0, 0, 0))
+
+    def testShellPoints(self):
+        r = np.linalg.norm(shell_points(self.rng, self._n, 1., 2.), axis=1)
+        self.assertTrue(np.all((r >= 1.) & (r <= 2.)))
+        # Uniform by volume: half the volume lies beyond the cube root of 4.5.
+        self.assertTrue(abs(np.mean(r > np.cbrt(4.5)) - 0.5) < 0.01)
+        with self.assertRaises(ValueError):
+            shell_points(self.rng, 10, 2., 1.)
+
+    def testGeoPoints(self):
+        lat_lon_alt = geo_points(self.rng, self._n, altitude_km=5.)
+        self.assertTrue(np.all(lat_lon_alt[:, 2] == 5.))
+        self.assertTrue(abs(np.mean(np.abs(lat_lon_alt[:, 0]) < 30.) - 0.5) < 0.01)
+        units = geo_to_ecef(lat_lon_alt) / (Geo.Re_km + 5.)
+        self.assertTrue(np.all(np.abs(units.mean(axis=0)) < 0.01))
+        date_line = geo_points(self.rng, 1000, 10., 20., 170., -170.)
+        self.assertTrue(np.all((date_line[:, 1] >= 170.) | (date_line[:, 1] <= -170.)))
+        self.assertTrue(np.all((date_line[:, 0] >= 10.) & (date_line[:, 0] <= 20.)))
+        with self.assertRaises(ValueError):
+            geo_points(self.rng, 10, 20., 10.)
+
+    def testQuaternions(self):
+        q = quaternions(self.rng, self._n)
+        self.assertTrue(np.all(np.abs(np.linalg.norm(q, axis=1) - 1) < self._fudge))
+        rotated = Quaternion(*q[0]).rotate(Vector3D(1, 0, 0))
+        self.assertTrue(abs(rotated.mag() - 1) < self._fudge)
+        # A uniform rotation sends a fixed vector to a uniform direction.
+        angles, axes = [], []
+        for row in q[:2000]:
+            angle, unit = Quaternion(*row).to_angle_and_unit()
+            angles.append(angle)
+            axes.append(unit.array)
+        images = np.einsum("nij,j->ni", rotation_matrices(np.array(angles), np.array(axes)), [0, 0, 1])
+        self.assertTrue(np.all(np.abs(images.mean(axis=0)) < 0.05))
+        self.assertTrue(abs(np.mean(np.abs(q[:, 0]) ** 2) - 0.25) < 0.01)
+
+    def testReproducibleChunks(self):
+        chunks = list(sample_chunks(geo_points, np.random.default_rng(1), 2500, 0., 10., chunk_size=1000))
+        self.assertEqual([len(chunk) for chunk in chunks], [1000, 1000, 500])
+        again = list(sample_chunks(geo_points, np.random.default_rng(1), 2500, 0., 10., chunk_size=1000))
+        self.assertTrue(all(np.all(a == b) for a, b in zip(chunks, again)))
+        self.assertTrue(np.all((np.concatenate(chunks)[:, 0] >= 0.) & (np.concatenate(chunks)[:, 0] <= 10.)))
+        with self.assertRaises(ValueError):
+            list(sample_chunks(unit_vectors, self.rng, 10, chunk_size=0))
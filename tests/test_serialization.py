@@ -0,0 +1,94 @@
+# Built-in modules
+import os
+import pickle
+import sys
+import unittest
+
+# 3rd party
+import numpy as np
+
+# This next bit makes sure the resources are available without needing to install.
+this_dir = os.path.abspath(os.path.dirname(__file__))
+python_dir = os.path.dirname(this_dir)
+module_dir = os.path.join(python_dir, "geometric_tools")
+if module_dir not in sys.path:
+    sys.path.append(module_dir)
+
+# Custom modules
+from locations import ECEF, SphCoords, Geo
+from quaternion import Quaternion
+from serialization import dumps, dumps_array, loads, loads_array
+from vector_3d import Vector3D
+
+
+class SerializationTests(unittest.TestCase):
+    _fudge = 1e-6
+
+    def setUp(self):
+        self.samples = [[Vector3D(1, 2, 3), Vector3D(-1, 0, 0.5)],
+                        [Quaternion(1, 0, 0, 0), Quaternion(0.5, 0.5, 0.5, 0.5)],
+                        [ECEF(1, 2, 3), ECEF(6000, -10, 2)],
+                        [SphCoords(1, 2, 3), SphCoords(7000, 0.5, 6)],
+                        [Geo(1, 2, 3), Geo(-45, 80, 20200)]]
+
+    def testRoundTrip(self):
+        for values in self.samples:
+            with self.subTest(kind=values[0].__class__.__name__):
+                loaded = loads(dumps(values))
+                self.assertEqual(len(loaded), len(values))
+                for value, exp_value in zip(loaded, values):
+                    self.assertEqual(value.__class__, exp_value.__class__)
+                    self.assertEqual(value, exp_value)
+
+    def testLoadsArrayIsZeroCopy(self):
+        buffer = dumps(self.samples[2])
+        cls, array = loads_array(buffer)
+        self.assertIs(cls, ECEF)
+        self.assertEqual(array.shape, (2, 3))
+        self.assertFalse(array.flags.owndata)
+        self.assertFalse(array.flags.writeable)
+        self.assertTrue(np.all(array == [[1, 2, 3], [6000, -10, 2]]))
+        _, array = loads_array(bytearray(buffer))
+        self.assertFalse(array.flags.writeable)
+        with self.assertRaises(ValueError):
+            array[0, 0] = 5.
+
+    def testFloat32(self):
+        values = self.samples[0]
+        buffer = dumps(values, dtype=np.float32)
+        self.assertEqual(len(buffer), 16 + 2 * 3 * 4)
+        _, array = loads_array(buffer)
+        self.assertEqual(array.dtype, np.float32)
+        self.assertTrue(np.all(np.abs(array - [[1, 2, 3], [-1, 0, 0.5]]) < self._fudge))
+
+    def testDumpsArray(self):
+        array = np.arange(12, dtype=float).reshape(4, 3)
+        cls, loaded = loads_array(dumps_array(Geo, array))
+        self.assertIs(cls, Geo)
+        self.assertTrue(np.all(loaded == array))
+        with self.assertRaises(ValueError):
+            dumps_array(Quaternion, array)
+        with self.assertRaises(TypeError):
+            dumps_array(int, array)
+        with self.assertRaises(ValueError):
+            dumps_array(Geo, array, dtype=np.int32)
+
+    def testSmallerThanPickle(self):
+        values = [Vector3D(*row) for row in np.random.default_rng(0).normal(size=(100, 3))]
+        self.assertLess(len(dumps(values)), len(pickle.dumps(values)))
+
+    def testIncorrectValues(self):
+        with self.assertRaises(ValueError):
+            dumps([])
+        with self.assertRaises(TypeError):
+            dumps([1, 2])
+        with self.assertRaises(TypeError):
+            dumps([ECEF(1, 2, 3), Geo(1, 2, 3)])
+
+    def testCorruptBuffers(self):
+        buffer = dumps(self.samples[0])
+        corrupt = [b"", b"XXXX" + buffer[4:], buffer[:-1], buffer[:4] + b"\x09" + buffer[5:]]
+        for element in corrupt:
+            with self.subTest(element=element[:8]):
+                with self.assertRaises(ValueError):
+                    loads_array(element)
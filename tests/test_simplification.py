@@ -0,0 +1,131 @@
+# Built-in modules
+import os
+import sys
+import unittest
+
+# 3rd party
+import numpy as np
+
+# This next bit makes sure the resources are available without needing to install.
+this_dir = os.path.abspath(os.path.dirname(__file__))
+python_dir = os.path.dirname(this_dir)
+module_dir = os.path.join(python_dir, "geometric_tools")
+if module_dir not in sys.path:
+    sys.path.append(module_dir)
+
+# Custom modules
+from locations import ECEF, Geo, geo_to_ecef
+from simplification import StreamingSimplifier, simplify, _chord_deviation, _surface_deviation
+
+
+def _recursive(xyz, tol, start, end, kept):
+    """
+    Textbook recursive Douglas-Peucker on the chord metric.
+    """
+    if end - start < 2:
+        return
+    deviation = _chord_deviation(xyz[start + 1:end], np.tile(xyz[start], (end - start - 1, 1)),
+                                 np.tile(xyz[end], (end - start - 1, 1)))
+    split = start + 1 + int(np.argmax(deviation))
+    if deviation.max() > tol:
+        kept.add(split)
+        _recursive(xyz, tol, start, split, kept)
+        _recursive(xyz, tol, split, end, kept)
+
+
+def _max_error(xyz, kept, deviation):
+    """
+    Largest deviation of any dropped point from the segment between the retained points around it.
+    """
+    owner = np.searchsorted(kept, np.arange(len(xyz)), side="right") - 1
+    owner = np.minimum(owner, len(kept) - 2)
+    return deviation(xyz, xyz[kept[owner]], xyz[kept[owner + 1]]).max()
+
+
+def _track() -> np.ndarray:
+    """
+    An oversampled, gently wandering track as (5000, 3) latitude, longitude, altitude rows.
+    """
+    rng = np.random.default_rng(0)
+    steps = np.column_stack((rng.normal(0.01, 0.002, 5000), rng.normal(0.02, 0.002, 5000), np.zeros(5000)))
+    lat_lon_alt = np.cumsum(steps, axis=0) + [10., 20., 0.]
+    lat_lon_alt[:, 2] = 10. + np.sin(np.arange(5000) / 100.)
+    return lat_lon_alt
+
+
+class SimplifyTests(unittest.TestCase):
+
+    def setUp(self):
+        self.lat_lon_alt = _track()
+        self.xyz = geo_to_ecef(self.lat_lon_alt)
+
+    def testMatchesRecursive(self):
+        for tol in [0.1, 1., 5.]:
+            kept = {0, len(self.xyz[:800]) - 1}
+            _recursive(self.xyz[:800], tol, 0, 799, kept)
+            with self.subTest(tol=tol):
+                self.assertTrue(np.all(simplify(self.xyz[:800], tol) == sorted(kept)))
+
+    def testErrorBound(self):
+        for metric, deviation in [("chord", _chord_deviation), ("surface", _surface_deviation)]:
+            for tol in [0.5, 2.]:
+                with self.subTest(metric=metric, tol=tol):
+                    kept = simplify(self.xyz, tol, metric)
+                    self.assertEqual(kept[0], 0)
+                    self.assertEqual(kept[-1], len(self.xyz) - 1)
+                    self.assertLess(len(kept), len(self.xyz) / 4)
+                    self.assertLessEqual(_max_error(self.xyz, kept, deviation), tol)
+
+    def testStraightLine(self):
+        line = np.linspace([7000., 0, 0], [7000., 100, 0], 50)
+        self.assertTrue(np.all(simplify(line, 1e-9) == [0, 49]))
+
+    def testFramesAndLocations(self):
+        kept = simplify(self.xyz[:300], 1.)
+        self.assertTrue(np.all(simplify(self.lat_lon_alt[:300], 1., frame=Geo) == kept))
+        self.assertTrue(np.all(simplify([ECEF(*row) for row in self.xyz[:300]], 1.) == kept))
+        self.assertEqual(len(simplify(np.zeros((0, 3)), 1.)), 0)
+        self.assertTrue(np.all(simplify(self.xyz[:1], 1.) == [0]))
+
+    def testSurfaceIgnoresAltitude(self):
+        lat_lon_alt = np.column_stack((np.zeros(20), np.linspace(0, 1, 20), np.where(np.arange(20) % 2, 50., 0.)))
+        self.assertTrue(np.all(simplify(lat_lon_alt, 0.01, "surface", Geo) == [0, 19]))
+        self.assertEqual(len(simplify(lat_lon_alt, 0.01, "chord", Geo)), 20)
+
+    def testIncorrectArguments(self):
+        with self.assertRaises(ValueError):
+            simplify(self.xyz, -1.)
+        with self.assertRaises(ValueError):
+            simplify(self.xyz, 1., "area")
+        with self.assertRaises(TypeError):
+            simplify(self.xyz, 1., frame=list)
+
+
+class StreamingTests(unittest.TestCase):
+
+    def setUp(self):
+        self.lat_lon_alt = _track()
+        self.xyz = geo_to_ecef(self.lat_lon_alt)
+
+    def testBoundedStream(self):
+        for max_buffer, chunk in [(3, 1), (64, 7), (500, 333), (10000, 5000)]:
+            simplifier = StreamingSimplifier(1., max_buffer=max_buffer)
+            retained = [simplifier.push(self.xyz[start:start + chunk]) for start in range(0, len(self.xyz), chunk)]
+            kept = np.concatenate(retained + [simplifier.flush()])
+            with self.subTest(max_buffer=max_buffer, chunk=chunk):
+                self.assertTrue(np.all(np.diff(kept) > 0))
+                self.assertEqual(kept[0], 0)
+                self.assertEqual(kept[-1], len(self.xyz) - 1)
+                self.assertLessEqual(_max_error(self.xyz, kept, _chord_deviation), 1.)
+                if max_buffer >= len(self.xyz):
+                    self.assertTrue(np.all(kept == simplify(self.xyz, 1.)))
+                elif max_buffer > 3:
+                    self.assertLess(len(kept), 1.5 * len(simplify(self.xyz, 1.)) + len(self.xyz) / max_buffer)
+
+    def testGeoStream(self):
+        simplifier = StreamingSimplifier(1., "surface", Geo, max_buffer=100)
+        kept = np.concatenate([simplifier.push(self.lat_lon_alt[:2000]), simplifier.push(self.lat_lon_alt[2000:]),
+                               simplifier.flush()])
+        self.assertLessEqual(_max_error(self.xyz, kept, _surface_deviation), 1.)
+        with self.assertRaises(ValueError):
+            StreamingSimplifier(1., max_buffer=2)
@@ -14,7 +14,10 @@ if module_dir not in sys.path:
     sys.path.append(module_dir)
 
 # Custom modules
-from vector_alg import Vector, dot
+from locations import ECEF
+from quaternion import Quaternion, quaternion_rotation
+from vector_3d import Vector3D, cross
+from vector_alg import Vector, VectorExpr, deferred, dot, evaluate
 
 
 class VectorAlgTests(unittest.TestCase):
@@ -72,6 +75,20 @@ class VectorAlgTests(unittest.TestCase):
             with self.subTest(vec=vec, ref_vec=ref_vec):
                 self.assertNotEqual(ref_vec, vec)
 
+    def testIsClose(self):
+        vec = Vector(1, 2, 3)
+        self.assertTrue(vec.isclose(Vector(1, 2, 3 + 1e-12)))
+        self.assertTrue(vec.isclose(Vector(1.1, 2, 3), tol=0.2))
+        self.assertFalse(vec.isclose(Vector(1.1, 2, 3)))
+        self.assertFalse(vec.isclose(Vector(1, 2, 3, 0), tol=1))
+        with self.assertRaises(TypeError):
+            vec.isclose(1)
+
+    def testQuantizedKey(self):
+        key = Vector(0.25, -0.25, 1.9).quantized_key(0.5)
+        self.assertEqual(key, (0, -1, 3))
+        self.assertEqual(hash(key), hash(Vector(0.3, -0.1, 1.6).quantized_key(0.5)))
+
     def testAdd(self):
         vec_1 = Vector(1, 2)
         vec_2 = Vector(2, 2)
@@ -124,3 +141,117 @@ class VectorAlgTests(unittest.TestCase):
         for vec, exp_mag in zip(test_vectors, exp_mags):
             with self.subTest(vec=vec):
                 self.assertEqual(vec.mag(), exp_mag)
+
+
+class DeferredTests(unittest.TestCase):
+    _fudge = 1e-12
+
+    def testOperatorsBuildExpressions(self):
+        a, b = Vector(1, 2), Vector(3, 4)
+        with deferred():
+            expressions = [a + b, a - b, 2 * a, a * 2, -a, a / 2]
+        for expression in expressions:
+            with self.subTest(expression=str(expression)):
+                self.assertIsInstance(expression, VectorExpr)
+        self.assertIsInstance(a + b, Vector)
+
+    def testMatchesEagerEvaluation(self):
+        a, b, c = Vector(1., 2., 3.), Vector(-1., 0.5, 4.), Vector(3., 3., 9.)
+        exp_vec = a + 2 * b - c / 3
+        with deferred():
+            expression = a + 2 * b - c / 3
+            nested = -(a - b) * 3 + (b + c) / 2 - a
+        self.assertEqual(expression.evaluate(), exp_vec)
+        self.assertEqual(nested, -(a - b) * 3 + (b + c) / 2 - a)
+        self.assertEqual(expression, exp_vec)
+
+    def testEvaluatedOnDemand(self):
+        a, b = Vector(3, 0), Vector(0, 4)
+        with deferred():
+            expression = a + b
+        self.assertEqual(expression[1], 4)
+        self.assertEqual(expression.mag(), 5)
+        self.assertEqual(dot(expression, a), 9)
+        self.assertTrue(np.all(np.asarray(expression) == [3, 4]))
+        self.assertEqual(str(expression), "(3, 4)")
+        self.assertIs(expression.evaluate(), expression.evaluate())
+
+    def testReadOnly(self):
+        a, b = Vector(3, 0), Vector(0, 4)
+        with deferred():
+            expression = a + b
+            with self.assertRaises(AttributeError):
+                expression.x = 10
+            with self.assertRaises(TypeError):
+                expression[0] = 10
+            with self.assertRaises(AttributeError):
+                del expression.array
+        self.assertEqual(expression, Vector(3, 4))
+        self.assertEqual(a, Vector(3, 0))
+
+    def testRepeatedLeavesAreMerged(self):
+        a, b = Vector(1., 1.), Vector(2., 3.)
+        with deferred():
+            expression = a + a + b - a
+        terms = expression._terms()
+        self.assertEqual(len(terms), 2)
+        self.assertEqual(expression, a + b)
+
+    def testBatchVectors(self):
+        rng = np.random.default_rng(0)
+        a, b = Vector(rng.normal(size=(100, 3))), Vector(rng.normal(size=(100, 3)))
+        with deferred():
+            expression = 0.5 * a - b / 4 + a
+        self.assertTrue(np.all(np.abs(expression.array - (1.5 * a.array - b.array / 4)) < self._fudge))
+
+    def testKeepsClass(self):
+        a, b = Vector3D(1, 2, 3), Vector3D(1, 0, 0)
+        with deferred():
+            expression = a - b
+        self.assertIsInstance(expression.evaluate(), Vector3D)
+        self.assertEqual(expression.z, 3)
+        self.assertEqual(cross(expression, b), cross(a - b, b))
+        self.assertEqual(ECEF(1, 1, 1) + expression, ECEF(1, 3, 4))
+
+    def testSizeMismatch(self):
+        with deferred():
+            expression = Vector(1, 2) + Vector(1, 2, 3)
+        with self.assertRaises(ValueError):
+            expression.evaluate()
+
+    def testEvaluate(self):
+        a = Vector(1, 2)
+        self.assertIs(evaluate(a), a)
+        with deferred():
+            self.assertEqual(evaluate(a * 2), Vector(2, 4))
+
+    def testNumpyScalarsDefer(self):
+        a = Vector(1., 2.)
+        with deferred():
+            expressions = [np.float64(2.) * a, a * np.float64(2.), np.float64(2.) * (a + a)]
+        for expression in expressions:
+            with self.subTest(expression=str(expression)):
+                self.assertIsInstance(expression, VectorExpr)
+        self.assertEqual(evaluate(expressions[0]), Vector(2., 4.))
+        self.assertEqual(evaluate(expressions[1]), Vector(2., 4.))
+        self.assertEqual(evaluate(expressions[2]), Vector(4., 8.))
+
+    def testQuaternionRotation(self):
+        with deferred():
+            rotated = quaternion_rotation(np.pi / 2, Vector3D(0, 0, 1), Vector3D(1, 0, 0))
+            axis_from_locations = quaternion_rotation(np.pi / 2, ECEF(0, 0, 2) - ECEF(0, 0, 1), Vector3D(1, 0, 0))
+            from_unit = Quaternion.from_vector(Vector3D(3, 0, 4).unit())
+        for result in (rotated, axis_from_locations):
+            self.assertIsInstance(result, Vector3D)
+            self.assertLess((result - Vector3D(0, 1, 0)).mag(), self._fudge)
+        self.assertTrue(np.allclose(from_unit.array, [0, 0.6, 0, 0.8]))
+
+    def testLocationArithmeticAndCross(self):
+        with deferred():
+            moved = ECEF(1, 2, 3) + (Vector3D(1, 0, 0) + Vector3D(0, 1, 0))
+            difference = ECEF(1, 2, 3) - ECEF(0, 0, 1)
+            product = cross(Vector3D(1, 0, 0) * 2, Vector3D(0, 1, 0))
+        self.assertIsInstance(moved, ECEF)
+        self.assertEqual((moved.x, moved.y, moved.z), (2, 3, 3))
+        self.assertEqual(evaluate(difference), Vector3D(1, 2, 2))
+        self.assertEqual(product, Vector3D(0, 0, 2))